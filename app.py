@@ -1,44 +1,113 @@
 import os
 import asyncio
-import json
-import websockets
-from urllib.parse import urlencode
 import socketio
 from dotenv import load_dotenv
-from collections import deque, Counter
 import logging
-import io
 import random
 from aiohttp import web
 
-from livetranslate.translate import deepl_language, translate_text_deepl
+# .env must be loaded before importing modules that read their settings at import time
+load_dotenv()
+
+from livetranslate.ingest import AUDIO_OVERFLOW_POLICY, AudioIngestQueue, FrameSequence, parse_audio_frame
+from livetranslate.languages import get_language_registry
+from livetranslate.logs import logging_state, parse_level, session_logs, setup_logging
+from livetranslate.metrics import (
+    EMITTED,
+    FIRST_INTERIM,
+    FIRST_SENT,
+    TRANSLATION_END,
+    TRANSLATION_START,
+    SessionTracer,
+    registry,
+)
+from livetranslate.pipeline import TranslationPipeline
+from livetranslate.pubsub import create_client_manager
+from livetranslate.segment import TRANSLATION_SEGMENTATION, SentenceSegmenter
+from livetranslate.speculate import TRANSLATION_SPECULATION, SpeculativeTranslator, totals as speculation_totals
+from livetranslate.translate import (
+    close_deepl_client,
+    failures as translation_failures,
+    get_circuit_breaker,
+    get_rate_limiter,
+    get_translation_cache,
+    start_deepl_client,
+    translate_text_deepl,
+)
 
 # Only import DeepgramLiveClient if we're not using mock speech
 USE_MOCK_SPEECH = os.environ.get('USE_MOCK_SPEECH', 'false').lower() == 'true'
+
+# Server-side voice activity detection (requires numpy; linear16 audio only)
+AUDIO_VAD = os.environ.get('AUDIO_VAD', 'false').lower() == 'true'
+VAD_KEEPALIVE_SECONDS = float(os.environ.get('VAD_KEEPALIVE_SECONDS', 5))
+
+if AUDIO_VAD:
+    try:
+        from livetranslate.vad import VoiceActivityDetector
+    except ImportError:
+        print("Warning: numpy not found. Voice activity detection disabled.")
+        AUDIO_VAD = False
+
+# Raw PCM normalization for clients that declare an 'audio_format' (requires numpy)
+try:
+    from livetranslate.pcm import PcmNormalizer
+except ImportError:
+    PcmNormalizer = None
+
+# Upstream transport: 'sdk' (Deepgram SDK), 'websocket' (pure asyncio, no threads)
+# or 'replay' (recorded traces from DEEPGRAM_RECORD_DIR, see deepgram_replay.py)
+DEEPGRAM_TRANSPORT = os.environ.get('DEEPGRAM_TRANSPORT', 'sdk').lower()
 deepgram_client = None
 
 if not USE_MOCK_SPEECH:
     try:
-        from deepgram_client import DeepgramLiveClient
-        deepgram_client = DeepgramLiveClient()
+        if DEEPGRAM_TRANSPORT == 'websocket':
+            from deepgram_ws import DeepgramWebsocketClient
+            deepgram_client = DeepgramWebsocketClient()
+        elif DEEPGRAM_TRANSPORT == 'replay':
+            from deepgram_replay import DeepgramReplayClient
+            deepgram_client = DeepgramReplayClient()
+        else:
+            from deepgram_client import DeepgramLiveClient
+            deepgram_client = DeepgramLiveClient()
     except ImportError:
         print("Warning: Deepgram SDK not found. Falling back to mock mode.")
         USE_MOCK_SPEECH = True
         os.environ['USE_MOCK_SPEECH'] = 'true'
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging: records are written by a background thread, never on the event loop
+setup_logging()
 logger = logging.getLogger(__name__)
 
-load_dotenv()
-
 # Get port from environment variable with fallback to 5002
 PORT = int(os.getenv('PORT', 5002))
 HOST = os.getenv('HOST', '0.0.0.0')
 
+# Multi-worker mode: every worker binds the port with SO_REUSEPORT, Socket.IO
+# emits for sessions on other workers go through a message queue, and Engine.IO
+# is restricted to websockets so each session stays on one connection (and so
+# on one worker) without a sticky load balancer.
+REUSE_PORT = os.getenv('REUSE_PORT', 'false').lower() == 'true'
+SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE', '')
+SOCKETIO_WEBSOCKET_ONLY = os.getenv('SOCKETIO_WEBSOCKET_ONLY', 'false').lower() == 'true'
+
+# Socket.IO / Engine.IO log per packet at INFO, so they default to WARNING
+SOCKETIO_LOG_LEVEL = os.getenv('SOCKETIO_LOG_LEVEL', 'WARNING').upper()
+
+# Bearer token for the /admin routes; they are disabled when unset
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
 # Audio settings
 RATE = 16000
 CHUNK = RATE // 10  # 100ms chunks
+BYTES_PER_SECOND = RATE * 2  # linear16 mono
+
+# Upstream frame duration; browsers send 100 ms chunks, so each frame coalesces two
+AUDIO_FRAME_MS = int(os.getenv('AUDIO_FRAME_MS', 200))
+
+# How often a client under back-pressure should send audio, in milliseconds
+SLOW_DOWN_INTERVAL_MS = int(os.getenv('SLOW_DOWN_INTERVAL_MS', 500))
 
 # Buffer to store incoming audio per client
 client_audio_buffers = {}
@@ -46,12 +115,17 @@ client_audio_buffers = {}
 # Create a new aiohttp web application
 app = web.Application()
 
+logging.getLogger('socketio.server').setLevel(SOCKETIO_LOG_LEVEL)
+logging.getLogger('engineio.server').setLevel(SOCKETIO_LOG_LEVEL)
+
 # Set up Socket.IO with explicit CORS configuration
 sio = socketio.AsyncServer(
     async_mode='aiohttp',
     cors_allowed_origins='*',
-    logger=True,  # Enable Socket.IO logging
-    engineio_logger=True  # Enable Engine.IO logging
+    client_manager=create_client_manager(SOCKETIO_MESSAGE_QUEUE),
+    transports=['websocket'] if SOCKETIO_WEBSOCKET_ONLY else ['polling', 'websocket'],
+    logger=logging.getLogger('socketio.server'),
+    engineio_logger=logging.getLogger('engineio.server')
 )
 sio.attach(app)
 
@@ -74,165 +148,22 @@ listen_tasks = {}
 client_audio_queues = {}
 client_deepgram_ws = {}
 
-# Deepgram client is initialized above
-
-async def consumer(queue, sid, source_lang, target_lang):
-    """Process transcripts and translations."""
-    # Process source and target languages for DeepL
-    deepl_source = deepl_language(source_lang.split("-")[0])  # Get base language code
-    deepl_target = deepl_language(target_lang)
-
-    logger.info(f"Original languages - Source: {source_lang}, Target: {target_lang}")
-    logger.info(f"DeepL languages - Source: {deepl_source}, Target: {deepl_target}")
-
-    if deepl_source is None:
-        logger.warning(f"Source language '{source_lang}' not supported by DeepL")
-        logger.info("Using source language as is for transcription")
-        deepl_source = source_lang.split("-")[0].upper()
+# Per-client voice activity detectors
+client_vads = {}
 
-    if deepl_target is None:
-        logger.warning(f"Target language '{target_lang}' not supported by DeepL")
-        logger.info("Using source language for output (no translation)")
-        deepl_target = target_lang
+# Per-client utterance latency tracers
+client_tracers = {}
 
-    source_lang = deepl_source
-    target_lang = deepl_target
+# Per-client translation pipelines
+client_pipelines = {}
 
-    logger.info(f"Final languages - Source: {source_lang}, Target: {target_lang}")
+# Per-client sentence segmenters
+client_segmenters = {}
 
-    context = deque(maxlen=3)  # Keep last 3 transcripts for context
-
-    while True:
-        try:
-            speaker, transcript, is_final = await queue.get()
-
-            if not transcript:
-                continue
-
-            # Emit the transcript immediately
-            await asyncio.create_task(sio.emit('recognition', {
-                'text': transcript,
-                'is_final': is_final
-            }, room=sid))
-
-            # If it's a final transcript and languages are different, translate it
-            if is_final:
-                try:
-                    logger.info(
-                        f"Attempting translation - Text: {transcript}, Source: {source_lang}, Target: {target_lang}")
-                    translation = await translate_text_deepl(
-                        transcript,
-                        source_lang,
-                        target_lang,
-                        " ".join(context)
-                    )
-
-                    if translation:
-                        logger.info(f"Translation successful - Original: {transcript}, Translated: {translation}")
-                        await asyncio.create_task(sio.emit('translation', {
-                            'original': transcript,
-                            'translated': translation,
-                            'source_lang': source_lang,
-                            'target_lang': target_lang
-                        }, room=sid))
-                        context.append(transcript)
-                    else:
-                        logger.error("Translation returned empty result")
-                        await asyncio.create_task(
-                            sio.emit('error', {'message': "Translation failed - empty result"}, room=sid))
-                except Exception as e:
-                    logger.error(f"Translation error: {e}")
-                    await asyncio.create_task(sio.emit('error', {'message': f"Translation error: {str(e)}"}, room=sid))
-            elif is_final:
-                # If source and target languages are the same, just emit the original text
-                logger.info(f"No translation needed (same languages) - Text: {transcript}")
-                await asyncio.create_task(sio.emit('translation', {
-                    'original': transcript,
-                    'translated': transcript,
-                    'source_lang': source_lang,
-                    'target_lang': target_lang
-                }, room=sid))
-                context.append(transcript)
-
-        except Exception as e:
-            logger.error(f"Error in consumer: {e}")
-            await asyncio.create_task(sio.emit('error', {'message': f"Processing error: {str(e)}"}, room=sid))
-            break
-
-
-async def sender(ws, stream):
-    """Send audio data to Deepgram WebSocket."""
-    try:
-        async for chunk in stream.generator():
-            if stream.closed:
-                break
-
-            # Check if the chunk has actual data
-            if chunk and len(chunk) > 0:
-                try:
-                    await ws.send(chunk)
-                except Exception as e:
-                    logger.error(f"Error sending chunk to Deepgram: {e}")
-                    # If we encounter an error, wait a bit before continuing
-                    await asyncio.sleep(0.1)
-            else:
-                logger.warning("Received empty chunk, skipping")
-    except Exception as e:
-        logger.error(f"Error in sender: {e}")
-
-
-async def receiver(ws, queue):
-    """Receive transcriptions from Deepgram WebSocket."""
-    try:
-        async for msg in ws:
-            try:
-                res = json.loads(msg)
-
-                # Log the full response for debugging
-                logger.debug(f"Deepgram response: {json.dumps(res, indent=2)}")
-
-                # Check if this is a valid transcription result
-                if res.get("type") != "Results":
-                    logger.debug(f"Skipping non-Results message type: {res.get('type')}")
-                    continue
-
-                # Get the transcript from the response
-                transcript = res.get("channel", {}).get("alternatives", [{}])[0].get("transcript", "")
-
-                # Skip empty transcripts
-                if not transcript or transcript.strip() == "":
-                    logger.debug("Skipping empty transcript")
-                    continue
-
-                # Determine the speaker if available
-                speaker = "unknown"
-                try:
-                    words = res.get("channel", {}).get("alternatives", [{}])[0].get("words", [])
-                    if words and "speaker" in words[0]:
-                        counter = Counter([x.get("speaker") for x in words if "speaker" in x])
-                        if counter:
-                            speaker = counter.most_common(1)[0][0]
-                except Exception as e:
-                    logger.warning(f"Error determining speaker: {e}")
-
-                # Check if the queue is full
-                if queue.full():
-                    _ = await queue.get()
-                    queue.task_done()
-
-                # Put the transcript in the queue
-                is_final = bool(res.get("is_final", False))
-                logger.info(f"Queuing transcript: '{transcript}' (is_final: {is_final})")
-                await queue.put((speaker, transcript, is_final))
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Error decoding JSON from Deepgram: {e}")
-            except Exception as e:
-                logger.error(f"Error processing Deepgram message: {e}")
-
-    except Exception as e:
-        logger.error(f"Error in receiver: {e}")
+# Per-client speculative translators
+client_speculators = {}
 
+# Deepgram client is initialized above
 
 # Routes
 async def index(request):
@@ -241,9 +172,146 @@ async def index(request):
         return web.Response(text=f.read(), content_type='text/html')
 
 
+async def audio_websocket(request):
+    """Receive raw binary audio frames for a listening session.
+
+    Each binary message is a small header (sequence number, capture
+    timestamp) followed by the audio bytes, which feed the same pipeline as
+    Socket.IO 'audio_chunk' events without Engine.IO framing or attachment
+    reassembly. Control and caption events stay on Socket.IO.
+    """
+    sid = request.match_info['session']
+    if sid not in client_audio_queues:
+        raise web.HTTPNotFound(text=f"No listening session {sid}")
+
+    ws = web.WebSocketResponse(max_msg_size=1024 * 1024)
+    await ws.prepare(request)
+    logger.info(f"Raw audio websocket opened for {sid}")
+
+    sequence = FrameSequence()
+    async for msg in ws:
+        if msg.type != web.WSMsgType.BINARY:
+            continue
+        try:
+            seq, captured_ms, payload = parse_audio_frame(msg.data)
+        except ValueError as e:
+            logger.warning(f"Bad raw audio frame from {sid}: {e}")
+            continue
+        sequence.observe(seq)
+        await ingest_audio(sid, payload)
+
+    logger.info(f"Raw audio websocket closed for {sid}: {sequence.stats()}")
+    return ws
+
+
+async def metrics(request):
+    """Expose stage latencies and session gauges in Prometheus text format."""
+    return web.Response(
+        body=registry.render().encode(),
+        headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'},
+    )
+
+
+async def admin_logging(request):
+    """Show or change log levels at runtime.
+
+    POST a JSON body with 'level' (a level name, or null to clear a session
+    override) and either 'logger' (a module name, or 'root') or 'session'
+    (a socket id). Requires 'Authorization: Bearer <ADMIN_TOKEN>'.
+    """
+    if not ADMIN_TOKEN:
+        raise web.HTTPNotFound()
+    if request.headers.get('Authorization') != f"Bearer {ADMIN_TOKEN}":
+        raise web.HTTPUnauthorized()
+
+    if request.method == 'POST':
+        try:
+            body = await request.json()
+            level = parse_level(body.get('level'))
+        except (ValueError, AttributeError) as e:
+            raise web.HTTPBadRequest(text=str(e))
+        if 'session' in body:
+            session_logs.set_level(body['session'], level)
+        elif 'logger' in body and level is not None:
+            name = body['logger']
+            logging.getLogger(None if name == 'root' else name).setLevel(level)
+        else:
+            raise web.HTTPBadRequest(text="Expected 'logger' or 'session' with a 'level'")
+        logger.warning(f"Log level changed: {body}")
+
+    return web.json_response(logging_state())
+
+
+def upstream_connections():
+    if deepgram_client is None:
+        return {'active': 0}
+    counts = {'active': len(deepgram_client.connections)}
+    if hasattr(deepgram_client, 'stats'):
+        stats = deepgram_client.stats()
+        pool = stats.get('pool', {})
+        counts['pool_idle'] = pool.get('idle', 0)
+        counts['pool_hits'] = pool.get('hits', 0)
+        counts['pool_misses'] = pool.get('misses', 0)
+        counts['pool_hit_rate'] = pool.get('hit_rate', 0.0)
+        counts['reconnects'] = stats['reconnects']
+        counts['reconnect_failures'] = stats['reconnect_failures']
+        if stats['reconnect_time'] is not None:
+            counts['reconnect_seconds'] = stats['reconnect_time']
+        counts['replayed_bytes'] = stats['replayed_bytes']
+        counts['duplicate_results'] = stats['duplicate_results']
+    return counts
+
+
+def first_transcript_times():
+    if not hasattr(deepgram_client, 'stats'):
+        return {}
+    stats = deepgram_client.stats()
+    times = {'pooled': stats['first_transcript_pooled'], 'fresh': stats['first_transcript_fresh']}
+    return {kind: value for kind, value in times.items() if value is not None}
+
+
+def translation_cache_stats():
+    cache = get_translation_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def deepl_waits():
+    rate_limiter = get_rate_limiter()
+    if rate_limiter is None:
+        return {}
+    return {sid: stats['mean_wait'] for sid, stats in rate_limiter.stats().items()}
+
+
+registry.gauge('active_sessions', 'Sessions with an open audio queue.', lambda: len(client_audio_queues))
+registry.gauge('audio_queue_depth', 'Queued audio chunks across sessions.', lambda: {
+    'total': sum(queue.qsize() for queue in client_audio_queues.values()),
+    'max': max((queue.qsize() for queue in client_audio_queues.values()), default=0),
+})
+registry.gauge('translations_in_flight', 'Finals awaiting translation or in-order emit.', lambda: {
+    'total': sum(pipeline.in_flight() for pipeline in client_pipelines.values()),
+    'max': max((pipeline.in_flight() for pipeline in client_pipelines.values()), default=0),
+})
+registry.gauge('deepl_breaker_state', 'DeepL circuit breaker: 0 closed, 1 half-open, 2 open.',
+               lambda: {'closed': 0, 'half_open': 1, 'open': 2}[get_circuit_breaker().state])
+registry.gauge('translation_cache', 'Translation cache entries, hits (memory and disk), misses, evictions '
+               'and lookups coalesced onto an in-flight request.', translation_cache_stats)
+registry.gauge('translation_failures', 'Translations given up on, by reason.', lambda: translation_failures)
+registry.gauge('deepl_rate_limit_wait_seconds', 'Mean DeepL rate limiter wait per session.', deepl_waits)
+registry.gauge('speculative_translations', 'Speculative translations by outcome; extra_characters were not reused.',
+               lambda: speculation_totals)
+registry.gauge('upstream_connections', 'Deepgram upstream connections and pool use.', upstream_connections)
+registry.gauge('upstream_first_transcript_seconds',
+               'Mean time from session start to first transcript, on pooled or freshly opened sockets.',
+               first_transcript_times)
+
+
 # Register routes
 app.router.add_get('/', index)
 app.router.add_static('/static', 'static')  # Add static file serving
+app.router.add_get('/ws/audio/{session}', audio_websocket)  # Raw binary audio
+app.router.add_get('/metrics', metrics)  # Prometheus scrape endpoint
+app.router.add_route('GET', '/admin/logging', admin_logging)
+app.router.add_route('POST', '/admin/logging', admin_logging)
 
 
 @sio.event
@@ -261,18 +329,40 @@ async def disconnect(sid):
 
 @sio.on('audio_chunk')
 async def handle_audio_chunk(sid, data):
-    # Put audio data into the client's queue for streaming to Deepgram
-    if sid in client_audio_queues:
-        logger.info(f"Received audio chunk from {sid}, size: {len(data)} bytes")
-        # Check if the audio chunk has actual data (not just silence)
-        if len(data) > 0:
-            # Log the first few bytes for debugging
-            logger.info(f"Audio chunk first 10 bytes: {data[:10]}")
-            await client_audio_queues[sid].put(data)
-        else:
-            logger.warning(f"Received empty audio chunk from {sid}")
-    else:
+    await ingest_audio(sid, data)
+
+
+async def ingest_audio(sid, data):
+    # Put audio data into the client's queue for streaming to Deepgram.
+    # This never waits: a slow upstream only costs dropped or merged chunks.
+    queue = client_audio_queues.get(sid)
+    if queue is None:
         logger.warning(f"Received audio chunk from {sid} but no queue exists")
+        return
+
+    # Check if the audio chunk has actual data (not just silence)
+    if len(data) == 0:
+        logger.warning(f"Received empty audio chunk from {sid}")
+        return
+
+    if session_logs.enabled(logger, sid, logging.DEBUG):
+        session_logs.log(logger, sid, logging.DEBUG,
+                         f"Received audio chunk from {sid}, size: {len(data)} bytes, "
+                         f"first 10 bytes: {bytes(data[:10])}")
+
+    tracer = client_tracers.get(sid)
+    if tracer is not None:
+        tracer.audio()
+
+    if not queue.put_nowait(data):
+        logger.debug(f"Dropped audio chunk from {sid} (queue full, policy {queue.policy})")
+
+    # Ask the client to batch its audio while the queue is backed up
+    pressured = queue.pressure_changed()
+    if pressured is not None:
+        interval = SLOW_DOWN_INTERVAL_MS if pressured else 0
+        logger.info(f"{'Slowing down' if pressured else 'Resuming'} audio from {sid} (depth {queue.qsize()})")
+        await sio.emit('slow_down', {'interval_ms': interval}, room=sid)
 
 
 @sio.event
@@ -288,25 +378,44 @@ async def start_listening(sid, data):
         asyncio.create_task(handle_mock_listening_session(sid, data))
         return
     try:
-        # Determine language from data
-        language = data.get('source_lang', 'en-US')
-
-        # Map language codes to Deepgram supported formats
-        if language.startswith('en'):
-            language = 'en-US'
-        elif language.startswith('ru') or language.upper() == 'RU':
-            language = 'ru'  # Deepgram supports Russian
-
-        logger.info(f"Setting up Deepgram with language: {language}")
+        # Resolve the session's languages for Deepgram and DeepL once
+        languages = get_language_registry().resolve(
+            data.get('source_lang', 'en-US'), data.get('target_lang', 'EN'))
+        if not languages.translatable:
+            logger.warning(f"No DeepL translation for {sid} from {languages.source} to {languages.target}; "
+                           f"captions will be passed through")
+
+        # Convert raw PCM in other layouts to 16 kHz mono linear16 before anything else;
+        # an unsupported format is rejected before any upstream connection is opened
+        normalizer = None
+        audio_format = data.get('audio_format')
+        if audio_format:
+            if PcmNormalizer is None:
+                raise RuntimeError("Raw PCM input requires numpy on the server")
+            try:
+                sample_rate = int(audio_format.get('sample_rate', RATE))
+                channels = int(audio_format.get('channels', 1))
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid audio_format {audio_format!r}: sample_rate and channels must be integers")
+            normalizer = PcmNormalizer(
+                sample_rate=sample_rate,
+                channels=channels,
+                sample_format=audio_format.get('encoding', 's16'),
+                out_rate=RATE,
+            )
+            if normalizer.identity:
+                normalizer = None
+
+        logger.info(f"Setting up Deepgram with language: {languages.deepgram}")
 
         # Create per-client audio queue
-        audio_queue = asyncio.Queue(maxsize=10)
+        audio_queue = AudioIngestQueue(policy=data.get('overflow_policy', AUDIO_OVERFLOW_POLICY))
         client_audio_queues[sid] = audio_queue
 
         # Start the Deepgram connection
         success = await deepgram_client.start_connection(
             session_id=sid,
-            language=language,
+            language=languages.deepgram,
             interim_results=True,
             smart_format=True,
             model='nova-2'  # Use nova-2 model for all languages
@@ -315,6 +424,68 @@ async def start_listening(sid, data):
         if not success:
             raise RuntimeError("Failed to start Deepgram connection")
 
+        # Per-utterance timestamps from first audio byte to translation emit
+        tracer = SessionTracer()
+        client_tracers[sid] = tracer
+
+        # Finals are translated concurrently and their translations emitted in order
+        pipeline = TranslationPipeline()
+        client_pipelines[sid] = pipeline
+
+        def submit_translation(text, utterance):
+            # A final may yield several sentences, each with its own translation marks
+            trace = utterance.sentence()
+
+            # Reuse a translation started from stable interims for the same text
+            speculation = speculator.take(text) if speculator is not None else None
+
+            # Unsupported or identical languages skip DeepL
+            async def translate():
+                trace.mark(TRANSLATION_START)
+                translation = None
+                if speculation is not None:
+                    translation = await speculation
+                if languages.translatable and not translation:
+                    translation = await translate_text_deepl(
+                        text,
+                        languages.deepl_source,
+                        languages.deepl_target,
+                        "",
+                        session=sid
+                    )
+                trace.mark(TRANSLATION_END)
+                return translation
+
+            # Called in the order the text was submitted
+            async def emit_translation(translation):
+                logger.info(f"Translation result for {sid}: '{translation}'")
+                await sio.emit('translation', {
+                    'original': text,
+                    'translated': translation or text,
+                    'source_lang': languages.source,
+                    'target_lang': languages.target
+                }, room=sid)
+                trace.mark(EMITTED)
+                logger.info(f"Emitted translation event to {sid}")
+                logger.debug(f"Utterance latency for {sid}: {registry.record(trace)}")
+
+            pipeline.submit(translate, emit_translation)
+
+        # Finals are merged or split into whole sentences before translation
+        segmenter = SentenceSegmenter(submit_translation) if TRANSLATION_SEGMENTATION else None
+        if segmenter is not None:
+            client_segmenters[sid] = segmenter
+
+        # Optionally translate stable interim text before its final arrives
+        speculator = None
+        if TRANSLATION_SPECULATION and languages.translatable:
+            speculator = SpeculativeTranslator(
+                lambda text: translate_text_deepl(
+                    text, languages.deepl_source, languages.deepl_target, "", session=sid),
+                sentences=segmenter is not None,
+            )
+            client_speculators[sid] = speculator
+
         # Define the transcript callback
         async def handle_transcript(result_data):
             try:
@@ -324,55 +495,102 @@ async def start_listening(sid, data):
                 if not transcript:
                     return
 
-                logger.info(f"Transcript for {sid}: '{transcript}', is_final: {is_final}")
+                if is_final:
+                    logger.info(f"Transcript for {sid}: '{transcript}', is_final: {is_final}")
+                elif session_logs.enabled(logger, sid, logging.DEBUG):
+                    session_logs.log(logger, sid, logging.DEBUG,
+                                     f"Transcript for {sid}: '{transcript}', is_final: {is_final}")
+
+                if is_final:
+                    trace = tracer.final()
+                    # Stages up to the final; its sentences record the rest
+                    registry.record(trace)
+                else:
+                    tracer.mark(FIRST_INTERIM)
+                    if speculator is not None:
+                        held = segmenter.pending if segmenter is not None else ""
+                        speculator.observe(f"{held} {transcript}" if held else transcript)
 
                 # Emit the transcript to the client
                 await sio.emit('recognition', {'text': transcript, 'is_final': is_final}, room=sid)
-                logger.info(f"Emitted recognition event to {sid}")
 
-                # If it's a final transcript, translate it
+                # If it's a final transcript, translate it without holding up later recognitions
                 if is_final:
                     logger.info(f"Processing final transcript for {sid}: '{transcript}'")
-
-                    # Get the source and target languages
-                    source_lang = deepl_language(data.get('source_lang', 'en').split('-')[0])
-                    target_lang = deepl_language(data.get('target_lang', 'EN'))
-                    logger.info(f"Translating from {source_lang} to {target_lang}")
-
-                    # Translate the transcript
-                    translation = await translate_text_deepl(
-                        transcript,
-                        source_lang,
-                        target_lang,
-                        ""
-                    )
-
-                    logger.info(f"Translation result for {sid}: '{translation}'")
-
-                    # Emit the translation to the client
-                    await sio.emit('translation', {
-                        'original': transcript,
-                        'translated': translation or transcript,
-                        'source_lang': data.get('source_lang', 'en-US'),
-                        'target_lang': data.get('target_lang', 'EN')
-                    }, room=sid)
-                    logger.info(f"Emitted translation event to {sid}")
+                    if segmenter is None:
+                        submit_translation(transcript, trace)
+                    else:
+                        for sentence in segmenter.add(transcript, result_data.get('speech_final', False), trace):
+                            submit_translation(sentence, trace)
+                    if speculator is not None:
+                        speculator.reset()
             except Exception as e:
                 logger.error(f"Error handling transcript for {sid}: {e}")
 
         # Register the transcript callback
         deepgram_client.register_transcript_callback(sid, handle_transcript)
 
+        # Coalesce incoming chunks into upstream frames
+        frame_bytes = max(1, AUDIO_FRAME_MS * BYTES_PER_SECOND // 1000)
+        frame_seconds = AUDIO_FRAME_MS / 1000
+
+        # Optionally hold back long silences, keeping the upstream socket alive instead
+        vad = VoiceActivityDetector(sample_rate=RATE) if AUDIO_VAD else None
+        if vad is not None:
+            client_vads[sid] = vad
+
         # Start a task to send audio chunks to Deepgram
         async def audio_sender():
             try:
                 logger.info(f"Audio sender task started for {sid}")
+                loop = asyncio.get_running_loop()
                 chunk_count = 0
+                pending = []
+                pending_bytes = 0
+                deadline = None
+                last_sent = loop.time()
                 while True:
-                    chunk = await audio_queue.get()
-                    chunk_count += 1
-                    logger.info(f"Sending chunk #{chunk_count} to Deepgram for {sid}, size: {len(chunk)} bytes")
-                    await deepgram_client.send_audio(sid, chunk)
+                    timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                    try:
+                        chunk = await asyncio.wait_for(audio_queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        chunk = None
+
+                    if chunk is not None and normalizer is not None:
+                        chunk = await normalizer.process_async(chunk)
+
+                    if chunk and vad is not None:
+                        chunk = vad.process(chunk)
+                        if not chunk and loop.time() - last_sent >= VAD_KEEPALIVE_SECONDS:
+                            await deepgram_client.keep_alive(sid)
+                            last_sent = loop.time()
+
+                    if chunk:
+                        pending.append(chunk)
+                        pending_bytes += len(chunk)
+                        if deadline is None:
+                            deadline = loop.time() + frame_seconds
+
+                    # Send once a full frame is buffered or the oldest byte has waited a frame
+                    if pending and (pending_bytes >= frame_bytes or loop.time() >= deadline):
+                        # A lone chunk goes out as is; only coalesced frames are copied
+                        frame = pending[0] if len(pending) == 1 else b''.join(pending)
+                        pending.clear()
+                        pending_bytes = 0
+                        chunk_count += 1
+                        if session_logs.enabled(logger, sid, logging.DEBUG):
+                            session_logs.log(logger, sid, logging.DEBUG,
+                                             f"Sending chunk #{chunk_count} to Deepgram for {sid}, size: {len(frame)} bytes")
+                        sent = await deepgram_client.send_audio(sid, frame)
+                        if not sent and hasattr(deepgram_client, 'failed') and deepgram_client.failed(sid):
+                            logger.error(f"Deepgram connection lost for {sid}, stopping the session")
+                            await sio.emit('error', {'message': 'Lost the connection to the speech '
+                                                                'recognition service'}, room=sid)
+                            asyncio.create_task(stop_listening(sid))
+                            return
+                        tracer.mark(FIRST_SENT)
+                        deadline = None
+                        last_sent = loop.time()
             except asyncio.CancelledError:
                 logger.info(f"Audio sender task cancelled for {sid}")
                 return
@@ -397,6 +615,14 @@ async def start_listening(sid, data):
         await sio.emit('error', {'message': str(e)}, room=sid)
         if sid in client_audio_queues:
             del client_audio_queues[sid]
+        client_vads.pop(sid, None)
+        client_tracers.pop(sid, None)
+        if sid in client_segmenters:
+            client_segmenters.pop(sid).close()
+        if sid in client_speculators:
+            client_speculators.pop(sid).close()
+        if sid in client_pipelines:
+            await client_pipelines.pop(sid).close()
         # Close the Deepgram connection if it was created
         await deepgram_client.close_connection(sid)
 
@@ -419,7 +645,29 @@ async def stop_listening(sid):
             del listen_tasks[sid]
 
     if sid in client_audio_queues:
+        logger.info(f"Audio queue stats for {sid}: {client_audio_queues[sid].stats()}")
         del client_audio_queues[sid]
+    client_tracers.pop(sid, None)
+    session_logs.forget(sid)
+    if sid in client_segmenters:
+        segmenter = client_segmenters.pop(sid)
+        logger.info(f"Sentence segmentation stats for {sid}: {segmenter.stats()}")
+        segmenter.close()
+    if sid in client_speculators:
+        speculator = client_speculators.pop(sid)
+        logger.info(f"Speculative translation stats for {sid}: {speculator.stats()}")
+        speculator.close()
+    if sid in client_pipelines:
+        pipeline = client_pipelines.pop(sid)
+        logger.info(f"Translation pipeline stats for {sid}: {pipeline.stats()}")
+        await pipeline.close()
+    rate_limiter = get_rate_limiter()
+    if rate_limiter is not None:
+        share = rate_limiter.forget(sid)
+        if share is not None:
+            logger.info(f"DeepL rate limit waits for {sid}: {share.stats()}")
+    if sid in client_vads:
+        logger.info(f"Voice activity stats for {sid}: {client_vads.pop(sid).stats()}")
 
     # Close the Deepgram connection if available
     if deepgram_client is not None:
@@ -430,10 +678,6 @@ async def handle_mock_listening_session(sid, data):
     """Handle a mock listening session for testing without Deepgram."""
     logger.info(f"Starting mock listening session for {sid}")
 
-    # Create a queue for audio chunks
-    audio_queue = asyncio.Queue(maxsize=10)
-    client_audio_queues[sid] = audio_queue
-
     # Sample phrases with translations for different languages
     sample_phrases = [
         {
@@ -551,6 +795,10 @@ async def handle_mock_listening_session(sid, data):
     }
 
     try:
+        # Create a queue for audio chunks; an unknown overflow policy is reported to the client
+        audio_queue = AudioIngestQueue(policy=data.get('overflow_policy', AUDIO_OVERFLOW_POLICY))
+        client_audio_queues[sid] = audio_queue
+
         # Send status message to client
         await sio.emit('status', {'message': 'Ready to receive audio (MOCK MODE)'}, room=sid)
 
@@ -561,7 +809,9 @@ async def handle_mock_listening_session(sid, data):
                 while True:
                     # Wait for an audio chunk (we don't actually use it)
                     chunk = await audio_queue.get()
-                    logger.info(f"Received audio chunk in mock mode, size: {len(chunk)} bytes")
+                    if session_logs.enabled(logger, sid, logging.DEBUG):
+                        session_logs.log(logger, sid, logging.DEBUG,
+                                         f"Received audio chunk in mock mode, size: {len(chunk)} bytes")
 
                     # Every few chunks, emit a recognition event with a sample phrase
                     if random.random() < 0.3:  # 30% chance to emit a phrase
@@ -650,6 +900,13 @@ async def handle_mock_listening_session(sid, data):
             del client_audio_queues[sid]
 
 
+async def warm_deepgram_pool(app):
+    """Pre-open upstream Deepgram sockets for the configured languages."""
+    languages = [lang.strip() for lang in os.getenv('DEEPGRAM_POOL_LANGUAGES', 'en-US').split(',') if lang.strip()]
+    if hasattr(deepgram_client, 'warm_pool'):
+        deepgram_client.warm_pool(languages, model='nova-2')
+
+
 async def cleanup_background_tasks(app):
     """Cleanup function to handle any remaining tasks when the application shuts down."""
     logger.info("Cleaning up background tasks...")
@@ -672,14 +929,35 @@ async def cleanup_background_tasks(app):
     # Clear all dictionaries
     listen_tasks.clear()
     client_audio_queues.clear()
-
+    client_vads.clear()
+    client_tracers.clear()
+    for segmenter in client_segmenters.values():
+        segmenter.close()
+    client_segmenters.clear()
+    for speculator in client_speculators.values():
+        speculator.close()
+    client_speculators.clear()
+    for pipeline in client_pipelines.values():
+        await pipeline.close()
+    client_pipelines.clear()
+
+    logger.info(f"Stage latencies: {registry.summary()}")
     logger.info("Cleanup completed")
 
 
+# Lifecycle hooks are registered at import time so gunicorn workers
+# (gunicorn app:app -c gunicorn.conf.py) get them too.
+
+# Open and warm up the shared DeepL connection pool at boot
+app.on_startup.append(start_deepl_client)
+app.on_startup.append(warm_deepgram_pool)
+
+# Register cleanup function to be called on shutdown
+app.on_shutdown.append(cleanup_background_tasks)
+app.on_cleanup.append(close_deepl_client)
+
+
 if __name__ == '__main__':
     logger.info("Starting application...")
 
-    # Register cleanup function to be called on shutdown
-    app.on_shutdown.append(cleanup_background_tasks)
-
-    web.run_app(app, host=HOST, port=PORT)
\ No newline at end of file
+    web.run_app(app, host=HOST, port=PORT, reuse_port=REUSE_PORT or None)
\ No newline at end of file
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark for cross-session DeepL micro-batching.
+
+Simulates N concurrent sessions producing final transcripts and counts the
+DeepL requests sent with and without the BatchingTranslator. No network is
+used; DeepL is replaced by a coroutine with a fixed round-trip latency.
+
+Usage:
+    python benchmarks/bench_batching.py [--duration 5] [--wait-ms 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livetranslate.batching import BatchingTranslator  # noqa: E402
+
+
+class FakeDeepL:
+    """Counts requests and answers after a fixed latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+
+    async def translate_batch(self, texts, source_lang, target_lang, context):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return [t.upper() for t in texts]
+
+    async def translate(self, text, source_lang, target_lang, context):
+        return (await self.translate_batch([text], source_lang, target_lang, context))[0]
+
+
+async def session(translate, rng, duration, mean_interval, latencies):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + duration
+    while True:
+        await asyncio.sleep(rng.expovariate(1 / mean_interval))
+        if loop.time() >= end:
+            return
+        start = loop.time()
+        await translate("Next slide, please.", "EN", "FR", "")
+        latencies.append(loop.time() - start)
+
+
+async def run(sessions, duration, mean_interval, latency, wait_ms, batch_size, batched):
+    deepl = FakeDeepL(latency)
+    rng = random.Random(sessions)
+    latencies = []
+    if batched:
+        batcher = BatchingTranslator(deepl.translate_batch, wait_ms / 1000, batch_size)
+        translate = batcher.translate
+    else:
+        translate = deepl.translate
+    await asyncio.gather(*(
+        session(translate, rng, duration, mean_interval, latencies) for _ in range(sessions)
+    ))
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+    return deepl.requests / duration, len(latencies) / duration, p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="mean seconds between finals per session")
+    parser.add_argument("--latency", type=float, default=0.08, help="simulated DeepL round-trip in seconds")
+    parser.add_argument("--wait-ms", type=float, default=5.0)
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8} {'finals/s':>9} {'req/s plain':>12} {'req/s batched':>14} "
+          f"{'saved':>7} {'p95 plain':>10} {'p95 batched':>12}")
+    for n in args.sessions:
+        plain_rps, finals, plain_p95 = asyncio.run(run(
+            n, args.duration, args.interval, args.latency, args.wait_ms, args.batch_size, False))
+        batched_rps, _, batched_p95 = asyncio.run(run(
+            n, args.duration, args.interval, args.latency, args.wait_ms, args.batch_size, True))
+        saved = 1 - batched_rps / plain_rps if plain_rps else 0.0
+        print(f"{n:>8} {finals:>9.1f} {plain_rps:>12.1f} {batched_rps:>14.1f} "
+              f"{saved:>6.0%} {plain_p95 * 1000:>8.1f}ms {batched_p95 * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Per-chunk server CPU for the two audio ingest paths.
+
+Decodes the exact messages the server receives for one 100 ms audio chunk:
+
+* Socket.IO: an Engine.IO text frame carrying the binary-event packet with
+  its attachment placeholder, then a binary frame with the attachment, which
+  is reassembled into the event arguments.
+* Raw websocket: one binary frame with the 12-byte sequence/timestamp
+  header, split without copying the audio.
+
+Usage:
+    python benchmarks/bench_ingest_paths.py [--chunks 100000]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+from engineio import packet as eio_packet
+from socketio import packet as sio_packet
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livetranslate.ingest import AUDIO_FRAME_HEADER, parse_audio_frame  # noqa: E402
+
+CHUNK_BYTES = 3200
+
+
+def socketio_messages(audio):
+    encoded = sio_packet.Packet(sio_packet.EVENT, data=["audio_chunk", audio], namespace="/").encode()
+    text = eio_packet.Packet(eio_packet.MESSAGE, data=encoded[0]).encode()
+    binary = eio_packet.Packet(eio_packet.MESSAGE, data=encoded[1]).encode()
+    return text, binary
+
+
+def decode_socketio(text, binary):
+    pkt = sio_packet.Packet(encoded_packet=eio_packet.Packet(encoded_packet=text).data)
+    pkt.add_attachment(eio_packet.Packet(encoded_packet=binary).data)
+    return pkt.data[1]
+
+
+def decode_raw(message):
+    return parse_audio_frame(message)[2]
+
+
+def bench(fn, args, count):
+    start = time.process_time()
+    for _ in range(count):
+        fn(*args)
+    return (time.process_time() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=100000)
+    args = parser.parse_args()
+
+    audio = os.urandom(CHUNK_BYTES)
+    text, binary = socketio_messages(audio)
+    raw = struct.pack(AUDIO_FRAME_HEADER.format, 1, 1.7e12) + audio
+
+    assert decode_socketio(text, binary) == audio
+    assert decode_raw(raw) == audio
+
+    sio_cost = bench(decode_socketio, (text, binary), args.chunks)
+    raw_cost = bench(decode_raw, (raw,), args.chunks)
+
+    print(f"{'path':>12} {'frames/chunk':>13} {'wire bytes':>11} {'us/chunk':>9}")
+    print(f"{'socket.io':>12} {2:>13} {len(text) + len(binary):>11} {sio_cost * 1e6:>9.2f}")
+    print(f"{'raw ws':>12} {1:>13} {len(raw):>11} {raw_cost * 1e6:>9.2f}")
+    print(f"\nraw websocket decode is {sio_cost / raw_cost:.1f}x cheaper per chunk "
+          f"({(sio_cost - raw_cost) * 1e6 * 10:.1f} us CPU saved per session-second)")
+
+
+if __name__ == "__main__":
+    main()
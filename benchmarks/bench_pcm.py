@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the PCM normalization stage.
+
+Streams synthetic audio through PcmNormalizer in 100 ms chunks for common
+input layouts and reports audio-seconds converted per CPU-second.
+
+Usage:
+    python benchmarks/bench_pcm.py [--seconds 60] [--chunk-ms 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livetranslate.pcm import PcmNormalizer  # noqa: E402
+
+LAYOUTS = [
+    (48000, 2, "f32"),
+    (48000, 1, "f32"),
+    (44100, 2, "s16"),
+    (44100, 1, "s16"),
+    (16000, 2, "s16"),
+    (16000, 1, "f32"),
+]
+
+
+def make_audio(rate, channels, sample_format, seconds):
+    rng = np.random.default_rng(rate + channels)
+    t = np.arange(int(rate * seconds)) / rate
+    signal = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.05 * rng.standard_normal(t.size)
+    if channels == 2:
+        signal = np.repeat(signal, 2)
+    if sample_format == "s16":
+        return (signal * 32767).astype("<i2").tobytes()
+    return signal.astype("<f4").tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio per layout")
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'input':>22} {'audio-s/cpu-s':>14} {'us/chunk':>10}")
+    for rate, channels, sample_format in LAYOUTS:
+        data = make_audio(rate, channels, sample_format, args.seconds)
+        step = rate * args.chunk_ms // 1000 * channels * (2 if sample_format == "s16" else 4)
+        chunks = [data[i:i + step] for i in range(0, len(data), step)]
+
+        normalizer = PcmNormalizer(rate, channels, sample_format)
+        start = time.process_time()
+        for chunk in chunks:
+            normalizer.process(chunk)
+        elapsed = time.process_time() - start
+
+        label = f"{rate} Hz {channels}ch {sample_format}"
+        print(f"{label:>22} {args.seconds / elapsed:>14.0f} {elapsed / len(chunks) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
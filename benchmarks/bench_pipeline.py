@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the ordered per-session translation pipeline.
+
+Simulates one session speaking in bursts: several finals in quick
+succession, then a pause. Each final is followed by interim results.
+Reports final-to-translation latency and how long recognition events were
+held up, with translations awaited inline (as before) and through the
+TranslationPipeline. No network is used; DeepL is replaced by a coroutine
+with a jittered round-trip latency.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--bursts 20] [--burst-size 4] [--latency 0.15]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livetranslate.pipeline import TranslationPipeline  # noqa: E402
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def run(args, concurrency):
+    loop = asyncio.get_running_loop()
+    rng = random.Random(0)
+    pipeline = TranslationPipeline(concurrency) if concurrency else None
+    translation_latencies = []
+    recognition_delays = []
+    emitted = []
+
+    async def deepl(text):
+        await asyncio.sleep(args.latency * rng.uniform(0.5, 2.0))
+        return text.upper()
+
+    async def handle(text, is_final, sent_at):
+        # Mirrors handle_transcript: emit recognition, then translate finals
+        recognition_delays.append(loop.time() - sent_at)
+        if not is_final:
+            return
+        async def emit(translation):
+            emitted.append(translation)
+            translation_latencies.append(loop.time() - sent_at)
+
+        if pipeline is None:
+            await emit(await deepl(text))
+        else:
+            pipeline.submit(lambda: deepl(text), emit)
+
+    # Results are delivered one at a time, like a Deepgram receive loop
+    results = asyncio.Queue()
+
+    async def receiver():
+        while (item := await results.get()) is not None:
+            await handle(*item)
+
+    receiving = asyncio.create_task(receiver())
+    seq = 0
+    for _ in range(args.bursts):
+        for _ in range(args.burst_size):
+            results.put_nowait((f"final {seq}", True, loop.time()))
+            seq += 1
+            await asyncio.sleep(args.gap)
+            results.put_nowait((f"interim {seq}", False, loop.time()))
+            await asyncio.sleep(args.gap)
+        await asyncio.sleep(args.pause)
+    results.put_nowait(None)
+    await receiving
+    while len(emitted) < seq:
+        await asyncio.sleep(0.01)
+
+    assert emitted == [f"FINAL {i}" for i in range(seq)], "translations out of order"
+    return translation_latencies, recognition_delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bursts", type=int, default=20)
+    parser.add_argument("--burst-size", type=int, default=4, help="finals per burst")
+    parser.add_argument("--gap", type=float, default=0.05, help="seconds between results in a burst")
+    parser.add_argument("--pause", type=float, default=0.5, help="seconds between bursts")
+    parser.add_argument("--latency", type=float, default=0.15, help="mean simulated DeepL round-trip in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'mode':>12} {'p50 final→tr':>13} {'p95 final→tr':>13} {'p95 recog delay':>16} {'max recog delay':>16}")
+    for concurrency in [0] + args.concurrency:
+        translations, recognitions = asyncio.run(run(args, concurrency))
+        mode = "inline" if concurrency == 0 else f"pipeline x{concurrency}"
+        print(f"{mode:>12} {percentile(translations, 0.5) * 1000:>11.1f}ms "
+              f"{percentile(translations, 0.95) * 1000:>11.1f}ms "
+              f"{percentile(recognitions, 0.95) * 1000:>14.1f}ms {max(recognitions) * 1000:>14.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Translation and emit throughput against recorded Deepgram traces.
+
+Starts N listening sessions in-process with DEEPGRAM_TRANSPORT=replay.
+Each session replays a recorded trace (see DEEPGRAM_RECORD_DIR) through
+the app's real transcript handler, so every final is translated and
+emitted exactly as in production. DeepL is the local stand-in from
+``standins.py`` unless ``--deepl-url`` is given. The same traces give the
+same work on every run, so results can be compared across commits.
+
+Usage:
+    python benchmarks/bench_replay.py TRACE_OR_DIR [--sessions 100] [--speed 0] \\
+        [--deepl-latency-ms 80] [--no-segmentation] [--output replay.json]
+
+With the local stand-in, DeepL requests and characters are reported, with
+requests per minute of recorded audio. Run with and without
+``--no-segmentation`` to compare translating sentences and raw finals.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standins import Behaviour, DeepLStandIn, start_site  # noqa: E402
+
+
+async def main_async(args):
+    runner = None
+    if not args.deepl_url:
+        deepl = DeepLStandIn(Behaviour(args.deepl_latency_ms / 1000, args.deepl_jitter_ms / 1000))
+        runner = await start_site(deepl.app(), "127.0.0.1", args.deepl_port)
+        os.environ["DEEPL_API_URL"] = f"http://127.0.0.1:{args.deepl_port}"
+    else:
+        os.environ["DEEPL_API_URL"] = args.deepl_url
+
+    # The app reads its configuration at import time
+    import app as server
+    from livetranslate.metrics import registry
+    from livetranslate.recording import read_trace, trace_paths
+    from livetranslate.translate import close_deepl_client, get_translation_cache
+
+    client = server.deepgram_client
+    sessions = [f"replay-{i}" for i in range(args.sessions)]
+    request = {"source_lang": args.source_lang, "target_lang": args.target_lang}
+
+    started = time.monotonic()
+    for sid in sessions:
+        await server.start_listening(sid, dict(request))
+    await asyncio.gather(*(client.wait_finished(sid) for sid in sessions))
+    elapsed = time.monotonic() - started
+
+    # Let held sentences expire and queued translations finish
+    await asyncio.sleep(args.drain)
+    for sid in sessions:
+        await server.stop_listening(sid)
+    cache = get_translation_cache()
+    cache_stats = cache.stats() if cache is not None else None
+    await close_deepl_client()
+    if runner is not None:
+        await runner.cleanup()
+
+    stages = registry.summary()
+    translations = stages.get("caption", {}).get("count", 0)
+    report = {
+        "traces": args.traces,
+        "sessions": args.sessions,
+        "speed": args.speed,
+        "elapsed_seconds": elapsed,
+        "messages_replayed": client.messages_replayed,
+        "messages_per_second": client.messages_replayed / elapsed,
+        "translations": translations,
+        "translations_per_second": translations / elapsed,
+        "segmentation": os.environ.get("TRANSLATION_SEGMENTATION", "true"),
+        "cache": cache_stats,
+        "stages": {name: stages[name] for name in ("translation", "emit", "caption", "deepl_request")
+                   if name in stages},
+    }
+
+    if runner is not None:
+        # Recorded audio per session, approximated by each trace's last message
+        paths = trace_paths(args.traces)
+        minutes = sum(read_trace(path)[1][-1][0] for path in paths) / len(paths) * args.sessions / 60
+        report["deepl_requests"] = deepl.requests
+        report["deepl_characters"] = deepl.characters
+        report["deepl_requests_per_audio_minute"] = deepl.requests / minutes if minutes else None
+    if cache_stats is not None:
+        lookups = cache_stats["hits"] + cache_stats["disk_hits"] + cache_stats["misses"] + cache_stats["coalesced"]
+        report["cache_hit_rate"] = (lookups - cache_stats["misses"]) / lookups if lookups else None
+
+    print(f"{args.sessions} sessions, {client.messages_replayed} messages in {elapsed:.2f}s")
+    print(f"{report['messages_per_second']:.0f} messages/s, {report['translations_per_second']:.0f} translations/s")
+    if "deepl_requests" in report:
+        print(f"DeepL: {report['deepl_requests']} requests, {report['deepl_characters']} characters, "
+              f"{report['deepl_requests_per_audio_minute'] or 0:.1f} requests per minute of audio")
+    if report.get("cache_hit_rate") is not None:
+        print(f"translation cache hit rate {report['cache_hit_rate']:.1%}")
+    for name, stage in report["stages"].items():
+        print(f"  {name:>14}: p50 {stage['p50'] * 1000:7.2f} ms  p99 {stage['p99'] * 1000:7.2f} ms  (n={stage['count']})")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"report written to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("traces", help="trace file or directory of traces")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--speed", type=float, default=0, help="multiple of recorded pace; 0 = as fast as possible")
+    parser.add_argument("--source-lang", default="en-US")
+    parser.add_argument("--target-lang", default="FR")
+    parser.add_argument("--deepl-url", help="use this DeepL endpoint instead of the local stand-in")
+    parser.add_argument("--deepl-port", type=int, default=8092)
+    parser.add_argument("--deepl-latency-ms", type=float, default=0)
+    parser.add_argument("--deepl-jitter-ms", type=float, default=0)
+    parser.add_argument("--drain", type=float, default=3, help="seconds to wait for held sentences and translations")
+    parser.add_argument("--no-segmentation", action="store_true", help="translate each final as is")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "DEEPGRAM_TRANSPORT": "replay",
+        "DEEPGRAM_REPLAY_TRACE": args.traces,
+        "DEEPGRAM_REPLAY_SPEED": str(args.speed),
+        "USE_MOCK_SPEECH": "false",
+    })
+    if args.no_segmentation:
+        os.environ["TRANSLATION_SEGMENTATION"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for upstream audio frame coalescing.
+
+Feeds 100 ms linear16 chunks through three paths: one upstream message per
+chunk; the join-based coalescing app.py uses, which sends a lone chunk as is
+and joins several into one frame; and AudioRingBuffer, copying each frame out
+of the ring before sending it. A fake websocket copies every payload into a
+message buffer the way a real client does. The report gives upstream
+messages and bytes copied per audio-second, CPU cost per audio-second and
+tracemalloc peak memory.
+
+Usage:
+    python benchmarks/bench_ringbuffer.py [--seconds 600]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livetranslate.ringbuffer import AudioRingBuffer  # noqa: E402
+
+RATE = 16000
+BYTES_PER_SECOND = RATE * 2
+CHUNK_BYTES = BYTES_PER_SECOND // 10
+
+
+class FakeSocket:
+    """Frames each message like a websocket client: header + payload copy."""
+
+    def __init__(self):
+        self.messages = 0
+        self.copied = 0
+        self.last = b""
+
+    def send(self, payload):
+        self.messages += 1
+        self.copied += len(payload)
+        self.last = b"\x82\x7e" + payload
+
+
+def per_chunk(chunks, ws):
+    for chunk in chunks:
+        ws.send(chunk)
+
+
+def joined(chunks, ws, frame_ms):
+    frame_bytes = frame_ms * BYTES_PER_SECOND // 1000
+    pending = []
+    pending_bytes = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_bytes += len(chunk)
+        if pending_bytes >= frame_bytes:
+            if len(pending) == 1:
+                frame = pending[0]
+            else:
+                frame = b"".join(pending)
+                ws.copied += len(frame)
+            pending.clear()
+            pending_bytes = 0
+            ws.send(frame)
+
+
+def ring(chunks, ws, frame_ms):
+    frame_bytes = frame_ms * BYTES_PER_SECOND // 1000
+    buffer = AudioRingBuffer(5 * BYTES_PER_SECOND)
+    for chunk in chunks:
+        buffer.write(chunk)
+        ws.copied += len(chunk)
+        if buffer.pending() >= frame_bytes:
+            while (frame := buffer.read(frame_bytes)) is not None:
+                ws.copied += len(frame)
+                ws.send(bytes(frame))
+
+
+def measure(name, fn, chunks, audio_seconds):
+    ws = FakeSocket()
+    start = time.perf_counter()
+    fn(chunks, ws)
+    elapsed = time.perf_counter() - start
+
+    ws = FakeSocket()
+    tracemalloc.start()
+    fn(chunks, ws)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:>16} {ws.messages / audio_seconds:>8.1f} {ws.copied / audio_seconds / 1024:>12.1f} "
+          f"{elapsed / audio_seconds * 1e6:>12.2f} {peak / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=int, default=600, help="simulated audio duration")
+    parser.add_argument("--frames", type=int, nargs="+", default=[200, 500])
+    args = parser.parse_args()
+
+    payload = os.urandom(CHUNK_BYTES)
+    chunks = [payload] * (args.seconds * 10)
+
+    print(f"{'path':>16} {'msgs/s':>8} {'copied KiB/s':>12} {'us/audio-s':>12} {'peak KiB':>10}")
+    measure("per-chunk", per_chunk, chunks, args.seconds)
+    for frame_ms in args.frames:
+        measure(f"joined {frame_ms}ms", lambda c, ws, f=frame_ms: joined(c, ws, f), chunks, args.seconds)
+    for frame_ms in args.frames:
+        measure(f"ring {frame_ms}ms", lambda c, ws, f=frame_ms: ring(c, ws, f), chunks, args.seconds)
+    print("\nmsgs/s: upstream websocket messages per second of real-time audio, per session")
+    print("copied KiB/s: payload bytes copied per second of audio (join or ring copies, websocket framing)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark for speculative translation of stable interim results.
+
+Replays Deepgram results with their timing through the app's sentence
+segmentation, with and without the SpeculativeTranslator. Reports the
+final-to-translation (caption) latency and what speculation costs in
+extra DeepL requests and characters. No network is used; DeepL is
+replaced by a coroutine with a jittered round-trip latency.
+
+By default the sentences of the recorded fixture are spoken as one
+continuous stream: an interim per word and a final every ``--final-words``
+words, so finals cut across sentences as they do in long-form speech. A
+trace file from DEEPGRAM_RECORD_DIR replays with its recorded arrival
+times instead.
+
+Usage:
+    python benchmarks/bench_speculation.py [TRACE] [--latency 0.15] [--final-words 12]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from livetranslate.decoding import DeepgramResult, decode_message  # noqa: E402
+from livetranslate.recording import read_trace  # noqa: E402
+from livetranslate.segment import SentenceSegmenter  # noqa: E402
+from livetranslate.speculate import SpeculativeTranslator  # noqa: E402
+
+FIXTURE = os.path.join(HERE, "fixtures", "deepgram_results.jsonl")
+
+
+def synthetic_results(word_seconds, final_words, repeat, revise_rate):
+    """Speak the fixture's final sentences as ``(offset_seconds, result)`` pairs."""
+    rng = random.Random(0)
+    with open(FIXTURE) as f:
+        finals = [decode_message(line) for line in f if line.strip()]
+    words = [w for r in finals if r is not None and r.is_final for w in r.transcript.split()] * repeat
+
+    results = []
+    segment: list[str] = []
+    for i, word in enumerate(words):
+        segment.append(word)
+        offset = (i + 1) * word_seconds
+        last = i == len(words) - 1
+        if len(segment) == final_words or last:
+            # Deepgram endpoints when a sentence ends at a pause
+            speech_final = last or segment[-1].endswith((".", "?", "!"))
+            results.append((offset, DeepgramResult(" ".join(segment), True, speech_final, 0.0, [])))
+            segment = []
+        else:
+            # Now and then an interim misrecognizes an earlier word, then corrects it
+            heard = list(segment)
+            if rng.random() < revise_rate:
+                heard[rng.randrange(len(heard))] = "uh"
+            results.append((offset, DeepgramResult(" ".join(heard), False, False, 0.0, [])))
+    return results
+
+
+def trace_results(path):
+    """Return ``(offset_seconds, result)`` pairs for a trace's Results messages."""
+    _, timed = read_trace(path)
+    results = [(offset, decode_message(message)) for offset, message in timed]
+    return [(offset, result) for offset, result in results if result is not None and result.transcript]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def run(results, args, speculate):
+    loop = asyncio.get_running_loop()
+    rng = random.Random(0)
+    latencies = []
+    cost = {"requests": 0, "characters": 0}
+    pending = set()
+
+    async def deepl(text):
+        cost["requests"] += 1
+        cost["characters"] += len(text)
+        await asyncio.sleep(args.latency * rng.uniform(0.5, 2.0))
+        return text.upper()
+
+    def submit(text, final_at):
+        speculation = speculator.take(text) if speculator is not None else None
+
+        async def translate():
+            translation = await speculation if speculation is not None else await deepl(text)
+            latencies.append(loop.time() - final_at)
+            return translation
+
+        task = asyncio.create_task(translate())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    segmenter = SentenceSegmenter(submit)
+    speculator = SpeculativeTranslator(deepl) if speculate else None
+
+    started = loop.time()
+    for offset, result in results:
+        await asyncio.sleep(max(0.0, started + offset / args.speed - loop.time()))
+        if not result.is_final:
+            if speculator is not None:
+                held = segmenter.pending
+                speculator.observe(f"{held} {result.transcript}" if held else result.transcript)
+            continue
+        for sentence in segmenter.add(result.transcript, result.speech_final, loop.time()):
+            submit(sentence, loop.time())
+        if speculator is not None:
+            speculator.reset()
+
+    await asyncio.sleep(segmenter.max_hold + 0.1)
+    while pending:
+        await asyncio.gather(*pending)
+    return latencies, cost, speculator.stats() if speculator is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("trace", nargs="?", help="trace file recorded with DEEPGRAM_RECORD_DIR")
+    parser.add_argument("--latency", type=float, default=0.15, help="mean simulated DeepL round-trip in seconds")
+    parser.add_argument("--speed", type=float, default=1.0, help="multiple of the recorded pace")
+    parser.add_argument("--word-ms", type=float, default=350, help="synthetic stream: audio per word")
+    parser.add_argument("--final-words", type=int, default=12, help="synthetic stream: words per final")
+    parser.add_argument("--repeat", type=int, default=3, help="synthetic stream: times the script is spoken")
+    parser.add_argument("--revise-rate", type=float, default=0.2,
+                        help="synthetic stream: chance an interim misrecognizes an earlier word")
+    args = parser.parse_args()
+
+    if args.trace:
+        results = trace_results(args.trace)
+    else:
+        results = synthetic_results(args.word_ms / 1000, args.final_words, args.repeat, args.revise_rate)
+    plain, plain_cost, _ = asyncio.run(run(results, args, False))
+    fast, fast_cost, stats = asyncio.run(run(results, args, True))
+
+    print(f"{'mode':>12} {'captions':>9} {'p50 caption':>12} {'p95 caption':>12} {'requests':>9} {'characters':>11}")
+    for mode, latencies, cost in (("final only", plain, plain_cost), ("speculative", fast, fast_cost)):
+        print(f"{mode:>12} {len(latencies):>9} {percentile(latencies, 0.5) * 1000:>10.1f}ms "
+              f"{percentile(latencies, 0.95) * 1000:>10.1f}ms {cost['requests']:>9} {cost['characters']:>11}")
+    extra_requests = fast_cost["requests"] - plain_cost["requests"]
+    extra_characters = fast_cost["characters"] - plain_cost["characters"]
+    print(f"speculation: {stats}")
+    print(f"extra cost: {extra_requests:+d} requests ({extra_requests / max(1, plain_cost['requests']):+.0%}), "
+          f"{extra_characters:+d} characters ({extra_characters / max(1, plain_cost['characters']):+.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Load generator that streams audio from many simulated speakers.
+
+Opens N python-socketio clients against a running server. Each client sends
+``start_listening`` and then streams a WAV/PCM fixture as ``audio_chunk``
+events at real-time pace (or ``--speed`` times faster), recording when
+recognition and translation events arrive. The JSON report covers:
+
+* sessions sustained until the end
+* events per second
+* client-side latency percentiles
+* the server's own stage percentiles from ``/metrics``
+* server CPU and RSS when ``--server-pid`` is given (Linux)
+
+Runs can be compared with ``diff`` or ``jq``.
+
+Usage:
+    python benchmarks/loadgen.py --url http://localhost:5002 --sessions 200 \\
+        [--duration 60] [--fixture speech.wav] [--speed 1] [--server-pid PID] \\
+        [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import struct
+import time
+import wave
+
+import aiohttp
+import socketio
+
+RATE = 16000
+CHUNK_MS = 100
+
+
+def load_fixture(path):
+    """
+    Return the fixture's audio bytes and the ``audio_format`` to declare.
+
+    WAV files in any 16-bit layout are declared so the server resamples
+    them; ``.pcm``/``.raw`` files are taken as 16 kHz mono linear16. With no
+    path, a few seconds of tone bursts are synthesized.
+    """
+    if path is None:
+        samples = []
+        for i in range(RATE * 4):
+            # 1 s tone, 1 s silence
+            on = (i // RATE) % 2 == 0
+            samples.append(int(8000 * math.sin(2 * math.pi * 440 * i / RATE)) if on else 0)
+        return struct.pack(f"<{len(samples)}h", *samples), None
+
+    if path.lower().endswith(".wav"):
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise SystemExit(f"{path}: only 16-bit WAV files are supported")
+            audio = wav.readframes(wav.getnframes())
+            rate, channels = wav.getframerate(), wav.getnchannels()
+        if rate == RATE and channels == 1:
+            return audio, None
+        return audio, {"encoding": "s16", "sample_rate": rate, "channels": channels}
+
+    with open(path, "rb") as f:
+        return f.read(), None
+
+
+def chunk_size(audio_format):
+    if audio_format is None:
+        return RATE * 2 * CHUNK_MS // 1000
+    return audio_format["sample_rate"] * 2 * audio_format["channels"] * CHUNK_MS // 1000
+
+
+def percentiles(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50": pick(0.5),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+class SimulatedSpeaker:
+    """One Socket.IO client streaming the fixture in a loop."""
+
+    def __init__(self, index, args, audio, audio_format):
+        self.index = index
+        self.args = args
+        self.audio = audio
+        self.audio_format = audio_format
+        self.client = socketio.AsyncClient(reconnection=False)
+        self.ready = asyncio.Event()
+        self.errors = []
+        self.disconnected = False
+        self.chunks_sent = 0
+        self.slow_downs = 0
+        self.recognitions = 0
+        self.translations = 0
+        self.ready_latency = None
+        self.first_audio_at = None
+        self.first_recognition_latency = None
+        self.final_times = {}
+        self.caption_latencies = []
+
+        @self.client.on("status")
+        async def on_status(data):
+            self.ready.set()
+
+        @self.client.on("error")
+        async def on_error(data):
+            self.errors.append(data.get("message") if isinstance(data, dict) else str(data))
+
+        @self.client.on("slow_down")
+        async def on_slow_down(data):
+            self.slow_downs += 1
+
+        @self.client.on("recognition")
+        async def on_recognition(data):
+            now = time.monotonic()
+            self.recognitions += 1
+            if self.first_recognition_latency is None and self.first_audio_at is not None:
+                self.first_recognition_latency = now - self.first_audio_at
+            if data.get("is_final"):
+                self.final_times[data.get("text", "")] = now
+
+        @self.client.on("translation")
+        async def on_translation(data):
+            now = time.monotonic()
+            self.translations += 1
+            final_at = self.final_times.pop(data.get("original", ""), None)
+            if final_at is not None:
+                self.caption_latencies.append(now - final_at)
+
+        @self.client.on("disconnect")
+        async def on_disconnect():
+            self.disconnected = True
+
+    async def run(self, stop_at):
+        try:
+            await self.client.connect(self.args.url, transports=[self.args.transport])
+            started = time.monotonic()
+            request = {"source_lang": self.args.source_lang, "target_lang": self.args.target_lang}
+            if self.audio_format is not None:
+                request["audio_format"] = self.audio_format
+            await self.client.emit("start_listening", request)
+            await asyncio.wait_for(self.ready.wait(), timeout=30)
+            self.ready_latency = time.monotonic() - started
+
+            size = chunk_size(self.audio_format)
+            interval = CHUNK_MS / 1000 / self.args.speed
+            # Stagger speakers so chunks do not arrive in lockstep
+            offset = (self.index * size) % max(size, len(self.audio) - size)
+            next_send = time.monotonic()
+            self.first_audio_at = next_send
+            while time.monotonic() < stop_at and not self.disconnected:
+                if offset + size > len(self.audio):
+                    offset = 0
+                await self.client.emit("audio_chunk", self.audio[offset:offset + size])
+                offset += size
+                self.chunks_sent += 1
+                next_send += interval
+                await asyncio.sleep(max(0.0, next_send - time.monotonic()))
+
+            await self.client.emit("stop_listening")
+            # Let stop_listening reach the server and trailing results arrive
+            await asyncio.sleep(self.args.drain)
+        except Exception as e:
+            self.errors.append(repr(e))
+        finally:
+            if self.client.connected:
+                await self.client.disconnect()
+
+    @property
+    def sustained(self):
+        return self.ready.is_set() and not self.errors and self.chunks_sent > 0
+
+
+class ProcessSampler:
+    """Samples CPU time and RSS of a local process from /proc once a second."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.cpu = []
+        self.rss = []
+        self.ticks = os.sysconf("SC_CLK_TCK")
+
+    def _cpu_seconds(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.ticks
+
+    def _rss_bytes(self):
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    async def run(self):
+        last_cpu, last_time = self._cpu_seconds(), time.monotonic()
+        while True:
+            await asyncio.sleep(1)
+            cpu, now = self._cpu_seconds(), time.monotonic()
+            self.cpu.append(100 * (cpu - last_cpu) / (now - last_time))
+            self.rss.append(self._rss_bytes())
+            last_cpu, last_time = cpu, now
+
+    def report(self):
+        if not self.cpu:
+            return None
+        return {
+            "cpu_percent_mean": sum(self.cpu) / len(self.cpu),
+            "cpu_percent_max": max(self.cpu),
+            "rss_bytes_max": max(self.rss),
+            "rss_bytes_last": self.rss[-1],
+        }
+
+
+QUANTILE_LINE = re.compile(r'_stage_latency_quantile_seconds\{stage="([^"]+)",quantile="([^"]+)"\} (\S+)')
+
+
+async def server_stage_latencies(url):
+    """Read the server's per-stage quantiles from /metrics, if it has them."""
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{url.rstrip('/')}/metrics") as response:
+                text = await response.text()
+    except aiohttp.ClientError:
+        return None
+    stages = {}
+    for stage, quantile, value in QUANTILE_LINE.findall(text):
+        stages.setdefault(stage, {})[f"p{int(float(quantile) * 100)}"] = float(value)
+    return stages
+
+
+async def main_async(args):
+    audio, audio_format = load_fixture(args.fixture)
+    speakers = [SimulatedSpeaker(i, args, audio, audio_format) for i in range(args.sessions)]
+
+    sampler = ProcessSampler(args.server_pid) if args.server_pid else None
+    sampler_task = asyncio.create_task(sampler.run()) if sampler else None
+
+    started = time.monotonic()
+    stop_at = started + args.ramp + args.duration
+    tasks = []
+    for speaker in speakers:
+        tasks.append(asyncio.create_task(speaker.run(stop_at)))
+        await asyncio.sleep(args.ramp / max(1, args.sessions))
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    if sampler_task is not None:
+        sampler_task.cancel()
+
+    events = sum(s.recognitions + s.translations for s in speakers)
+    report = {
+        "config": {
+            "url": args.url,
+            "sessions": args.sessions,
+            "duration": args.duration,
+            "ramp": args.ramp,
+            "speed": args.speed,
+            "transport": args.transport,
+            "fixture": args.fixture,
+        },
+        "elapsed_seconds": elapsed,
+        "sessions_sustained": sum(s.sustained for s in speakers),
+        "sessions_failed": sum(not s.sustained for s in speakers),
+        "chunks_sent": sum(s.chunks_sent for s in speakers),
+        "recognition_events": sum(s.recognitions for s in speakers),
+        "translation_events": sum(s.translations for s in speakers),
+        "events_per_second": events / elapsed if elapsed else 0.0,
+        "slow_down_events": sum(s.slow_downs for s in speakers),
+        "client_latency_seconds": {
+            "ready": percentiles([s.ready_latency for s in speakers if s.ready_latency is not None]),
+            "first_recognition": percentiles(
+                [s.first_recognition_latency for s in speakers if s.first_recognition_latency is not None]),
+            "final_to_translation": percentiles([x for s in speakers for x in s.caption_latencies]),
+        },
+        "server_stage_latency_seconds": await server_stage_latencies(args.url),
+        "server_process": sampler.report() if sampler else None,
+        "errors": sorted({e for s in speakers for e in s.errors})[:20],
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"sessions sustained: {report['sessions_sustained']}/{args.sessions}")
+    print(f"events/sec:         {report['events_per_second']:.1f}")
+    caption = report["client_latency_seconds"]["final_to_translation"]
+    if caption:
+        print(f"final->translation: p50 {caption['p50'] * 1000:.0f} ms, p99 {caption['p99'] * 1000:.0f} ms")
+    if report["server_process"]:
+        proc = report["server_process"]
+        print(f"server:             {proc['cpu_percent_mean']:.0f}% CPU, {proc['rss_bytes_max'] / 2**20:.0f} MiB RSS")
+    print(f"report written to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:5002")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of streaming after ramp-up")
+    parser.add_argument("--ramp", type=float, default=5, help="seconds over which sessions are opened")
+    parser.add_argument("--speed", type=float, default=1.0, help="multiple of real-time audio pace")
+    parser.add_argument("--fixture", help="WAV or raw 16 kHz mono linear16 file (default: synthetic tone)")
+    parser.add_argument("--drain", type=float, default=2.0, help="seconds to wait for trailing results")
+    parser.add_argument("--transport", choices=["websocket", "polling"], default="websocket")
+    parser.add_argument("--source-lang", default="en-US")
+    parser.add_argument("--target-lang", default="FR")
+    parser.add_argument("--server-pid", type=int, help="sample this local process's CPU and RSS")
+    parser.add_argument("--output", default="loadgen-report.json")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the code that runs on every audio chunk and transcript.
+
+Each case reports:
+- ns/op: the best of several timed runs.
+- alloc B/op: the mean tracemalloc peak of one operation. This is the
+  transient memory the operation allocates above what was live before it.
+- blocks/op: memory blocks still allocated afterwards. This should be ~0;
+  growth means something is being retained.
+
+Fixtures are fixed: recorded Deepgram messages in
+``fixtures/deepgram_results.jsonl`` and seeded pseudo-random audio chunks.
+Results are compared with the saved baseline in ``baseline/micro.json``.
+The baseline is machine-specific, so save your own before comparing.
+
+Usage:
+    python benchmarks/micro.py                  # run and compare with the baseline
+    python benchmarks/micro.py --save           # run and save a new baseline
+    python benchmarks/micro.py --check          # exit 1 on regressions beyond --tolerance
+    python benchmarks/micro.py -k receive       # only cases whose name contains "receive"
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+os.environ.setdefault("USE_MOCK_SPEECH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("TRANSLATION_CACHE_SIZE", "0")
+
+FIXTURE = os.path.join(HERE, "fixtures", "deepgram_results.jsonl")
+BASELINE = os.path.join(HERE, "baseline", "micro.json")
+CHUNK_BYTES = 3200  # 100 ms of 16 kHz linear16
+
+CASES = {}
+
+
+def case(name):
+    """Register a factory returning ``run(n)``, a function or coroutine doing n operations."""
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+def deepgram_messages():
+    with open(FIXTURE) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def audio_chunks(count=16):
+    rng = random.Random(0)
+    return [rng.randbytes(CHUNK_BYTES) for _ in range(count)]
+
+
+@case("translate.deepl_language")
+def bench_deepl_language():
+    from livetranslate.translate import deepl_language
+
+    codes = ["en", "EN-US", "fr", "de", "zh", "cz", "pt-br", "ja", "ru", "xx"]
+
+    def run(n):
+        for code in itertools.islice(itertools.cycle(codes), n):
+            deepl_language(code)
+    return run
+
+
+@case("languages.resolve")
+def bench_resolve_languages():
+    from livetranslate.languages import LanguageRegistry
+
+    registry = LanguageRegistry()
+    pairs = [("en-US", "DE"), ("ru", "EN"), ("fr", "pt-br"), ("cz", "zh"), ("xx", "EN")]
+
+    def run(n):
+        for source, target in itertools.islice(itertools.cycle(pairs), n):
+            registry.resolve(source, target)
+    return run
+
+
+@case("decoding.decode_message")
+def bench_decode_message():
+    from livetranslate.decoding import decode_message
+
+    messages = deepgram_messages()
+
+    def run(n):
+        for message in itertools.islice(itertools.cycle(messages), n):
+            decode_message(message)
+    return run
+
+
+class _FixtureSocket:
+    """Yields fixture messages to a receive loop, like a websocket."""
+
+    def __init__(self, messages, n):
+        self.messages = messages
+        self.n = n
+
+    async def __aiter__(self):
+        for message in itertools.islice(itertools.cycle(self.messages), self.n):
+            yield message
+
+
+@case("deepgram_ws.receive")
+def bench_ws_receive():
+    import deepgram_ws
+
+    client = deepgram_ws.DeepgramWebsocketClient(api_key="bench", pool_size=0)
+    messages = deepgram_messages()
+
+    async def callback(result):
+        pass
+
+    connection = deepgram_ws._Connection(ws=None, outgoing=asyncio.Queue(), callback=callback)
+
+    async def run(n):
+        connection.ws = _FixtureSocket(messages, n)
+        await client._receive("bench", connection)
+    return run
+
+
+@case("deepgram_client.on_transcript")
+def bench_sdk_on_transcript():
+    try:
+        import deepgram_client
+    except ImportError:
+        return None
+    if deepgram_client.USE_NEW_SDK:
+        return None
+
+    class FakeSocket:
+        class event:
+            TRANSCRIPT_RECEIVED = "transcript"
+            CLOSE = "close"
+
+        def __init__(self):
+            self.handlers = {}
+
+        def registerHandler(self, event, handler):
+            self.handlers[event] = handler
+
+    client = deepgram_client.DeepgramLiveClient.__new__(deepgram_client.DeepgramLiveClient)
+    client.connections = {"bench": FakeSocket()}
+    client.recorders = {}
+
+    async def callback(result):
+        pass
+
+    client.register_transcript_callback("bench", callback)
+    on_transcript = client.connections["bench"].handlers["transcript"]
+    # The SDK hands every parsed message to the handler, not only results
+    messages = [json.loads(m) for m in deepgram_messages()]
+    logging.getLogger("deepgram_client").setLevel(logging.CRITICAL)
+
+    async def run(n):
+        for message in itertools.islice(itertools.cycle(messages), n):
+            await on_transcript(message)
+    return run
+
+
+def _bench_app():
+    import app
+    return app
+
+
+class _FakeEngineIOSocket:
+    """Encodes packets like the real socket's writer, without a transport."""
+
+    closed = False
+
+    async def send(self, pkt):
+        pkt.encode()
+
+
+@case("socketio.emit_recognition")
+def bench_emit_recognition():
+    app = _bench_app()
+    sio = app.sio
+    sio.eio.sockets["bench-eio"] = _FakeEngineIOSocket()
+    sid = asyncio.get_event_loop().run_until_complete(sio.manager.connect("bench-eio", "/"))
+    payload = {"text": "The new translation pipeline is ready for a wider", "is_final": False}
+
+    async def run(n):
+        for _ in range(n):
+            await sio.emit("recognition", dict(payload), room=sid)
+    return run
+
+
+@case("app.ingest_audio")
+def bench_ingest_audio():
+    app = _bench_app()
+    from livetranslate.ingest import AudioIngestQueue
+
+    chunks = audio_chunks()
+    # Never full, so every op is a plain handoff; cleared between runs
+    queue = AudioIngestQueue(maxsize=1 << 30)
+    app.client_audio_queues["bench"] = queue
+    app.client_tracers["bench"] = app.SessionTracer()
+
+    async def run(n):
+        for chunk in itertools.islice(itertools.cycle(chunks), n):
+            await app.ingest_audio("bench", chunk)
+        queue._chunks.clear()
+    return run
+
+
+def call(loop, run, n):
+    result = run(n)
+    if asyncio.iscoroutine(result):
+        loop.run_until_complete(result)
+
+
+def measure(loop, run, min_time, repeats):
+    """Return (ns/op, alloc B/op, blocks/op) for one case."""
+    call(loop, run, 10)  # warm up imports and caches
+
+    # Calibrate n so one run takes at least min_time
+    n = 1
+    while True:
+        start = time.perf_counter_ns()
+        call(loop, run, n)
+        if time.perf_counter_ns() - start >= min_time * 1e9 or n >= 1 << 24:
+            break
+        n *= 2
+
+    gc.collect()
+    gc.disable()
+    try:
+        best = min(_timed(loop, run, n) for _ in range(repeats))
+    finally:
+        gc.enable()
+
+    samples = 50
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call(loop, run, 1)
+            peak += tracemalloc.get_traced_memory()[1] - before
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        call(loop, run, samples)
+        gc.collect()
+        blocks = (sys.getallocatedblocks() - blocks_before) / samples
+    finally:
+        tracemalloc.stop()
+    return best / n, peak / samples, blocks
+
+
+def _timed(loop, run, n):
+    start = time.perf_counter_ns()
+    call(loop, run, n)
+    return time.perf_counter_ns() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases containing this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="save results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a case regressed beyond --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE)
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("cases", {})
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results = {}
+    regressions = []
+    print(f"{'case':<32} {'ns/op':>10} {'alloc B/op':>11} {'blocks/op':>10} {'vs base':>9}")
+    for name, factory in CASES.items():
+        if args.pattern not in name:
+            continue
+        run = factory()
+        if run is None:
+            print(f"{name:<32} {'skipped (dependency not available)':>43}")
+            continue
+        ns, alloc, blocks = measure(loop, run, args.min_time, args.repeats)
+        results[name] = {"ns_per_op": round(ns, 1), "alloc_bytes_per_op": round(alloc), "blocks_per_op": round(blocks, 2)}
+        delta = ""
+        if name in baseline:
+            change = ns / baseline[name]["ns_per_op"] - 1
+            delta = f"{change:+.0%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                delta += " !"
+        print(f"{name:<32} {ns:>10.0f} {alloc:>11.0f} {blocks:>10.2f} {delta:>9}")
+    loop.close()
+
+    if args.save:
+        merged = {**baseline, **results}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "cases": merged,
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
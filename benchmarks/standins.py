@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the Deepgram live API and the DeepL REST API.
+
+Runs two aiohttp servers so the production transcription, translation and
+emit code paths can be benchmarked and soak-tested with no network:
+
+* Deepgram: a websocket at ``/v1/listen`` that accepts linear16 audio,
+  KeepAlive and CloseStream messages. It answers with ``Results`` messages
+  (interim and final, with timed words and speakers) paced by the audio it
+  has received, plus ``UtteranceEnd`` when ``utterance_end_ms`` is requested.
+* DeepL: ``POST /v2/translate``, ``GET /v2/usage`` and ``GET /v2/languages``.
+
+Latency, jitter, error rate and 429 responses are configurable for both.
+Point the server at them with:
+
+    DEEPGRAM_URL=ws://127.0.0.1:8081/v1/listen DEEPL_API_URL=http://127.0.0.1:8082
+
+Usage:
+    python benchmarks/standins.py [--deepgram-port 8081] [--deepl-port 8082] \\
+        [--deepgram-latency-ms 150] [--deepl-latency-ms 80] [--jitter-ms 30] \\
+        [--deepl-error-rate 0.01] [--deepl-429-rate 0.02] [--deepgram-drop-rate 0.001]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+from aiohttp import WSMsgType, web
+
+BYTES_PER_SECOND = 16000 * 2
+
+SCRIPT = (
+    "good morning everyone and thank you for joining the weekly planning call "
+    "today we will review the release schedule and the open support tickets "
+    "the new translation pipeline is ready for a wider rollout next week "
+    "please send any questions to the team before friday afternoon"
+).split()
+
+LANGUAGES = [
+    ("BG", "Bulgarian"), ("CS", "Czech"), ("DA", "Danish"), ("DE", "German"),
+    ("EL", "Greek"), ("EN", "English"), ("ES", "Spanish"), ("ET", "Estonian"),
+    ("FI", "Finnish"), ("FR", "French"), ("HU", "Hungarian"), ("ID", "Indonesian"),
+    ("IT", "Italian"), ("JA", "Japanese"), ("KO", "Korean"), ("LT", "Lithuanian"),
+    ("LV", "Latvian"), ("NB", "Norwegian"), ("NL", "Dutch"), ("PL", "Polish"),
+    ("PT", "Portuguese"), ("RO", "Romanian"), ("RU", "Russian"), ("SK", "Slovak"),
+    ("SL", "Slovenian"), ("SV", "Swedish"), ("TR", "Turkish"), ("UK", "Ukrainian"),
+    ("ZH", "Chinese"),
+]
+TARGET_VARIANTS = [("EN-GB", "English (British)"), ("EN-US", "English (American)"),
+                   ("PT-BR", "Portuguese (Brazilian)"), ("PT-PT", "Portuguese (European)")]
+
+
+@dataclass
+class Behaviour:
+    """Latency and failure knobs for one stand-in."""
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+
+    def delay(self, rng: random.Random) -> float:
+        return max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+
+
+class DeepgramStandIn:
+    """
+    Speaks enough of the Deepgram live protocol for the server's transports.
+
+    Words are taken from a fixed script, one per ``word_seconds`` of audio
+    received. Each new word produces an interim result for the current
+    utterance. After ``utterance_words`` words, a final result is sent with
+    ``speech_final`` set. Results are delayed by the configured latency
+    without being reordered. ``error_rate`` is the chance, per second of
+    audio, of dropping the socket, to exercise reconnects.
+    """
+
+    def __init__(self, behaviour: Behaviour, word_seconds: float = 0.35,
+                 utterance_words: int = 8, speakers: int = 2, seed: int = 0) -> None:
+        self.behaviour = behaviour
+        self.word_seconds = word_seconds
+        self.utterance_words = utterance_words
+        self.speakers = speakers
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.results_sent = 0
+        self.drops = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/v1/listen", self.listen)
+        return app
+
+    def _results(self, words: list[dict], start: float, end: float, is_final: bool) -> str:
+        self.results_sent += 1
+        return json.dumps({
+            "type": "Results",
+            "channel_index": [0, 1],
+            "duration": round(end - start, 3),
+            "start": round(start, 3),
+            "is_final": is_final,
+            "speech_final": is_final,
+            "channel": {"alternatives": [{
+                "transcript": " ".join(w["punctuated_word"] for w in words),
+                "confidence": 0.98,
+                "words": words,
+            }]},
+            "metadata": {"request_id": str(uuid.uuid4()), "model_info": {"name": "standin"}},
+        })
+
+    async def listen(self, request: web.Request) -> web.WebSocketResponse:
+        if self.behaviour.throttle_rate and self.rng.random() < self.behaviour.throttle_rate:
+            raise web.HTTPTooManyRequests(headers={"Retry-After": str(self.behaviour.retry_after)})
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        utterance_end = request.query.get("utterance_end_ms")
+
+        outgoing: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(self._send_delayed(ws, outgoing))
+        loop = asyncio.get_running_loop()
+
+        def send(message: str) -> None:
+            outgoing.put_nowait((loop.time() + self.behaviour.delay(self.rng), message))
+
+        received = 0
+        emitted = 0  # words emitted so far across the stream
+        utterance: list[dict] = []
+        script_pos = self.rng.randrange(len(SCRIPT))
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    if json.loads(msg.data).get("type") == "CloseStream":
+                        break
+                    continue
+                if msg.type != WSMsgType.BINARY:
+                    continue
+
+                before = received / BYTES_PER_SECOND
+                received += len(msg.data)
+                now_s = received / BYTES_PER_SECOND
+                if self.behaviour.error_rate and self.rng.random() < self.behaviour.error_rate * (now_s - before):
+                    self.drops += 1
+                    await ws.close(code=1011, message=b"stand-in drop")
+                    break
+
+                while (emitted + 1) * self.word_seconds <= now_s:
+                    start = emitted * self.word_seconds
+                    text = SCRIPT[(script_pos + emitted) % len(SCRIPT)]
+                    last = len(utterance) + 1 == self.utterance_words
+                    utterance.append({
+                        "word": text,
+                        "start": round(start, 3),
+                        "end": round(start + self.word_seconds * 0.9, 3),
+                        "confidence": 0.98,
+                        "speaker": (emitted // self.utterance_words) % self.speakers,
+                        "punctuated_word": text.capitalize() if not utterance else text + ("." if last else ""),
+                    })
+                    emitted += 1
+                    begin, end = utterance[0]["start"], utterance[-1]["end"]
+                    if last:
+                        send(self._results(utterance, begin, end, True))
+                        if utterance_end:
+                            send(json.dumps({"type": "UtteranceEnd", "channel": [0, 1], "last_word_end": end}))
+                        utterance = []
+                    else:
+                        send(self._results(utterance, begin, end, False))
+
+            if utterance and not ws.closed:
+                send(self._results(utterance, utterance[0]["start"], utterance[-1]["end"], True))
+            send(json.dumps({"type": "Metadata", "duration": received / BYTES_PER_SECOND}))
+            outgoing.put_nowait(None)
+            await sender
+        finally:
+            sender.cancel()
+            await ws.close()
+        return ws
+
+    async def _send_delayed(self, ws: web.WebSocketResponse, outgoing: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        not_before = 0.0
+        while (item := await outgoing.get()) is not None:
+            due, message = item
+            # Never reorder: a message is not sent before the one ahead of it
+            not_before = max(not_before, due)
+            await asyncio.sleep(max(0.0, not_before - loop.time()))
+            if ws.closed:
+                return
+            await ws.send_str(message)
+
+
+class DeepLStandIn:
+    """Answers DeepL requests with tagged source text after a configurable delay."""
+
+    def __init__(self, behaviour: Behaviour, seed: int = 0) -> None:
+        self.behaviour = behaviour
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.characters = 0
+        self.errors = 0
+        self.throttled = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v2/translate", self.translate)
+        app.router.add_get("/v2/usage", self.usage)
+        app.router.add_get("/v2/languages", self.languages)
+        return app
+
+    async def translate(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.behaviour.delay(self.rng))
+        if self.behaviour.throttle_rate and self.rng.random() < self.behaviour.throttle_rate:
+            self.throttled += 1
+            return web.json_response({"message": "Too many requests"}, status=429,
+                                     headers={"Retry-After": str(self.behaviour.retry_after)})
+        if self.behaviour.error_rate and self.rng.random() < self.behaviour.error_rate:
+            self.errors += 1
+            return web.json_response({"message": "Internal error"}, status=500)
+
+        if request.content_type == "application/json":
+            body = await request.json()
+        else:
+            form = await request.post()
+            body = {"text": form.getall("text", []), "source_lang": form.get("source_lang"),
+                    "target_lang": form.get("target_lang")}
+        texts = body.get("text") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        target = (body.get("target_lang") or "EN").upper()
+        source = (body.get("source_lang") or "EN").upper()
+        self.characters += sum(len(t) for t in texts)
+        return web.json_response({"translations": [
+            {"detected_source_language": source, "text": f"[{target}] {text}"} for text in texts
+        ]})
+
+    async def usage(self, request: web.Request) -> web.Response:
+        return web.json_response({"character_count": self.characters, "character_limit": 500000000})
+
+    async def languages(self, request: web.Request) -> web.Response:
+        targets = request.query.get("type") == "target"
+        langs = LANGUAGES + TARGET_VARIANTS if targets else LANGUAGES
+        return web.json_response([{"language": code, "name": name} for code, name in langs])
+
+
+async def start_site(app: web.Application, host: str, port: int) -> web.AppRunner:
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def main_async(args) -> None:
+    deepgram = DeepgramStandIn(
+        Behaviour(args.deepgram_latency_ms / 1000, args.jitter_ms / 1000,
+                  args.deepgram_drop_rate, args.deepgram_429_rate, args.retry_after),
+        word_seconds=args.word_ms / 1000, utterance_words=args.utterance_words, seed=args.seed)
+    deepl = DeepLStandIn(
+        Behaviour(args.deepl_latency_ms / 1000, args.jitter_ms / 1000,
+                  args.deepl_error_rate, args.deepl_429_rate, args.retry_after),
+        seed=args.seed)
+    runners = [
+        await start_site(deepgram.app(), args.host, args.deepgram_port),
+        await start_site(deepl.app(), args.host, args.deepl_port),
+    ]
+    print(f"Deepgram stand-in: ws://{args.host}:{args.deepgram_port}/v1/listen")
+    print(f"DeepL stand-in:    http://{args.host}:{args.deepl_port}")
+    started = time.monotonic()
+    try:
+        while True:
+            await asyncio.sleep(args.report_every)
+            print(f"[{time.monotonic() - started:6.0f}s] deepgram connections={deepgram.connections} "
+                  f"results={deepgram.results_sent} drops={deepgram.drops} | deepl requests={deepl.requests} "
+                  f"chars={deepl.characters} errors={deepl.errors} throttled={deepl.throttled}")
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--deepgram-port", type=int, default=8081)
+    parser.add_argument("--deepl-port", type=int, default=8082)
+    parser.add_argument("--deepgram-latency-ms", type=float, default=150)
+    parser.add_argument("--deepl-latency-ms", type=float, default=80)
+    parser.add_argument("--jitter-ms", type=float, default=30)
+    parser.add_argument("--deepgram-drop-rate", type=float, default=0.0,
+                        help="chance per second of audio that a Deepgram socket is dropped")
+    parser.add_argument("--deepgram-429-rate", type=float, default=0.0,
+                        help="chance a Deepgram connection attempt is rejected with 429")
+    parser.add_argument("--deepl-error-rate", type=float, default=0.0, help="chance of a DeepL 500")
+    parser.add_argument("--deepl-429-rate", type=float, default=0.0, help="chance of a DeepL 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--word-ms", type=float, default=350, help="audio per recognized word")
+    parser.add_argument("--utterance-words", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report-every", type=float, default=10)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ import asyncio
 import ssl
 from typing import Dict, Any, Optional, Callable, Coroutine
 
+from livetranslate.decoding import decode_message, result_from_dict
+from livetranslate.recording import TraceRecorder, create_recorder
+
 # Create an SSL context that doesn't verify certificates (for development only)
 ssl_context = ssl.create_default_context()
 ssl_context.check_hostname = False
@@ -31,6 +34,17 @@ except ImportError:
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Live endpoint override shared with deepgram_ws, e.g. ws://127.0.0.1:8081/v1/listen
+DEEPGRAM_URL = os.environ.get('DEEPGRAM_URL')
+
+
+def _api_url(live_url: str) -> str:
+    """Convert a live websocket URL into the SDK's HTTP API base URL."""
+    url = live_url.split('?', 1)[0].rstrip('/')
+    if url.endswith('/listen'):
+        url = url[:-len('/listen')]
+    return 'http' + url[2:] if url.startswith('ws') else url
+
 class DeepgramLiveClient:
     """A wrapper around the Deepgram SDK for live transcription."""
 
@@ -46,15 +60,25 @@ class DeepgramLiveClient:
 
         # Initialize the Deepgram client based on the available SDK version
         if USE_NEW_SDK:
-            self.client = DeepgramClient(api_key=self.api_key)
+            if DEEPGRAM_URL:
+                from deepgram import DeepgramClientOptions
+                self.client = DeepgramClient(self.api_key, DeepgramClientOptions(url=_api_url(DEEPGRAM_URL)))
+            else:
+                self.client = DeepgramClient(api_key=self.api_key)
             logger.info("Using new Deepgram SDK with DeepgramClient")
         else:
-            self.client = Deepgram(self.api_key)
+            options = {'api_key': self.api_key}
+            if DEEPGRAM_URL:
+                options['api_url'] = _api_url(DEEPGRAM_URL)
+            self.client = Deepgram(options)
             logger.info("Using older Deepgram SDK with Deepgram")
 
         # Store the connection for each session
         self.connections: Dict[str, Any] = {}
 
+        # Raw result traces per session, when DEEPGRAM_RECORD_DIR is set
+        self.recorders: Dict[str, TraceRecorder] = {}
+
         logger.info("Deepgram client initialized")
 
     async def start_connection(self,
@@ -129,6 +153,9 @@ class DeepgramLiveClient:
 
             # Store the connection
             self.connections[session_id] = connection
+            recorder = create_recorder(session_id, transport='sdk', language=language, model=model)
+            if recorder is not None:
+                self.recorders[session_id] = recorder
 
             logger.info(f"Started Deepgram connection for session {session_id} with language {language}")
             return True
@@ -156,32 +183,28 @@ class DeepgramLiveClient:
         socket = self.connections[session_id]
 
         # Define the event handler for the transcript
+        recorder = self.recorders.get(session_id)
+
         async def on_transcript(transcript_data):
             try:
-                # Extract the transcript
-                if not transcript_data or 'channel' not in transcript_data:
-                    return
-
-                alternatives = transcript_data.get('channel', {}).get('alternatives', [])
-                if not alternatives:
-                    return
-
-                transcript = alternatives[0].get('transcript', '')
-                if not transcript:
-                    # Skip empty transcripts
+                if isinstance(transcript_data, dict):
+                    if recorder is not None:
+                        # Serialized on the recorder's writer thread
+                        recorder.record(transcript_data)
+                    result = result_from_dict(transcript_data)
+                else:
+                    # The newer SDK passes response objects
+                    message = transcript_data.to_json()
+                    if recorder is not None:
+                        recorder.record(message)
+                    result = decode_message(message)
+
+                # Skip other message types and empty transcripts
+                if result is None or not result.transcript.strip():
                     return
 
-                # Determine if this is a final result
-                is_final = transcript_data.get('is_final', False)
-
-                # Create a simplified result object
-                result_data = {
-                    'text': transcript,
-                    'is_final': is_final
-                }
-
                 # Call the user-provided callback
-                await callback(result_data)
+                await callback(result.event())
 
             except Exception as e:
                 logger.error(f"Error processing transcript for session {session_id}: {e}")
@@ -232,6 +255,30 @@ class DeepgramLiveClient:
             logger.error(f"Error sending audio data for session {session_id}: {e}")
             return False
 
+    async def keep_alive(self, session_id: str) -> bool:
+        """Send a KeepAlive message so Deepgram keeps a silent stream open.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            True if the message was sent successfully, False otherwise
+        """
+        if session_id not in self.connections:
+            logger.error(f"No Deepgram connection found for session {session_id}")
+            return False
+
+        try:
+            socket = self.connections[session_id]
+            if hasattr(socket, 'keep_alive'):
+                socket.keep_alive()
+            else:
+                socket.send(json.dumps({"type": "KeepAlive"}))
+            return True
+        except Exception as e:
+            logger.error(f"Error sending keep-alive for session {session_id}: {e}")
+            return False
+
     async def close_connection(self, session_id: str) -> bool:
         """Close the Deepgram connection for a session.
 
@@ -252,6 +299,10 @@ class DeepgramLiveClient:
 
             # Clean up
             del self.connections[session_id]
+            recorder = self.recorders.pop(session_id, None)
+            if recorder is not None:
+                recorder.close()
+                logger.info(f"Recorded {recorder.messages} Deepgram messages to {recorder.path}")
 
             logger.info(f"Closed Deepgram connection for session {session_id}")
             return True
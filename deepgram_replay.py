@@ -0,0 +1,144 @@
+"""
+Deepgram transport that replays recorded result traces.
+
+:class:`DeepgramReplayClient` has the interface of
+:class:`deepgram_ws.DeepgramWebsocketClient`, but its sockets play back
+trace files written with ``DEEPGRAM_RECORD_DIR`` instead of talking to
+Deepgram. Results go through the same receive, de-duplication and
+``register_transcript_callback`` path as live traffic, so translation and
+emit throughput can be measured against real conversations without
+network access or randomness.
+
+Select it with ``DEEPGRAM_TRANSPORT=replay`` and ``DEEPGRAM_REPLAY_TRACE``
+(a trace file, or a directory whose traces are assigned to sessions in
+turn). ``DEEPGRAM_REPLAY_SPEED`` sets the pace: 1 for recorded timing, 0 for
+as fast as possible.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from deepgram_ws import DeepgramWebsocketClient, PoolKey, _Connection
+from livetranslate.recording import iter_messages, read_trace, trace_paths
+
+logger = logging.getLogger(__name__)
+
+REPLAY_TRACE = os.environ.get('DEEPGRAM_REPLAY_TRACE', '')
+REPLAY_SPEED = float(os.environ.get('DEEPGRAM_REPLAY_SPEED', 1))
+
+
+class _ReplaySocket:
+    """Stands in for a websocket: yields trace messages, swallows sends."""
+
+    def __init__(self, messages: List[Tuple[float, str]], speed: float,
+                 callback_registered: asyncio.Event) -> None:
+        self.messages = messages
+        self.speed = speed
+        self.callback_registered = callback_registered
+        self.open = True
+        self.delivered = 0
+
+    async def send(self, data) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.open = False
+
+    async def __aiter__(self):
+        # Trace time starts when results can be delivered, like a live session
+        await self.callback_registered.wait()
+        for delay, message in iter_messages(self.messages, self.speed):
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay == 0:
+                # Yield to the loop so replays of many sessions interleave
+                await asyncio.sleep(0)
+            if not self.open:
+                return
+            self.delivered += 1
+            yield message
+
+
+class DeepgramReplayClient(DeepgramWebsocketClient):
+    """Replays recorded Deepgram traces through the websocket client's receive path."""
+
+    def __init__(self, trace: str = REPLAY_TRACE, speed: float = REPLAY_SPEED):
+        """Load the traces to replay.
+
+        Args:
+            trace: A trace file or a directory of traces
+            speed: Multiple of recorded pace; 0 replays as fast as possible
+        """
+        if not trace:
+            raise ValueError("Set DEEPGRAM_REPLAY_TRACE to a trace file or directory to replay")
+        super().__init__(api_key='replay', pool_size=0)
+        self.traces = [read_trace(path)[1] for path in trace_paths(trace)]
+        if not self.traces:
+            raise ValueError(f"No Deepgram traces found at {trace}")
+        self.speed = speed
+        self._next_trace = itertools.cycle(range(len(self.traces)))
+        self._callback_events: Dict[str, asyncio.Event] = {}
+        self.finished: Dict[str, asyncio.Event] = {}
+        self.messages_replayed = 0
+        logger.info(f"Replaying {len(self.traces)} Deepgram trace(s) at speed {speed or 'max'}")
+
+    async def _connect(self, key: PoolKey):
+        raise RuntimeError("Replay sockets are created per session")
+
+    async def start_connection(self, session_id: str, language: str = 'en-US',
+                               interim_results: bool = True, smart_format: bool = True,
+                               model: str = 'nova-2') -> bool:
+        """Start replaying the next trace for a session.
+
+        Args:
+            session_id: A unique identifier for the session
+            language: Ignored; the trace determines the results
+            interim_results: Ignored
+            smart_format: Ignored
+            model: Ignored
+
+        Returns:
+            True
+        """
+        messages = self.traces[next(self._next_trace)]
+        registered = self._callback_events[session_id] = asyncio.Event()
+        self.finished[session_id] = asyncio.Event()
+        ws = _ReplaySocket(messages, self.speed, registered)
+        connection = _Connection(ws=ws, outgoing=asyncio.Queue(), pooled=False)
+        connection.ready.set()
+        connection.tasks = [
+            asyncio.create_task(self._sender(session_id, connection)),
+            asyncio.create_task(self._receiver(session_id, connection)),
+        ]
+        self.connections[session_id] = connection
+        return True
+
+    def register_transcript_callback(self, session_id: str, callback) -> bool:
+        registered = super().register_transcript_callback(session_id, callback)
+        if registered:
+            self._callback_events[session_id].set()
+        return registered
+
+    async def _receive(self, session_id: str, connection: _Connection) -> None:
+        await super()._receive(session_id, connection)
+        self.messages_replayed += connection.ws.delivered
+
+    async def _reconnect(self, session_id: str, connection: _Connection) -> bool:
+        # The end of a trace is the end of the session's results
+        self._callback_events.pop(session_id, None)
+        finished = self.finished.get(session_id)
+        if finished is not None:
+            finished.set()
+        return False
+
+    async def wait_finished(self, session_id: str, timeout: Optional[float] = None) -> None:
+        """Wait until a session's trace has been fully delivered."""
+        await asyncio.wait_for(self.finished[session_id].wait(), timeout)
+
+    async def close_connection(self, session_id: str) -> bool:
+        self.finished.pop(session_id, None)
+        self._callback_events.pop(session_id, None)
+        return await super().close_connection(session_id)
@@ -0,0 +1,612 @@
+"""
+Pure-asyncio Deepgram live transcription transport.
+
+This module talks to the Deepgram streaming API directly over ``websockets``
+instead of going through the SDK, so every session is served by one
+sender/receiver coroutine pair on the event loop and no threads are created.
+It exposes the same interface as :class:`deepgram_client.DeepgramLiveClient`.
+"""
+
+import os
+import json
+import logging
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Deque, Dict, Any, Optional, Callable, Coroutine, Tuple
+from urllib.parse import urlencode
+
+import websockets
+
+from livetranslate.decoding import DeepgramResult, decode_message
+from livetranslate.recording import TraceRecorder, create_recorder
+from livetranslate.ringbuffer import AudioRingBuffer
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEEPGRAM_URL = os.environ.get('DEEPGRAM_URL', 'wss://api.deepgram.com/v1/listen')
+
+# Deepgram closes a stream after ~10 s without data, so ping well before that
+KEEPALIVE_INTERVAL = float(os.environ.get('DEEPGRAM_KEEPALIVE_INTERVAL', 5))
+
+# How long to wait for trailing results after CloseStream
+CLOSE_TIMEOUT = float(os.environ.get('DEEPGRAM_CLOSE_TIMEOUT', 2))
+
+# Idle pre-opened connections kept per (language, model, encoding, ...) key; 0 disables pooling
+POOL_SIZE = int(os.environ.get('DEEPGRAM_POOL_SIZE', 0))
+
+# Recycle idle pooled sockets older than this many seconds
+POOL_MAX_IDLE = float(os.environ.get('DEEPGRAM_POOL_MAX_IDLE', 300))
+
+# Reconnect with exponential backoff when the upstream socket drops
+RECONNECT_ATTEMPTS = int(os.environ.get('DEEPGRAM_RECONNECT_ATTEMPTS', 6))
+RECONNECT_BASE_DELAY = float(os.environ.get('DEEPGRAM_RECONNECT_BASE_DELAY', 0.25))
+RECONNECT_MAX_DELAY = float(os.environ.get('DEEPGRAM_RECONNECT_MAX_DELAY', 8))
+
+# Seconds of recently sent audio re-sent on a new socket after a reconnect
+REPLAY_SECONDS = float(os.environ.get('DEEPGRAM_REPLAY_SECONDS', 3))
+
+# Audio messages queued for the sender before send_audio waits; backpressure
+# then reaches the session's ingest queue instead of growing memory
+SEND_QUEUE_SIZE = int(os.environ.get('DEEPGRAM_SEND_QUEUE_SIZE', 50))
+
+# linear16 mono at 16 kHz, used to convert replayed bytes to stream time
+BYTES_PER_SECOND = 16000 * 2
+
+TranscriptCallback = Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]
+
+# (language, model, encoding, interim_results, smart_format)
+PoolKey = Tuple[str, str, str, bool, bool]
+
+
+@dataclass
+class _Connection:
+    """State of one session's upstream Deepgram stream, across reconnects."""
+    ws: Any
+    outgoing: asyncio.Queue
+    key: Optional[PoolKey] = None
+    callback: Optional[TranscriptCallback] = None
+    tasks: list = field(default_factory=list)
+    pooled: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    first_transcript_at: Optional[float] = None
+    # Set while the socket is usable; cleared while reconnecting
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    closing: bool = False
+    failed: bool = False
+    # Recently sent audio and the session-wide stream clock
+    replay: AudioRingBuffer = field(default_factory=lambda: AudioRingBuffer(
+        max(1, int(REPLAY_SECONDS * BYTES_PER_SECOND))))
+    sent_bytes: int = 0
+    # Session time (s) at which the current socket's stream time 0 starts
+    time_offset: float = 0.0
+    # Stream-time span (s) of the current socket that repeats replayed audio
+    replayed_seconds: float = 0.0
+    # Session time (s) of the end of the last final transcript delivered
+    last_final_end: float = 0.0
+    # Raw message trace, when DEEPGRAM_RECORD_DIR is set
+    recorder: Optional[TraceRecorder] = None
+
+
+def _word_text(word: Dict[str, Any]) -> str:
+    return word.get('punctuated_word') or word.get('word', '')
+
+
+class DeepgramConnectionPool:
+    """Keeps idle, pre-opened Deepgram sockets ready per options key.
+
+    Every key that has been warmed or requested is refilled in the background
+    up to ``warm_size`` idle sockets. Idle sockets receive KeepAlive messages
+    so Deepgram does not time them out, and are recycled after ``max_idle``.
+    """
+
+    def __init__(self,
+                 connect: Callable[[PoolKey], Awaitable[Any]],
+                 warm_size: int = POOL_SIZE,
+                 max_idle: float = POOL_MAX_IDLE,
+                 keepalive_interval: float = KEEPALIVE_INTERVAL):
+        """Initialize the pool.
+
+        Args:
+            connect: Coroutine opening a new upstream socket for a key
+            warm_size: Idle sockets to keep per key
+            max_idle: Seconds after which an idle socket is replaced
+            keepalive_interval: Seconds between KeepAlive messages on idle sockets
+        """
+        self.connect = connect
+        self.warm_size = warm_size
+        self.max_idle = max_idle
+        self.keepalive_interval = keepalive_interval
+        self.idle: Dict[PoolKey, Deque[Tuple[Any, float]]] = {}
+        self._refilling: Dict[PoolKey, asyncio.Task] = {}
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def warm(self, key: PoolKey) -> None:
+        """Start keeping ``warm_size`` idle sockets for a key."""
+        self.idle.setdefault(key, deque())
+        self._schedule_refill(key)
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def acquire(self, key: PoolKey) -> Optional[Any]:
+        """Take a ready socket for a key, or None if none is idle."""
+        idle = self.idle.get(key)
+        ws = None
+        while idle:
+            candidate, opened_at = idle.popleft()
+            if candidate.open and time.monotonic() - opened_at < self.max_idle:
+                ws = candidate
+                break
+            asyncio.create_task(candidate.close())
+
+        if ws is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.warm(key)
+        return ws
+
+    def _schedule_refill(self, key: PoolKey) -> None:
+        task = self._refilling.get(key)
+        if task is None or task.done():
+            self._refilling[key] = asyncio.create_task(self._refill(key))
+
+    async def _refill(self, key: PoolKey) -> None:
+        idle = self.idle.setdefault(key, deque())
+        try:
+            while len(idle) < self.warm_size:
+                ws = await self.connect(key)
+                idle.append((ws, time.monotonic()))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Could not pre-open Deepgram socket for {key}: {e}")
+
+    async def _keepalive(self) -> None:
+        message = json.dumps({"type": "KeepAlive"})
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            for key, idle in list(self.idle.items()):
+                for entry in list(idle):
+                    ws, opened_at = entry
+                    try:
+                        if not ws.open or now - opened_at >= self.max_idle:
+                            raise ConnectionError("stale")
+                        await ws.send(message)
+                    except Exception:
+                        idle.remove(entry)
+                        asyncio.create_task(ws.close())
+                if len(idle) < self.warm_size:
+                    self._schedule_refill(key)
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "idle": sum(len(idle) for idle in self.idle.values()),
+        }
+
+    async def close(self) -> None:
+        """Stop refilling and close every idle socket."""
+        tasks = list(self._refilling.values())
+        if self._keepalive_task is not None:
+            tasks.append(self._keepalive_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        sockets = [ws for idle in self.idle.values() for ws, _ in idle]
+        self.idle.clear()
+        await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+
+
+class DeepgramWebsocketClient:
+    """A thread-free Deepgram live transcription client built on asyncio."""
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 url: str = DEEPGRAM_URL,
+                 pool_size: int = POOL_SIZE):
+        """Initialize the Deepgram client.
+
+        Args:
+            api_key: The Deepgram API key. If not provided, it will be read from the environment.
+            url: The Deepgram streaming endpoint.
+            pool_size: Idle pre-opened sockets to keep per options key (0 disables the pool).
+        """
+        self.api_key = api_key or os.environ.get('DEEPGRAM_API_KEY')
+        if not self.api_key:
+            raise ValueError("Deepgram API key not found. Please set the DEEPGRAM_API_KEY environment variable.")
+
+        self.url = url
+
+        # Store the connection for each session
+        self.connections: Dict[str, _Connection] = {}
+
+        self.pool = DeepgramConnectionPool(self._connect, pool_size) if pool_size > 0 else None
+
+        # Seconds from session start to first transcript, split by pool hit/miss
+        self.first_transcript_times: Dict[bool, Deque[float]] = {
+            True: deque(maxlen=1000),
+            False: deque(maxlen=1000),
+        }
+
+        # Reconnect metrics
+        self.reconnects = 0
+        self.reconnect_failures = 0
+        self.reconnect_times: Deque[float] = deque(maxlen=1000)
+        self.replayed_bytes = 0
+        self.duplicate_results = 0
+
+        logger.info("Deepgram websocket client initialized")
+
+    def build_url(self,
+                  language: str,
+                  interim_results: bool,
+                  smart_format: bool,
+                  model: str,
+                  encoding: str = 'linear16') -> str:
+        """Return the streaming URL with the live transcription options."""
+        options = {
+            "model": model,
+            "language": language,
+            "smart_format": str(smart_format).lower(),
+            "interim_results": str(interim_results).lower(),
+            "punctuate": "true",
+            "diarize": "true",
+            "encoding": encoding,
+            "sample_rate": 16000,
+            "channels": 1,
+        }
+        return f"{self.url}?{urlencode(options)}"
+
+    async def _connect(self, key: PoolKey) -> Any:
+        language, model, encoding, interim_results, smart_format = key
+        return await websockets.connect(
+            self.build_url(language, interim_results, smart_format, model, encoding),
+            extra_headers={"Authorization": f"Token {self.api_key}"},
+        )
+
+    def warm_pool(self, languages, model: str = 'nova-2') -> None:
+        """Pre-open idle sockets for the given languages with default options."""
+        if self.pool is None:
+            return
+        for language in languages:
+            self.pool.warm((language, model, 'linear16', True, True))
+        logger.info(f"Warming Deepgram connection pool for {', '.join(languages)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool, time-to-first-transcript and reconnect metrics."""
+        def mean(values):
+            return sum(values) / len(values) if values else None
+
+        stats = {
+            "connections": len(self.connections),
+            "first_transcript_pooled": mean(self.first_transcript_times[True]),
+            "first_transcript_fresh": mean(self.first_transcript_times[False]),
+            "reconnects": self.reconnects,
+            "reconnect_failures": self.reconnect_failures,
+            "reconnect_time": mean(self.reconnect_times),
+            "replayed_bytes": self.replayed_bytes,
+            "duplicate_results": self.duplicate_results,
+        }
+        if self.pool is not None:
+            stats["pool"] = self.pool.stats()
+        return stats
+
+    async def start_connection(self,
+                              session_id: str,
+                              language: str = 'en-US',
+                              interim_results: bool = True,
+                              smart_format: bool = True,
+                              model: str = 'nova-2') -> bool:
+        """Start a new Deepgram connection for a session.
+
+        Args:
+            session_id: A unique identifier for the session
+            language: The language code for speech recognition
+            interim_results: Whether to return interim results
+            smart_format: Whether to use smart formatting
+            model: The Deepgram model to use
+
+        Returns:
+            True if the connection was successfully started, False otherwise
+        """
+        started_at = time.monotonic()
+        key: PoolKey = (language, model, 'linear16', interim_results, smart_format)
+        ws = await self.pool.acquire(key) if self.pool is not None else None
+        pooled = ws is not None
+        if ws is None:
+            try:
+                ws = await self._connect(key)
+            except Exception as e:
+                logger.error(f"Could not open Deepgram socket for session {session_id}: {e}")
+                return False
+
+        connection = _Connection(ws=ws, outgoing=asyncio.Queue(max(1, SEND_QUEUE_SIZE)), key=key, pooled=pooled, started_at=started_at)
+        connection.recorder = create_recorder(session_id, transport='websocket', language=language, model=model)
+        connection.ready.set()
+        connection.tasks = [
+            asyncio.create_task(self._sender(session_id, connection)),
+            asyncio.create_task(self._receiver(session_id, connection)),
+        ]
+        self.connections[session_id] = connection
+
+        logger.info(f"Started {'pooled' if pooled else 'new'} Deepgram connection for session {session_id} "
+                    f"with language {language}")
+        return True
+
+    def register_transcript_callback(self,
+                                    session_id: str,
+                                    callback: TranscriptCallback) -> bool:
+        """Register a callback for transcript events.
+
+        Args:
+            session_id: The session ID
+            callback: A coroutine function that will be called with the transcript data
+
+        Returns:
+            True if the callback was registered successfully, False otherwise
+        """
+        if session_id not in self.connections:
+            logger.error(f"No Deepgram connection found for session {session_id}")
+            return False
+
+        self.connections[session_id].callback = callback
+        logger.info(f"Registered transcript callback for session {session_id}")
+        return True
+
+    async def send_audio(self, session_id: str, audio_data: bytes) -> bool:
+        """Queue audio data for the session's sender coroutine.
+
+        Waits while the queue is full, e.g. during a reconnect, so a stalled
+        upstream slows the caller down instead of buffering without bound.
+
+        Args:
+            session_id: The session ID
+            audio_data: The audio data to send
+
+        Returns:
+            True if the audio was queued, False otherwise
+        """
+        connection = self.connections.get(session_id)
+        if connection is None:
+            logger.error(f"No Deepgram connection found for session {session_id}")
+            return False
+        if connection.failed:
+            return False
+
+        await connection.outgoing.put(audio_data)
+        return True
+
+    def failed(self, session_id: str) -> bool:
+        """Return True if the session's stream was lost and reconnecting gave up."""
+        connection = self.connections.get(session_id)
+        return connection is not None and connection.failed
+
+    async def keep_alive(self, session_id: str) -> bool:
+        """Send a KeepAlive message so Deepgram keeps a silent stream open.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            True if the message was queued, False otherwise
+        """
+        connection = self.connections.get(session_id)
+        if connection is None:
+            logger.error(f"No Deepgram connection found for session {session_id}")
+            return False
+
+        # Queued audio keeps the stream open just as well
+        if not connection.outgoing.full():
+            connection.outgoing.put_nowait(json.dumps({"type": "KeepAlive"}))
+        return True
+
+    async def _sender(self, session_id: str, connection: _Connection) -> None:
+        """Send queued audio upstream, with KeepAlive messages during gaps.
+
+        Audio is recorded in the replay buffer before it is sent, so a chunk
+        lost to a dropped socket is re-sent by the reconnect replay.
+        """
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(connection.outgoing.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    chunk = json.dumps({"type": "KeepAlive"})
+
+                if chunk is None:
+                    await connection.ws.send(json.dumps({"type": "CloseStream"}))
+                    return
+                if not chunk:
+                    continue
+                if not connection.ready.is_set():
+                    await connection.ready.wait()
+                if connection.failed:
+                    return
+                if not isinstance(chunk, str):
+                    connection.replay.write(chunk)
+                    connection.sent_bytes += len(chunk)
+
+                ws = connection.ws
+                try:
+                    await ws.send(chunk)
+                except websockets.ConnectionClosed:
+                    # The receiver reconnects; this chunk is in the replay
+                    if connection.ws is ws:
+                        connection.ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending audio to Deepgram for session {session_id}: {e}")
+
+    async def _reconnect(self, session_id: str, connection: _Connection) -> bool:
+        """Open a new upstream socket with backoff and replay recent audio."""
+        connection.ready.clear()
+        started = time.monotonic()
+        delay = RECONNECT_BASE_DELAY
+        for attempt in range(1, RECONNECT_ATTEMPTS + 1):
+            try:
+                ws = await self._connect(connection.key)
+            except Exception as e:
+                logger.warning(f"Deepgram reconnect attempt {attempt} for session {session_id} failed: {e}")
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+
+            # The new stream's time 0 is the start of the replayed audio
+            replay = connection.replay.tail(connection.replay.capacity)
+            connection.replayed_seconds = len(replay) / BYTES_PER_SECOND
+            connection.time_offset = connection.sent_bytes / BYTES_PER_SECOND - connection.replayed_seconds
+            connection.ws = ws
+            try:
+                if replay:
+                    await ws.send(replay)
+            except websockets.ConnectionClosed:
+                continue
+
+            elapsed = time.monotonic() - started
+            self.reconnects += 1
+            self.reconnect_times.append(elapsed)
+            self.replayed_bytes += len(replay)
+            connection.ready.set()
+            logger.info(f"Reconnected Deepgram for session {session_id} in {elapsed:.2f}s, "
+                        f"replayed {len(replay)} bytes")
+            return True
+
+        self.reconnect_failures += 1
+        connection.failed = True
+        connection.ready.set()
+        # Nothing will be sent any more; release a send_audio waiting for room
+        while not connection.outgoing.empty():
+            connection.outgoing.get_nowait()
+        logger.error(f"Giving up reconnecting Deepgram for session {session_id} after {RECONNECT_ATTEMPTS} attempts")
+        return False
+
+    def _deduplicate(self, connection: _Connection, result: DeepgramResult) -> None:
+        """Drop words already delivered in a final before a reconnect.
+
+        Results covering replayed audio are mapped to session time through
+        their word timestamps; words ending before the last delivered final
+        are removed from the result, which may leave its transcript empty.
+        """
+        words = result.words
+        if connection.replayed_seconds and words and result.start < connection.replayed_seconds:
+            kept = [w for w in words
+                    if w.get("end", 0.0) + connection.time_offset > connection.last_final_end + 0.01]
+            if len(kept) < len(words):
+                self.duplicate_results += 1
+                words = result.words = kept
+                result.transcript = " ".join(_word_text(w) for w in kept)
+
+        if result.is_final and words:
+            connection.last_final_end = max(connection.last_final_end,
+                                            words[-1].get("end", 0.0) + connection.time_offset)
+
+    async def _receiver(self, session_id: str, connection: _Connection) -> None:
+        """Receive Deepgram results and hand transcripts to the callback.
+
+        If the socket drops while the session is still open, reconnects and
+        keeps receiving on the new socket.
+        """
+        while True:
+            try:
+                await self._receive(session_id, connection)
+            except asyncio.CancelledError:
+                raise
+            except websockets.ConnectionClosed as e:
+                logger.info(f"Deepgram connection closed for session {session_id} with code {e.code}")
+            except Exception as e:
+                logger.error(f"Error receiving from Deepgram for session {session_id}: {e}")
+            else:
+                logger.info(f"Deepgram connection closed for session {session_id}")
+
+            if connection.closing or not await self._reconnect(session_id, connection):
+                return
+
+    async def _receive(self, session_id: str, connection: _Connection) -> None:
+        async for msg in connection.ws:
+            if connection.recorder is not None:
+                connection.recorder.record(msg)
+            try:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Deepgram response for {session_id}: {msg}")
+
+                # Only Results messages are parsed
+                result = decode_message(msg)
+                if result is None:
+                    continue
+                self._deduplicate(connection, result)
+
+                # Skip empty transcripts
+                if not result.transcript or not result.transcript.strip():
+                    continue
+
+                if connection.first_transcript_at is None:
+                    connection.first_transcript_at = time.monotonic()
+                    self.first_transcript_times[connection.pooled].append(
+                        connection.first_transcript_at - connection.started_at)
+
+                if connection.callback is not None:
+                    await connection.callback(result.event())
+            except json.JSONDecodeError as e:
+                logger.error(f"Error decoding JSON from Deepgram: {e}")
+            except Exception as e:
+                logger.error(f"Error processing transcript for session {session_id}: {e}")
+
+    async def close_connection(self, session_id: str) -> bool:
+        """Close the Deepgram connection for a session.
+
+        Asks Deepgram to flush pending results with CloseStream and waits
+        briefly for the receiver to deliver them before tearing down.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            True if the connection was closed successfully, False otherwise
+        """
+        connection = self.connections.pop(session_id, None)
+        if connection is None:
+            logger.warning(f"No Deepgram connection found for session {session_id}")
+            return False
+
+        sender, receiver = connection.tasks
+        connection.closing = True
+        try:
+            # Queued after any pending audio, which may need the timeout to drain
+            await asyncio.wait_for(connection.outgoing.put(None), CLOSE_TIMEOUT)
+            await asyncio.wait({sender, receiver}, timeout=CLOSE_TIMEOUT,
+                               return_when=asyncio.ALL_COMPLETED)
+        except asyncio.TimeoutError:
+            logger.warning(f"Deepgram sender for session {session_id} did not drain before closing")
+        finally:
+            for task in connection.tasks:
+                task.cancel()
+            await asyncio.gather(*connection.tasks, return_exceptions=True)
+            try:
+                await connection.ws.close()
+            except Exception as e:
+                logger.error(f"Error closing Deepgram connection for session {session_id}: {e}")
+            if connection.recorder is not None:
+                connection.recorder.close()
+                logger.info(f"Recorded {connection.recorder.messages} Deepgram messages to {connection.recorder.path}")
+
+        logger.info(f"Closed Deepgram connection for session {session_id}")
+        return True
+
+    async def close_all_connections(self) -> None:
+        """Close all Deepgram connections."""
+        await asyncio.gather(*(self.close_connection(session_id) for session_id in list(self.connections)))
+        if self.pool is not None:
+            await self.pool.close()
+
+        logger.info("Closed all Deepgram connections")
@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for running Screen Whisper on several cores.
+
+Usage:
+    gunicorn app:app -c gunicorn.conf.py
+
+Each worker is an aiohttp process bound to the same port with SO_REUSEPORT.
+Engine.IO is restricted to websockets so a session never spans workers, and
+Socket.IO emits reach other workers through SOCKETIO_MESSAGE_QUEUE. If no
+queue is configured, a local Unix-socket broker is started with the master.
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5002')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'aiohttp.GunicornWebWorker'
+reuse_port = True
+# Long-lived websockets: don't recycle workers on a request timeout
+timeout = 0
+graceful_timeout = 30
+
+os.environ.setdefault('SOCKETIO_WEBSOCKET_ONLY', 'true')
+
+_broker = None
+
+
+def on_starting(server):
+    """Start a local message broker unless a queue URL was configured."""
+    global _broker
+    if os.getenv('SOCKETIO_MESSAGE_QUEUE'):
+        return
+    path = os.path.join(tempfile.gettempdir(), f"screenwhisper-{os.getpid()}.sock")
+    _broker = subprocess.Popen([sys.executable, '-m', 'livetranslate.pubsub', path])
+    os.environ['SOCKETIO_MESSAGE_QUEUE'] = f"unix://{path}"
+    server.log.info(f"Started Socket.IO message broker on {path}")
+
+
+def on_exit(server):
+    if _broker is not None:
+        _broker.terminate()
+        _broker.wait()
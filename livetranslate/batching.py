@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+BatchKey = tuple[str, str, str]
+SendBatch = Callable[[list[str], str, str, str], Awaitable[list[str]]]
+
+
+class BatchingTranslator:
+    """
+    Collect translations from many sessions into multi-text DeepL requests.
+
+    Calls sharing a (source_lang, target_lang, context) key that arrive within
+    ``max_wait`` seconds of each other are sent as one request of up to
+    ``max_batch`` texts. Each caller awaits only its own result.
+    """
+
+    def __init__(
+        self,
+        send_batch: SendBatch,
+        max_wait: float = 0.005,
+        max_batch: int = 25,
+    ) -> None:
+        """
+        :param send_batch: Coroutine translating a list of texts for one key.
+        :param max_wait: Longest time a text waits for companions, in seconds.
+        :param max_batch: Flush as soon as this many texts are pending.
+        """
+        self.send_batch = send_batch
+        self.max_wait = max_wait
+        self.max_batch = max(1, max_batch)
+        self._pending: dict[BatchKey, list[tuple[str, asyncio.Future]]] = {}
+        self._timers: dict[BatchKey, asyncio.TimerHandle] = {}
+        self._inflight: set[asyncio.Task] = set()
+        self.requests_sent = 0
+        self.texts_sent = 0
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: str,
+    ) -> str:
+        """
+        Queue a text for the next batch of its key and wait for its result.
+
+        :param text: The text to be translated.
+        :param source_lang: The source language code.
+        :param target_lang: The target language code.
+        :param context: Additional context for the translation.
+        :return: The translated text.
+        """
+        loop = asyncio.get_running_loop()
+        key: BatchKey = (source_lang, target_lang, context)
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((text, future))
+
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: BatchKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._send(key, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, key: BatchKey, batch: list[tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        self.requests_sent += 1
+        self.texts_sent += len(texts)
+        try:
+            results = await self.send_batch(texts, *key)
+        except Exception as e:
+            logger.error(f"Batched translation of {len(texts)} text(s) failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(results) < len(batch):
+            logger.error(f"Batched translation returned {len(results)} of {len(batch)} result(s)")
+            results = list(results) + [""] * (len(batch) - len(results))
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Flush anything still pending and wait for in-flight batches."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
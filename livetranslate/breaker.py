@@ -0,0 +1,70 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream endpoint is unhealthy.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    refuses calls for ``reset_timeout`` seconds. It then lets one trial call
+    through every ``reset_timeout`` seconds (half-open); success closes it
+    again, failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 10.0) -> None:
+        """
+        :param name: Endpoint name, for logs.
+        :param failure_threshold: Consecutive failures that open the breaker.
+        :param reset_timeout: Seconds to stay open before a trial call.
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Return whether a call may go upstream now."""
+        if self.state == CLOSED:
+            return True
+        # Also covers a trial call that never reported back
+        now = time.monotonic()
+        if now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.opened_at = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.opened += 1
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failure(s)")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, str, str]
+Translate = Callable[[str, str, str, str], Awaitable[str]]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a transcript for cache lookups (NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class DiskCache:
+    """
+    SQLite-backed cache tier that survives restarts.
+
+    All queries run on a single worker thread so the connection is never
+    shared between threads and the event loop never blocks on disk I/O.
+    """
+
+    def __init__(self, path: str, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation-cache")
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source_lang TEXT, target_lang TEXT, text TEXT,"
+                " translated TEXT, expires REAL,"
+                " PRIMARY KEY (source_lang, target_lang, text))"
+            )
+        return self._conn
+
+    def _get(self, key: CacheKey) -> tuple[str, float] | None:
+        row = self._connect().execute(
+            "SELECT translated, expires FROM translations"
+            " WHERE source_lang = ? AND target_lang = ? AND text = ?",
+            key,
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0], row[1]
+
+    def _set(self, key: CacheKey, value: str, expires: float) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+            (*key, value, expires),
+        )
+        conn.commit()
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def get(self, key: CacheKey) -> tuple[str, float] | None:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, key)
+
+    async def set(self, key: CacheKey, value: str, expires: float) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._set, key, value, expires)
+
+    async def close(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=False)
+
+
+class _Flight:
+    """An in-flight translation and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache with single-flight deduplication.
+
+    The first tier is an in-memory LRU with a TTL; the optional second tier
+    is a :class:`DiskCache`. Concurrent lookups of the same uncached key share
+    one in-flight translation instead of each calling DeepL. That translation
+    is cancelled only once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl: float = 86400,
+        disk_path: str | None = None,
+    ) -> None:
+        """
+        :param max_entries: Maximum entries kept in memory before LRU eviction.
+        :param ttl: Seconds an entry stays valid in either tier.
+        :param disk_path: SQLite file for the persistent tier, or None.
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.disk = DiskCache(disk_path, ttl) if disk_path else None
+        self._entries: OrderedDict[CacheKey, tuple[str, float]] = OrderedDict()
+        self._inflight: dict[CacheKey, _Flight] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(text: str, source_lang: str, target_lang: str) -> CacheKey:
+        return (source_lang.upper(), target_lang.upper(), normalize_text(text))
+
+    def _get_memory(self, key: CacheKey) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_memory(self, key: CacheKey, value: str, expires: float) -> None:
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, text: str, source_lang: str, target_lang: str) -> str | None:
+        """Return a cached translation from either tier, or None."""
+        key = self.key(text, source_lang, target_lang)
+        value = self._get_memory(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        if self.disk is not None:
+            try:
+                entry = await self.disk.get(key)
+            except Exception as e:
+                logger.warning(f"Translation disk cache read failed: {e}")
+                entry = None
+            if entry is not None:
+                self.disk_hits += 1
+                self._set_memory(key, *entry)
+                return entry[0]
+        return None
+
+    async def set(self, text: str, source_lang: str, target_lang: str, value: str) -> None:
+        """Store a translation in both tiers."""
+        key = self.key(text, source_lang, target_lang)
+        expires = time.time() + self.ttl
+        self._set_memory(key, value, expires)
+        if self.disk is not None:
+            try:
+                await self.disk.set(key, value, expires)
+            except Exception as e:
+                logger.warning(f"Translation disk cache write failed: {e}")
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: str,
+        translate: Translate,
+    ) -> str:
+        """
+        Return a cached translation or compute it once via ``translate``.
+
+        :param text: The text to be translated.
+        :param source_lang: The source language code.
+        :param target_lang: The target language code.
+        :param context: Additional context, passed through on a miss only.
+        :param translate: Coroutine used to translate on a cache miss.
+        :return: The translated text; empty results are not cached.
+        """
+        cached = await self.get(text, source_lang, target_lang)
+        if cached is not None:
+            return cached
+
+        key = self.key(text, source_lang, target_lang)
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # Owned by no single caller, so one caller giving up cannot fail the others
+            task = asyncio.create_task(self._fetch(text, source_lang, target_lang, context, translate))
+            flight = self._inflight[key] = _Flight(task)
+            task.add_done_callback(lambda t: self._landed(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller has given up; nobody is left to use the result
+                flight.task.cancel()
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+    async def _fetch(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: str,
+        translate: Translate,
+    ) -> str:
+        value = await translate(text, source_lang, target_lang, context)
+        if value:
+            await self.set(text, source_lang, target_lang, value)
+        return value
+
+    def _landed(self, key: CacheKey, flight: _Flight) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        # Mark retrieved so a failure nobody awaited is not reported as lost
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+        }
+
+    async def close(self) -> None:
+        if self.disk is not None:
+            await self.disk.close()
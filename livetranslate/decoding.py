@@ -0,0 +1,129 @@
+"""
+Decoding of Deepgram live transcription messages.
+
+Both Deepgram transports feed the same handler here. Raw websocket text goes
+through :func:`decode_message`, and the dicts the SDK has already parsed go
+through :func:`result_from_dict`. Only ``Results`` messages are decoded, and
+only into the few fields the app uses. Other message types are recognised
+from the raw text and skipped without parsing. JSON is parsed with
+``orjson`` when it is installed (``pip install orjson``), otherwise with the
+standard library. ``DEEPGRAM_JSON_CODEC`` forces one or the other.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RESULTS = "Results"
+
+# "auto" uses orjson when available; "orjson" or "json" forces a codec
+JSON_CODEC: str = os.getenv("DEEPGRAM_JSON_CODEC", "auto").lower()
+
+# Deepgram puts the message type first, so the first "type" key is the top-level one.
+# Escaped quotes inside transcripts cannot match.
+_TYPE_PATTERN = re.compile(r'"type"\s*:\s*"([A-Za-z]+)"')
+_TYPE_PATTERN_BYTES = re.compile(_TYPE_PATTERN.pattern.encode())
+
+
+def _select_codec(name: str):
+    if name == "json" or (name == "auto" and orjson is None):
+        return "json", json.loads
+    if orjson is None:
+        raise ImportError("DEEPGRAM_JSON_CODEC=orjson but orjson is not installed")
+    return "orjson", orjson.loads
+
+
+# Both codecs raise json.JSONDecodeError (orjson's error subclasses it)
+codec, loads = _select_codec(JSON_CODEC)
+
+
+class DeepgramResult:
+    """The parts of one Deepgram ``Results`` message the app uses."""
+
+    __slots__ = ("transcript", "is_final", "speech_final", "start", "words")
+
+    def __init__(self, transcript: str, is_final: bool, speech_final: bool,
+                 start: float, words: list[dict[str, Any]]) -> None:
+        self.transcript = transcript
+        self.is_final = is_final
+        self.speech_final = speech_final
+        self.start = start
+        self.words = words
+
+    @property
+    def speaker(self) -> Any:
+        """The most frequent diarized speaker, or ``"unknown"``."""
+        # Diarization labels every word or none
+        if not self.words or "speaker" not in self.words[0]:
+            return "unknown"
+        counter = Counter(w["speaker"] for w in self.words if "speaker" in w)
+        if counter:
+            return counter.most_common(1)[0][0]
+        return "unknown"
+
+    def event(self) -> dict[str, Any]:
+        """
+        Return the dict passed to transcript callbacks.
+
+        Only finals carry ``speaker``; counting it over the words of every
+        interim would cost more than the interim is worth.
+        """
+        event = {"text": self.transcript, "is_final": self.is_final,
+                 "speech_final": self.speech_final}
+        if self.is_final:
+            event["speaker"] = self.speaker
+        return event
+
+
+def message_type(message: str | bytes) -> str | None:
+    """Return the ``type`` of a raw Deepgram message without parsing it, if found."""
+    pattern = _TYPE_PATTERN_BYTES if isinstance(message, (bytes, bytearray)) else _TYPE_PATTERN
+    match = pattern.search(message, 0, 256)
+    if match is None:
+        return None
+    kind = match.group(1)
+    return kind if isinstance(kind, str) else kind.decode()
+
+
+def result_from_dict(data: dict[str, Any]) -> DeepgramResult | None:
+    """
+    Extract a result from a parsed message.
+
+    :param data: A decoded Deepgram message.
+    :return: The result, or None if the message is not a ``Results`` message.
+    """
+    if data.get("type", RESULTS) != RESULTS:
+        return None
+    channel = data.get("channel")
+    if not isinstance(channel, dict):
+        return None
+    alternatives = channel.get("alternatives")
+    alternative = alternatives[0] if alternatives else {}
+    return DeepgramResult(
+        alternative.get("transcript") or "",
+        bool(data.get("is_final", False)),
+        bool(data.get("speech_final", False)),
+        data.get("start", 0.0),
+        alternative.get("words") or [],
+    )
+
+
+def decode_message(message: str | bytes) -> DeepgramResult | None:
+    """
+    Decode a raw Deepgram message.
+
+    :param message: Websocket message text.
+    :return: The result, or None for other message types, which are not parsed.
+    :raises json.JSONDecodeError: If a ``Results`` message is not valid JSON.
+    """
+    kind = message_type(message)
+    if kind is not None and kind != RESULTS:
+        return None
+    return result_from_dict(loads(message))
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import struct
+from collections import deque
+
+# What to do with a new audio chunk when a session's queue is full
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+COALESCE = "coalesce"
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, COALESCE)
+
+# Raw websocket audio frames: little-endian uint32 sequence number and
+# float64 capture timestamp (ms since the epoch), followed by the audio bytes
+AUDIO_FRAME_HEADER = struct.Struct("<Id")
+
+AUDIO_QUEUE_SIZE: int = int(os.getenv("AUDIO_QUEUE_SIZE", "10"))
+AUDIO_OVERFLOW_POLICY: str = os.getenv("AUDIO_OVERFLOW_POLICY", DROP_OLDEST)
+
+
+class AudioIngestQueue:
+    """
+    Bounded, never-blocking audio queue for one session.
+
+    ``put_nowait`` always returns immediately so a slow upstream can never
+    stall the Socket.IO handler. When the queue is full the overflow policy
+    decides what is lost: the oldest queued chunk, the incoming chunk, or
+    nothing at all (``coalesce`` appends the chunk to the last queued one).
+
+    The queue also tracks back-pressure with hysteresis: it reports pressure
+    once depth reaches ``high_mark`` and releases it at ``low_mark``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = AUDIO_QUEUE_SIZE,
+        policy: str = AUDIO_OVERFLOW_POLICY,
+        high_mark: int | None = None,
+        low_mark: int | None = None,
+    ) -> None:
+        """
+        :param maxsize: Maximum number of queued chunks.
+        :param policy: One of ``drop-oldest``, ``drop-newest`` or ``coalesce``.
+        :param high_mark: Depth at which the client is asked to slow down.
+        :param low_mark: Depth at which the client may resume normal pace.
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {OVERFLOW_POLICIES}")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.high_mark = high_mark if high_mark is not None else max(1, self.maxsize * 4 // 5)
+        self.low_mark = low_mark if low_mark is not None else self.maxsize // 4
+        self._chunks: deque[bytes] = deque()
+        self._ready = asyncio.Event()
+        self.pressured = False
+        self.accepted = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+
+    def qsize(self) -> int:
+        return len(self._chunks)
+
+    def full(self) -> bool:
+        return len(self._chunks) >= self.maxsize
+
+    def put_nowait(self, chunk: bytes) -> bool:
+        """
+        Queue a chunk according to the overflow policy.
+
+        :param chunk: Raw audio bytes.
+        :return: True if the chunk's audio is kept, False if it was dropped.
+        """
+        kept = True
+        if self.full():
+            if self.policy == DROP_NEWEST:
+                self.dropped += 1
+                kept = False
+            elif self.policy == DROP_OLDEST:
+                self._chunks.popleft()
+                self.dropped += 1
+                self._chunks.append(chunk)
+            else:
+                self._chunks[-1] = b"".join((self._chunks[-1], chunk))
+                self.coalesced += 1
+        else:
+            self._chunks.append(chunk)
+
+        if kept:
+            self.accepted += 1
+        self.high_water = max(self.high_water, len(self._chunks))
+        self._ready.set()
+        return kept
+
+    async def get(self) -> bytes:
+        """Wait for and return the oldest queued chunk."""
+        while not self._chunks:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._chunks.popleft()
+
+    def pressure_changed(self) -> bool | None:
+        """
+        Update the back-pressure state from the current depth.
+
+        :return: True when pressure starts, False when it is released,
+            None when the state did not change.
+        """
+        depth = len(self._chunks)
+        if not self.pressured and depth >= self.high_mark:
+            self.pressured = True
+            return True
+        if self.pressured and depth <= self.low_mark:
+            self.pressured = False
+            return False
+        return None
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "policy": self.policy,
+            "depth": len(self._chunks),
+            "high_water": self.high_water,
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
+def parse_audio_frame(message: bytes) -> tuple[int, float, memoryview]:
+    """
+    Split a raw websocket audio frame into its header fields and payload.
+
+    :param message: A binary message from the ``/ws/audio`` endpoint.
+    :return: Sequence number, capture timestamp in ms, and the audio as a
+        view into ``message`` (no copy).
+    :raises ValueError: If the message is shorter than the header.
+    """
+    if len(message) < AUDIO_FRAME_HEADER.size:
+        raise ValueError(f"Audio frame of {len(message)} bytes is shorter than its header")
+    sequence, captured_ms = AUDIO_FRAME_HEADER.unpack_from(message)
+    return sequence, captured_ms, memoryview(message)[AUDIO_FRAME_HEADER.size:]
+
+
+class FrameSequence:
+    """Tracks gaps and reordering in a stream of sequence-numbered frames."""
+
+    def __init__(self) -> None:
+        self.expected: int | None = None
+        self.received = 0
+        self.lost = 0
+        self.reordered = 0
+
+    def observe(self, sequence: int) -> None:
+        self.received += 1
+        if self.expected is not None:
+            if sequence > self.expected:
+                self.lost += sequence - self.expected
+            elif sequence < self.expected:
+                self.reordered += 1
+                return
+        self.expected = sequence + 1
+
+    def stats(self) -> dict[str, int]:
+        return {"received": self.received, "lost": self.lost, "reordered": self.reordered}
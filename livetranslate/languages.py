@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Fetches DeepL's language list for "source" or "target"
+FetchLanguages = Callable[[str], Awaitable[list[str]]]
+
+# Codes DeepL documents when the live list cannot be fetched
+DEFAULT_SOURCE_LANGUAGES: tuple[str, ...] = (
+    "BG", "CS", "DA", "DE", "EL", "EN", "ES", "ET", "FI", "FR", "HU", "ID",
+    "IT", "JA", "KO", "LT", "LV", "NB", "NL", "PL", "PT", "RO", "RU", "SK",
+    "SL", "SV", "TR", "UK", "ZH",
+)
+DEFAULT_TARGET_LANGUAGES: tuple[str, ...] = DEFAULT_SOURCE_LANGUAGES + (
+    "EN-GB", "EN-US", "PT-BR", "PT-PT",
+)
+
+# Common non-ISO codes clients send
+ALIASES: dict[str, str] = {
+    "CH": "ZH",  # Chinese
+    "CN": "ZH",
+    "CZ": "CS",  # Czech
+    "GR": "EL",  # Greek
+}
+
+# Variant used for a bare target code DeepL only accepts with a region
+PREFERRED_VARIANTS: dict[str, str] = {
+    "EN": "EN-US",
+    "PT": "PT-PT",
+    "ZH": "ZH-HANS",
+}
+
+# Deepgram codes by base language; other codes are passed through as given
+DEEPGRAM_LANGUAGES: dict[str, str] = {
+    "en": "en-US",
+    "ru": "ru",
+}
+
+# On-disk copy of the fetched lists; an empty path keeps them in memory only
+DEEPL_LANGUAGES_PATH: str = os.getenv("DEEPL_LANGUAGES_PATH", "deepl_languages.json")
+DEEPL_LANGUAGES_TTL: float = float(os.getenv("DEEPL_LANGUAGES_TTL", "604800"))
+
+
+def _build_table(codes: Iterable[str], preferred: dict[str, str]) -> dict[str, str]:
+    """Map every accepted spelling of a language to the code DeepL expects."""
+    codes = [code.upper() for code in codes]
+    table = {code: code for code in codes}
+    for code in codes:
+        base = code.split("-")[0]
+        if base not in table:
+            variant = preferred.get(base)
+            table[base] = variant if variant in table else code
+    for alias, code in ALIASES.items():
+        if code in table:
+            table.setdefault(alias, table[code])
+    return table
+
+
+def _base(code: str) -> str:
+    return code.split("-")[0]
+
+
+@dataclass(frozen=True)
+class SessionLanguages:
+    """Languages of one listening session, resolved once at start."""
+
+    source: str
+    target: str
+    deepgram: str
+    deepl_source: str | None
+    deepl_target: str | None
+
+    @property
+    def translatable(self) -> bool:
+        """Whether finals need a DeepL request at all."""
+        return (
+            self.deepl_source is not None
+            and self.deepl_target is not None
+            and self.deepl_source != _base(self.deepl_target)
+        )
+
+
+class LanguageRegistry:
+    """
+    Language capabilities of Deepgram and DeepL with precomputed lookups.
+
+    Every alias a client may send (any case, with or without a region, or a
+    common non-ISO code) maps to the DeepL code in one dict lookup.
+    """
+
+    def __init__(
+        self,
+        source_languages: Iterable[str] = DEFAULT_SOURCE_LANGUAGES,
+        target_languages: Iterable[str] = DEFAULT_TARGET_LANGUAGES,
+        origin: str = "default",
+    ) -> None:
+        """
+        :param source_languages: DeepL source codes.
+        :param target_languages: DeepL target codes.
+        :param origin: Where the lists came from, for stats.
+        """
+        self.source_languages = frozenset(code.upper() for code in source_languages)
+        self.target_languages = frozenset(code.upper() for code in target_languages)
+        self.origin = origin
+        self._sources = _build_table(sorted(self.source_languages), {})
+        self._targets = _build_table(sorted(self.target_languages), PREFERRED_VARIANTS)
+
+    @staticmethod
+    def _lookup(table: dict[str, str], language: str) -> str | None:
+        code = language.upper().replace("_", "-")
+        found = table.get(code)
+        if found is None:
+            found = table.get(_base(code))
+        return found
+
+    def source(self, language: str) -> str | None:
+        """Return the DeepL source code for a client code, or None if unsupported."""
+        return self._lookup(self._sources, language)
+
+    def target(self, language: str) -> str | None:
+        """Return the DeepL target code for a client code, or None if unsupported."""
+        return self._lookup(self._targets, language)
+
+    @staticmethod
+    def deepgram(language: str) -> str:
+        """Return the Deepgram code for a client code."""
+        return DEEPGRAM_LANGUAGES.get(_base(language).lower(), language)
+
+    def resolve(self, source: str, target: str) -> SessionLanguages:
+        """
+        Resolve a session's client language codes for both services.
+
+        :param source: The spoken language the client selected.
+        :param target: The language the client wants captions in.
+        """
+        return SessionLanguages(
+            source=source,
+            target=target,
+            deepgram=self.deepgram(source),
+            deepl_source=self.source(source),
+            deepl_target=self.target(target),
+        )
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "origin": self.origin,
+            "source_languages": len(self.source_languages),
+            "target_languages": len(self.target_languages),
+        }
+
+
+def _read_copy(path: str) -> tuple[float, list[str], list[str]] | None:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return data["fetched"], data["source"], data["target"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable DeepL language copy {path}: {e}")
+        return None
+
+
+def _write_copy(path: str, source: list[str], target: list[str]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"fetched": time.time(), "source": source, "target": target}, f)
+    os.replace(tmp, path)
+
+
+async def load_language_registry(
+    fetch: FetchLanguages,
+    path: str = DEEPL_LANGUAGES_PATH,
+    ttl: float = DEEPL_LANGUAGES_TTL,
+) -> LanguageRegistry:
+    """
+    Build the registry from DeepL's language lists, fetching them at most once.
+
+    A fresh on-disk copy is used without a request. Otherwise the lists are
+    fetched and saved; if that fails, a stale copy or the built-in lists are
+    used instead.
+
+    :param fetch: Coroutine returning DeepL's "source" or "target" codes.
+    :param path: JSON file holding the last fetched lists, or an empty string.
+    :param ttl: Seconds a saved copy is used before fetching again.
+    """
+    copy = await asyncio.to_thread(_read_copy, path) if path else None
+    if copy is not None and time.time() - copy[0] < ttl:
+        return LanguageRegistry(copy[1], copy[2], origin="disk")
+
+    try:
+        source, target = await asyncio.gather(fetch("source"), fetch("target"))
+        if not source or not target:
+            raise ValueError("empty language list")
+    except Exception as e:
+        if copy is not None:
+            logger.warning(f"Fetching DeepL languages failed ({e!r}); using the saved copy")
+            return LanguageRegistry(copy[1], copy[2], origin="disk")
+        logger.warning(f"Fetching DeepL languages failed ({e!r}); using the built-in list")
+        return LanguageRegistry()
+
+    if path:
+        try:
+            await asyncio.to_thread(_write_copy, path, source, target)
+        except OSError as e:
+            logger.warning(f"Saving DeepL languages to {path} failed: {e}")
+    return LanguageRegistry(source, target, origin="deepl")
+
+
+_registry = LanguageRegistry()
+
+
+def get_language_registry() -> LanguageRegistry:
+    """Return the process-wide registry (the built-in lists until loaded)."""
+    return _registry
+
+
+def set_language_registry(registry: LanguageRegistry) -> None:
+    global _registry
+    _registry = registry
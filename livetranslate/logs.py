@@ -0,0 +1,166 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "%(levelname)s:%(name)s:%(message)s")
+# Records buffered for the writer thread; further records are dropped and counted
+LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Log one in this many hot-path messages per session (1 logs all of them)
+LOG_SAMPLE_EVERY: int = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+
+_listener: QueueListener | None = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks and never raises on a full queue.
+
+    Records are queued unformatted: message interpolation, traceback
+    formatting and I/O happen on the listener thread. The calling thread
+    only pays for building the record, a shallow copy and one ``put_nowait``.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler.prepare formats here; only detach the args container
+        # so the caller reusing it cannot change the logged message
+        record = copy.copy(record)
+        if isinstance(record.args, dict):
+            record.args = dict(record.args)
+        elif record.args:
+            record.args = tuple(record.args)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level: str = LOG_LEVEL) -> DroppingQueueHandler:
+    """
+    Route all records through a bounded queue to a background writer thread.
+
+    Replaces the root logger's handlers, so call it once at startup instead
+    of ``logging.basicConfig``.
+
+    :param level: Root log level name.
+    :return: The queue handler installed on the root logger.
+    """
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    root.handlers = [handler]
+    root.setLevel(level)
+
+    _listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+    return handler
+
+
+@atexit.register
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class SessionLogControl:
+    """
+    Per-session sampling and level overrides for hot-path log messages.
+
+    Hot paths guard their (f-string) messages with :meth:`enabled`, which
+    lets through one in ``sample_every`` messages per session when the
+    logger is enabled for the level. A session with a level override logs
+    every message at or above that level, whatever the module level is,
+    so one session can be traced at DEBUG in production.
+    """
+
+    def __init__(self, sample_every: int = LOG_SAMPLE_EVERY) -> None:
+        """
+        :param sample_every: Keep one in this many messages per session.
+        """
+        self.sample_every = max(1, sample_every)
+        self.levels: dict[str, int] = {}
+        self._counts: dict[str, int] = {}
+
+    def enabled(self, logger: logging.Logger, session: str, level: int) -> bool:
+        """
+        Decide whether a hot-path message for ``session`` should be logged.
+
+        :param logger: The module logger the message would go to.
+        :param session: The session ID.
+        :param level: The message level.
+        :return: True if the caller should build and :meth:`log` the message.
+        """
+        override = self.levels.get(session)
+        if override is not None:
+            return level >= override
+        if not logger.isEnabledFor(level):
+            return False
+        count = self._counts.get(session, 0)
+        self._counts[session] = count + 1
+        return count % self.sample_every == 0
+
+    def log(self, logger: logging.Logger, session: str, level: int, msg: str) -> None:
+        """Log a message that passed :meth:`enabled`, bypassing the logger's level."""
+        record = logger.makeRecord(logger.name, level, "(session)", 0, msg, None, None,
+                                   extra={"session": session})
+        logger.handle(record)
+
+    def set_level(self, session: str, level: int | None) -> None:
+        if level is None:
+            self.levels.pop(session, None)
+        else:
+            self.levels[session] = level
+
+    def forget(self, session: str) -> None:
+        """Drop a finished session's sample counter (overrides are kept)."""
+        self._counts.pop(session, None)
+
+
+session_logs = SessionLogControl()
+
+
+def parse_level(level: str | int | None) -> int | None:
+    """
+    Convert a level name or number to a logging level.
+
+    :raises ValueError: If the name is not a known level.
+    """
+    if level is None or isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level {level!r}")
+    return value
+
+
+def logging_state() -> dict:
+    """Return explicitly set logger levels and session overrides."""
+    loggers = {"root": logging.getLevelName(logging.getLogger().level)}
+    for name, logger in logging.root.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+            loggers[name] = logging.getLevelName(logger.level)
+    handler = next((h for h in logging.getLogger().handlers if isinstance(h, DroppingQueueHandler)), None)
+    return {
+        "loggers": loggers,
+        "sessions": {sid: logging.getLevelName(level) for sid, level in session_logs.levels.items()},
+        "sample_every": session_logs.sample_every,
+        "dropped": handler.dropped if handler is not None else 0,
+    }
@@ -0,0 +1,233 @@
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+# Latency bucket upper bounds in seconds, roughly 1.5x apart from 1 ms to 60 s
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0015, 0.0025, 0.004, 0.006, 0.01, 0.015, 0.025, 0.04, 0.06,
+    0.1, 0.15, 0.25, 0.4, 0.6, 1.0, 1.5, 2.5, 4.0, 6.0, 10.0, 15.0, 25.0, 40.0, 60.0,
+)
+
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+# Per-utterance marks in pipeline order
+FIRST_AUDIO = "first_audio"
+FIRST_SENT = "first_sent"
+FIRST_INTERIM = "first_interim"
+FINAL = "final"
+TRANSLATION_START = "translation_start"
+TRANSLATION_END = "translation_end"
+EMITTED = "emitted"
+
+# Stage name -> (start mark, end mark)
+STAGES: dict[str, tuple[str, str]] = {
+    "ingest": (FIRST_AUDIO, FIRST_SENT),
+    "recognition": (FIRST_SENT, FIRST_INTERIM),
+    "finalization": (FIRST_INTERIM, FINAL),
+    "translation": (TRANSLATION_START, TRANSLATION_END),
+    "emit": (TRANSLATION_END, EMITTED),
+    "caption": (FINAL, EMITTED),
+    "utterance": (FIRST_AUDIO, EMITTED),
+}
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Recording a value is one binary search and an integer increment, so it
+    is cheap enough for every utterance. Quantiles are estimated by linear
+    interpolation inside the bucket that holds them.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS) -> None:
+        """
+        :param bounds: Ascending bucket upper bounds in seconds.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate a quantile from the bucket counts.
+
+        :param q: Quantile between 0 and 1.
+        :return: The estimate in seconds, or None if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if bucket and seen + bucket >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index else 0.0
+                return lower + (self.bounds[index] - lower) * (rank - seen) / bucket
+            seen += bucket
+        return self.bounds[-1]
+
+
+class UtteranceTrace:
+    """Monotonic timestamps of one utterance as it moves through the pipeline."""
+
+    __slots__ = ("marks",)
+
+    def __init__(self, started: float) -> None:
+        self.marks: dict[str, float] = {FIRST_AUDIO: started}
+
+    def mark(self, name: str, now: float | None = None) -> None:
+        """Record ``name`` unless it was already recorded for this utterance."""
+        if name not in self.marks:
+            self.marks[name] = time.monotonic() if now is None else now
+
+    def sentence(self) -> "UtteranceTrace":
+        """
+        Return a trace for one sentence translated from this utterance's final.
+
+        It keeps only the first audio and final marks, so recording it adds
+        the sentence's translation, emit, caption and utterance latencies
+        without repeating the utterance's earlier stages.
+        """
+        trace = UtteranceTrace(self.marks[FIRST_AUDIO])
+        if FINAL in self.marks:
+            trace.marks[FINAL] = self.marks[FINAL]
+        return trace
+
+    def stages(self) -> dict[str, float]:
+        """Return the latency of every stage whose start and end were marked."""
+        marks = self.marks
+        return {
+            stage: marks[end] - marks[start]
+            for stage, (start, end) in STAGES.items()
+            if start in marks and end in marks
+        }
+
+
+class SessionTracer:
+    """
+    Splits one session's stream into utterance traces.
+
+    An utterance starts at the first audio byte received after the previous
+    final transcript and ends with that final, which detaches its trace so
+    translation and emit marks can be added while the next one begins.
+    """
+
+    __slots__ = ("current",)
+
+    def __init__(self) -> None:
+        self.current: UtteranceTrace | None = None
+
+    def audio(self) -> None:
+        if self.current is None:
+            self.current = UtteranceTrace(time.monotonic())
+
+    def mark(self, name: str) -> None:
+        if self.current is not None:
+            self.current.mark(name)
+
+    def final(self) -> UtteranceTrace:
+        """Close the current utterance and return its trace."""
+        trace = self.current or UtteranceTrace(time.monotonic())
+        trace.mark(FINAL)
+        self.current = None
+        return trace
+
+
+def _bucket_labels(histogram: LatencyHistogram) -> list[str]:
+    return [repr(bound) for bound in histogram.bounds] + ["+Inf"]
+
+
+class MetricsRegistry:
+    """
+    Process-wide stage latencies and gauges, rendered in Prometheus text format.
+
+    Gauges are callables sampled at scrape time, so nothing on the hot path
+    pays for them.
+    """
+
+    def __init__(self, prefix: str = "screenwhisper") -> None:
+        """
+        :param prefix: Prefix for every exported metric name.
+        """
+        self.prefix = prefix
+        self.latencies: dict[str, LatencyHistogram] = {}
+        self.gauges: dict[str, tuple[str, Callable[[], float | dict[str, float]]]] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        histogram = self.latencies.get(stage)
+        if histogram is None:
+            histogram = self.latencies[stage] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def record(self, trace: UtteranceTrace) -> dict[str, float]:
+        """Add a finished utterance's stage latencies to the histograms."""
+        stages = trace.stages()
+        for stage, seconds in stages.items():
+            self.observe(stage, seconds)
+        return stages
+
+    def gauge(self, name: str, help_text: str, sample: Callable[[], float | dict[str, float]]) -> None:
+        """
+        Register a gauge sampled on every scrape.
+
+        :param name: Metric name without the prefix.
+        :param help_text: HELP line for the metric.
+        :param sample: Returns a value, or a ``{label: value}`` dict that is
+            exported with a ``kind`` label.
+        """
+        self.gauges[name] = (help_text, sample)
+
+    def summary(self) -> dict[str, dict[str, float | None]]:
+        """Return count and p50/p95/p99 per stage, for logs and debugging."""
+        return {
+            stage: {"count": h.count, **{f"p{int(q * 100)}": h.quantile(q) for q in QUANTILES}}
+            for stage, h in self.latencies.items()
+        }
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        name = f"{self.prefix}_stage_latency_seconds"
+        lines.append(f"# HELP {name} Per-utterance pipeline stage latency.")
+        lines.append(f"# TYPE {name} histogram")
+        for stage, h in sorted(self.latencies.items()):
+            cumulative = 0
+            for bound, bucket in zip(_bucket_labels(h), h.counts):
+                cumulative += bucket
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+
+        quantile_name = f"{self.prefix}_stage_latency_quantile_seconds"
+        lines.append(f"# HELP {quantile_name} Estimated per-stage latency quantiles.")
+        lines.append(f"# TYPE {quantile_name} gauge")
+        for stage, h in sorted(self.latencies.items()):
+            for q in QUANTILES:
+                value = h.quantile(q)
+                if value is not None:
+                    lines.append(f'{quantile_name}{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+
+        for gauge_name, (help_text, sample) in self.gauges.items():
+            full_name = f"{self.prefix}_{gauge_name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} gauge")
+            value = sample()
+            if isinstance(value, dict):
+                for label, item in value.items():
+                    lines.append(f'{full_name}{{kind="{label}"}} {item}')
+            else:
+                lines.append(f"{full_name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
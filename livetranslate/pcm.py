@@ -0,0 +1,156 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from math import gcd
+
+import numpy as np
+
+# Worker threads for PCM conversion; 0 keeps it on the event loop
+PCM_WORKERS: int = int(os.getenv("PCM_WORKERS", "0"))
+
+SAMPLE_FORMATS: dict[str, np.dtype] = {
+    "s16": np.dtype("<i2"),
+    "f32": np.dtype("<f4"),
+}
+
+# Input rates accepted from clients; others would need huge polyphase filters
+SAMPLE_RATES: frozenset[int] = frozenset({8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000})
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_pcm_executor() -> ThreadPoolExecutor | None:
+    """Return the shared PCM worker pool, or None when offloading is off."""
+    global _executor
+    if PCM_WORKERS <= 0:
+        return None
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PCM_WORKERS, thread_name_prefix="pcm")
+    return _executor
+
+
+def lowpass_filter(up: int, down: int, taps_per_phase: int = 24, beta: float = 8.0) -> np.ndarray:
+    """
+    Design the Kaiser-windowed sinc anti-aliasing filter for ``up/down`` resampling.
+
+    :param up: Interpolation factor.
+    :param down: Decimation factor.
+    :param taps_per_phase: Filter taps per polyphase branch.
+    :param beta: Kaiser window shape parameter.
+    :return: Filter taps at the upsampled rate, scaled by ``up`` for unity gain.
+    """
+    length = taps_per_phase * up
+    cutoff = 0.45 / max(up, down)
+    n = np.arange(length) - (length - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta)
+    return (taps * up / taps.sum()).astype(np.float32)
+
+
+class PcmNormalizer:
+    """
+    Streaming converter from raw PCM to 16 kHz mono int16 (linear16).
+
+    Accepts interleaved float32 or int16 input with one or two channels.
+    Channels are averaged, then the signal is resampled with a polyphase
+    FIR filter evaluated for the whole chunk at once. Filter history, the
+    output phase and any partial input frame carry over between chunks, so
+    chunk boundaries leave no clicks or drift.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 1,
+        sample_format: str = "s16",
+        out_rate: int = 16000,
+    ) -> None:
+        """
+        :param sample_rate: Input sample rate in Hz, one of ``SAMPLE_RATES``.
+        :param channels: Number of interleaved input channels (1 or 2).
+        :param sample_format: ``s16`` for int16 or ``f32`` for float32 samples.
+        :param out_rate: Output sample rate in Hz.
+        """
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format {sample_format!r}, expected one of {list(SAMPLE_FORMATS)}")
+        if channels not in (1, 2):
+            raise ValueError(f"Unsupported channel count {channels}, expected 1 or 2")
+        if sample_rate not in SAMPLE_RATES:
+            raise ValueError(f"Unsupported sample rate {sample_rate}, expected one of {sorted(SAMPLE_RATES)}")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.dtype = SAMPLE_FORMATS[sample_format]
+        self.frame_bytes = self.dtype.itemsize * channels
+        self.out_rate = out_rate
+
+        factor = gcd(sample_rate, out_rate)
+        self.up = out_rate // factor
+        self.down = sample_rate // factor
+        self.passthrough = self.up == self.down
+
+        taps = lowpass_filter(self.up, self.down)
+        self.taps_per_phase = len(taps) // self.up
+        # phases[p, j] = taps[p + j * up], reversed so windows read oldest-first
+        self._phases = taps.reshape(self.taps_per_phase, self.up).T[:, ::-1].copy()
+        self._window = np.arange(self.taps_per_phase - 1, -1, -1)
+
+        self._partial = b""
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._consumed = 0  # input samples seen before the current history
+        self._next_out = 0  # global index of the next output sample
+
+    @property
+    def identity(self) -> bool:
+        """True when the input already is 16 kHz mono int16."""
+        return self.passthrough and self.channels == 1 and self.dtype == SAMPLE_FORMATS["s16"]
+
+    def _decode(self, chunk: bytes) -> np.ndarray:
+        data = b"".join((self._partial, chunk)) if self._partial else chunk
+        usable = len(data) // self.frame_bytes * self.frame_bytes
+        self._partial = bytes(data[usable:])
+        samples = np.frombuffer(data, dtype=self.dtype, count=usable // self.dtype.itemsize)
+        if self.dtype == SAMPLE_FORMATS["s16"]:
+            samples = samples.astype(np.float32) / 32768.0
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1, dtype=np.float32)
+        return samples
+
+    def _resample(self, samples: np.ndarray) -> np.ndarray:
+        buffer = np.concatenate((self._history, samples))
+        offset = self._consumed - len(self._history)  # global index of buffer[0]
+        total = self._consumed + len(samples)
+
+        last_out = (total * self.up - 1) // self.down + 1 if total else 0
+        outputs = np.arange(self._next_out, last_out)
+        positions = outputs * self.down
+        phase = positions % self.up
+        newest = positions // self.up - offset
+        windows = buffer[newest[:, None] - self._window[None, :]]
+        resampled = np.einsum("ij,ij->i", windows, self._phases[phase])
+
+        self._next_out = last_out
+        keep = len(self._history)
+        self._history = buffer[len(buffer) - keep:] if keep else buffer[:0]
+        self._consumed = total
+        return resampled
+
+    def process(self, chunk: bytes) -> bytes:
+        """
+        Convert one chunk of raw PCM.
+
+        :param chunk: Interleaved input samples; partial frames are carried over.
+        :return: linear16 mono PCM at ``out_rate``.
+        """
+        if self.identity:
+            return chunk
+        samples = self._decode(chunk)
+        if not self.passthrough:
+            samples = self._resample(samples)
+        return (np.clip(samples, -1.0, 1.0) * 32767.0).round().astype("<i2").tobytes()
+
+    async def process_async(self, chunk: bytes) -> bytes:
+        """Convert a chunk, on the shared PCM worker pool when one is configured."""
+        executor = get_pcm_executor()
+        if executor is None:
+            return self.process(chunk)
+        return await asyncio.get_running_loop().run_in_executor(executor, self.process, chunk)
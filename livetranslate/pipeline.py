@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Translations of one session's finals allowed in flight at once
+TRANSLATION_CONCURRENCY: int = int(os.getenv("TRANSLATION_CONCURRENCY", "4"))
+
+Translate = Callable[[], Awaitable[Any]]
+Emit = Callable[[Any], Awaitable[None]]
+
+
+class TranslationPipeline:
+    """
+    Per-session translation of finals: concurrent, but emitted in order.
+
+    Each submitted final gets a sequence number and its translation starts
+    right away, up to ``max_concurrency`` at a time. Results are emitted in
+    sequence order, so a slow translation holds back only the translations
+    after it, never the caller.
+    """
+
+    def __init__(self, max_concurrency: int = TRANSLATION_CONCURRENCY) -> None:
+        """
+        :param max_concurrency: Translations allowed in flight at once.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._emit_lock = asyncio.Lock()
+        self._done: dict[int, tuple[Any, Emit]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._next_seq = 0
+        self._next_emit = 0
+        self._closing = False
+        self.submitted = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.held_back = 0
+
+    def in_flight(self) -> int:
+        """Return the number of finals submitted but not yet emitted."""
+        return self._next_seq - self._next_emit
+
+    def submit(self, translate: Translate, emit: Emit) -> int:
+        """
+        Start translating a final without waiting for it.
+
+        :param translate: Coroutine function returning the translation.
+        :param emit: Coroutine function called in sequence order with the
+            translation, or None if ``translate`` raised or was cancelled.
+        :return: The final's sequence number.
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        self.submitted += 1
+        task = asyncio.create_task(self._run(seq, translate, emit))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return seq
+
+    async def _run(self, seq: int, translate: Translate, emit: Emit) -> None:
+        try:
+            async with self._slots:
+                result = await translate()
+        except asyncio.CancelledError:
+            if self._closing:
+                raise
+            # A cancelled translation must not hold back the ones after it
+            task = asyncio.current_task()
+            if task.cancelling():
+                task.uncancel()
+            self.cancelled += 1
+            logger.warning(f"Translation #{seq} was cancelled")
+            result = None
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Translation #{seq} failed: {e}")
+            result = None
+
+        self._done[seq] = (result, emit)
+        if seq != self._next_emit:
+            self.held_back += 1
+        async with self._emit_lock:
+            while self._next_emit in self._done:
+                result, emit = self._done.pop(self._next_emit)
+                self._next_emit += 1
+                try:
+                    await emit(result)
+                except Exception as e:
+                    logger.error(f"Emitting translation failed: {e}")
+
+    async def close(self) -> None:
+        """Cancel translations still in flight."""
+        self._closing = True
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._done.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "submitted": self.submitted,
+            "in_flight": self.in_flight(),
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "held_back": self.held_back,
+        }
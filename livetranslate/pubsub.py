@@ -0,0 +1,243 @@
+"""
+Message-queue backends that let several server processes share Socket.IO emits.
+
+``create_client_manager`` turns a URL into a python-socketio client manager:
+
+* ``redis://...`` / ``amqp://...``: the stock python-socketio managers.
+* ``unix:///path/to/broker.sock``: a dependency-free local broker reached
+  over a Unix socket; run it with ``python -m livetranslate.pubsub PATH``.
+* ``local://name``: an in-process channel for tests and single-process runs.
+
+The local backends carry messages as JSON and hand python-socketio decoded
+dicts, so a frame from the socket is never unpickled.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+from collections import defaultdict
+
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct("!I")
+_SUBSCRIBE = b"S"
+_PUBLISH = b"P"
+
+# Largest frame accepted from a publisher
+_MAX_FRAME = 16 * 1024 * 1024
+
+# Bytes a subscriber may have unsent before the broker drops its frames
+BROKER_MAX_BUFFER: int = int(os.getenv("SOCKETIO_BROKER_MAX_BUFFER", str(4 * 1024 * 1024)))
+
+
+def _encode(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _decode(payload: bytes) -> dict | None:
+    """Decode a message frame, or return None for one that is not a JSON object."""
+    try:
+        data = json.loads(payload)
+    except ValueError as e:
+        logger.warning(f"Dropping undecodable message queue frame: {e}")
+        return None
+    if not isinstance(data, dict):
+        logger.warning("Dropping message queue frame that is not a JSON object")
+        return None
+    return data
+
+
+class LocalFirstMixin:
+    """
+    Deliver emits addressed to a client on this process without the queue.
+
+    Almost every emit in this app targets a single session's room, and that
+    session lives on the worker that handles its connection. Only emits for
+    rooms that are not local go through the message queue, so the queue
+    carries cross-worker traffic only.
+    """
+
+    async def emit(self, event, data, namespace=None, room=None, skip_sid=None,
+                   callback=None, **kwargs):
+        if room is not None and callback is None and self.is_connected(room, namespace or "/"):
+            kwargs["ignore_queue"] = True
+        return await super().emit(event, data, namespace=namespace, room=room,
+                                  skip_sid=skip_sid, callback=callback, **kwargs)
+
+
+class LocalPubSubManager(LocalFirstMixin, AsyncPubSubManager):
+    """In-process stand-in for a message queue, shared by managers on one loop."""
+
+    name = "localpubsub"
+    _channels: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def __init__(self, url="local://socketio", channel="socketio", write_only=False, logger=None):
+        super().__init__(channel=url.split("://", 1)[-1] or channel, write_only=write_only, logger=logger)
+
+    async def _publish(self, data):
+        for queue in list(self._channels[self.channel]):
+            queue.put_nowait(_encode(data))
+
+    async def _listen(self):
+        queue: asyncio.Queue = asyncio.Queue()
+        self._channels[self.channel].add(queue)
+        try:
+            while True:
+                data = _decode(await queue.get())
+                if data is not None:
+                    yield data
+        finally:
+            self._channels[self.channel].discard(queue)
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if length > _MAX_FRAME:
+        raise ConnectionError(f"Message queue frame of {length} bytes exceeds {_MAX_FRAME}")
+    return await reader.readexactly(length)
+
+
+def _frame(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+class UnixSocketBroker:
+    """
+    Fans every published frame out to all subscribers on a Unix socket.
+
+    Frames are forwarded without being decoded. A subscriber that stops
+    reading does not hold up publishers or grow the broker's memory: once
+    ``max_buffer`` bytes are waiting for it, its frames are dropped and
+    counted until it catches up.
+    """
+
+    def __init__(self, path: str, max_buffer: int = BROKER_MAX_BUFFER) -> None:
+        """
+        :param path: Unix socket path to listen on.
+        :param max_buffer: Unsent bytes allowed per subscriber.
+        """
+        self.path = path
+        self.max_buffer = max_buffer
+        self.subscribers: set[asyncio.StreamWriter] = set()
+        self.dropped = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    def _fan_out(self, frame: bytes) -> None:
+        for subscriber in list(self.subscribers):
+            if subscriber.transport.get_write_buffer_size() > self.max_buffer:
+                if self.dropped % 1000 == 0:
+                    logger.warning(f"Dropping frames for a lagging subscriber ({self.dropped} dropped so far)")
+                self.dropped += 1
+                continue
+            subscriber.write(frame)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            role = await reader.readexactly(1)
+            if role == _SUBSCRIBE:
+                self.subscribers.add(writer)
+                await reader.read()  # held open until the subscriber leaves
+                return
+            while True:
+                self._fan_out(_frame(await _read_frame(reader)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        logger.info(f"Socket.IO message broker listening on {self.path}")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self.subscribers):
+            writer.close()
+
+
+class AsyncUnixSocketManager(LocalFirstMixin, AsyncPubSubManager):
+    """Socket.IO client manager backed by a :class:`UnixSocketBroker`."""
+
+    name = "asyncunixsocket"
+
+    def __init__(self, url, channel="socketio", write_only=False, logger=None):
+        self.path = url.split("://", 1)[1]
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    async def _publish(self, data):
+        async with self._lock:
+            if self._writer is None or self._writer.is_closing():
+                _, self._writer = await asyncio.open_unix_connection(self.path)
+                self._writer.write(_PUBLISH)
+            self._writer.write(_frame(_encode(data)))
+            await self._writer.drain()
+
+    async def _listen(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError as e:
+                logger.warning(f"Cannot reach message broker at {self.path}: {e}")
+                await asyncio.sleep(1)
+                continue
+            writer.write(_SUBSCRIBE)
+            await writer.drain()
+            try:
+                while True:
+                    data = _decode(await _read_frame(reader))
+                    if data is not None:
+                        yield data
+            except (asyncio.IncompleteReadError, ConnectionError):
+                logger.warning("Lost connection to message broker, reconnecting")
+            finally:
+                writer.close()
+
+
+def create_client_manager(url: str | None):
+    """
+    Build the Socket.IO client manager for a message-queue URL.
+
+    :param url: Queue URL, or empty/None for the default single-process manager.
+    :return: A client manager instance, or None to use python-socketio's default.
+    """
+    if not url:
+        return None
+    scheme = url.split("://", 1)[0]
+    if scheme in ("redis", "rediss"):
+        return socketio.AsyncRedisManager(url)
+    if scheme in ("amqp", "amqps"):
+        return socketio.AsyncAioPikaManager(url)
+    if scheme == "unix":
+        return AsyncUnixSocketManager(url)
+    if scheme == "local":
+        return LocalPubSubManager(url)
+    raise ValueError(f"Unsupported Socket.IO message queue URL: {url}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) != 2:
+        print("Usage: python -m livetranslate.pubsub SOCKET_PATH")
+        sys.exit(1)
+    try:
+        asyncio.run(UnixSocketBroker(sys.argv[1]).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,162 @@
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    A zero rate means unlimited.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Return seconds until ``amount`` tokens are available (capped at capacity)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float) -> None:
+        if self.rate > 0:
+            self.tokens -= min(amount, self.capacity)
+
+
+@dataclass
+class SessionShare:
+    """Fair-queuing state and wait statistics of one session."""
+
+    weight: float = 1.0
+    last_finish: float = 0.0
+    waits: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "waits": self.waits,
+            "mean_wait": self.total_wait / self.waits if self.waits else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class FairScheduler:
+    """
+    Process-wide DeepL rate limiter with weighted fair queuing across sessions.
+
+    Requests wait for both a request token and one token per character.
+    While they wait, they are released in order of their virtual finish time
+    (start-time fair queuing). Each active session therefore gets a share of
+    the throughput in proportion to its weight, however much one speaker
+    talks.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        characters_per_second: float,
+        burst_seconds: float = 1.0,
+    ) -> None:
+        """
+        :param requests_per_second: Request budget; zero means unlimited.
+        :param characters_per_second: Character budget; zero means unlimited.
+        :param burst_seconds: Budget that may be spent at once after idling.
+        """
+        self.requests = TokenBucket(requests_per_second, requests_per_second * burst_seconds)
+        self.characters = TokenBucket(characters_per_second, characters_per_second * burst_seconds)
+        self.sessions: dict[str, SessionShare] = {}
+        self._queue: list[tuple[float, int, float, int, asyncio.Future]] = []
+        self._virtual = 0.0
+        self._seq = 0
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def set_weight(self, session: str, weight: float) -> None:
+        self.sessions.setdefault(session, SessionShare()).weight = max(0.01, weight)
+
+    def forget(self, session: str) -> SessionShare | None:
+        """Drop a finished session's state and return it."""
+        return self.sessions.pop(session, None)
+
+    def queued(self) -> int:
+        return len(self._queue)
+
+    async def acquire(self, session: str, characters: int) -> None:
+        """
+        Wait until a request of ``characters`` characters may be sent.
+
+        :param session: The session the request is for.
+        :param characters: Characters the request will translate.
+        """
+        share = self.sessions.setdefault(session, SessionShare())
+        cost = max(1, characters)
+        start = max(self._virtual, share.last_finish)
+        share.last_finish = start + cost / share.weight
+
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._queue, (share.last_finish, self._seq, start, cost, future))
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._dispatch())
+        else:
+            self._wakeup.set()
+
+        enqueued = time.monotonic()
+        try:
+            await future
+        finally:
+            waited = time.monotonic() - enqueued
+            share.waits += 1
+            share.total_wait += waited
+            share.max_wait = max(share.max_wait, waited)
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            _, _, start, cost, future = self._queue[0]
+            if future.done():
+                # Given up while queued, e.g. past its deadline
+                heapq.heappop(self._queue)
+                continue
+            now = time.monotonic()
+            wait = max(self.requests.wait_time(1, now), self.characters.wait_time(cost, now))
+            if wait > 0:
+                # A newly queued request may overtake the current head
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._queue)
+            self.requests.consume(1)
+            self.characters.consume(cost)
+            self._virtual = start
+            future.set_result(None)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for *_, future in self._queue:
+            future.cancel()
+        self._queue.clear()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {session: share.stats() for session, share in self.sessions.items()}
@@ -0,0 +1,188 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+
+# Directory for per-session Deepgram traces; empty disables recording
+DEEPGRAM_RECORD_DIR: str = os.getenv("DEEPGRAM_RECORD_DIR", "")
+
+# Messages buffered for the trace writer thread; further messages are dropped and counted
+DEEPGRAM_RECORD_QUEUE_SIZE: int = int(os.getenv("DEEPGRAM_RECORD_QUEUE_SIZE", "10000"))
+
+# Queued after a recorder's last message to close its file
+_CLOSE = object()
+
+
+class _TraceWriter:
+    """
+    Background thread doing all trace encoding and file I/O.
+
+    Messages are queued with their arrival offset and written in order, so
+    recording costs the event loop one ``put_nowait`` per message.
+    """
+
+    def __init__(self, max_queued: int) -> None:
+        self.max_queued = max(1, max_queued)
+        # Unbounded so a close is never refused; messages are bounded in put()
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def put(self, recorder: "TraceRecorder", item) -> bool:
+        if item is not _CLOSE and self.queue.qsize() >= self.max_queued:
+            return False
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+                self._thread.start()
+        self.queue.put((recorder, item))
+        return True
+
+    def _run(self) -> None:
+        while True:
+            recorder, item = self.queue.get()
+            if recorder is None:
+                return
+            try:
+                recorder._write(item)
+            except Exception as e:
+                logger.error(f"Writing Deepgram trace {recorder.path} failed: {e}")
+
+    def stop(self) -> None:
+        """Write everything queued so far and stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self.queue.put((None, None))
+            thread.join()
+
+
+_writer = _TraceWriter(DEEPGRAM_RECORD_QUEUE_SIZE)
+
+
+class TraceRecorder:
+    """
+    Writes the raw Deepgram messages of one session to a trace file.
+
+    A trace is gzip-compressed JSON lines: a header object with the session
+    metadata, then one ``[offset_ms, message]`` array per message, where
+    ``offset_ms`` is the arrival time since the recording started and
+    ``message`` is the message text exactly as received. Repetitive result
+    JSON compresses roughly tenfold.
+
+    Encoding and writing happen on a shared writer thread; when it falls
+    behind, messages are dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, path: str, **meta) -> None:
+        """
+        :param path: Trace file to create.
+        :param meta: Header fields, e.g. language and model.
+        """
+        self.path = path
+        self._file = None
+        self._header = {"version": TRACE_VERSION, "started_at": time.time(), **meta}
+        self._started = time.monotonic()
+        self._closed = False
+        self.messages = 0
+        self.dropped = 0
+
+    def record(self, message: str | bytes | dict) -> None:
+        """
+        Queue one message for writing.
+
+        :param message: The raw message, or a decoded result dict that the
+            writer thread serializes; the dict must not change afterwards.
+        """
+        if self._closed:
+            return
+        offset = round((time.monotonic() - self._started) * 1000, 1)
+        if _writer.put(self, (offset, message)):
+            self.messages += 1
+        else:
+            self.dropped += 1
+
+    def _write(self, item) -> None:
+        # Runs on the writer thread only
+        if self._file is None:
+            self._file = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=6)
+            self._file.write(json.dumps(self._header) + "\n")
+        if item is _CLOSE:
+            self._file.close()
+            return
+        offset, message = item
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
+        elif isinstance(message, dict):
+            message = json.dumps(message)
+        self._file.write(json.dumps([offset, message], ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        """Close the file once the messages recorded so far are written."""
+        if not self._closed:
+            self._closed = True
+            _writer.put(self, _CLOSE)
+
+
+def create_recorder(session_id: str, **meta) -> TraceRecorder | None:
+    """Return a recorder for a session when DEEPGRAM_RECORD_DIR is set."""
+    if not DEEPGRAM_RECORD_DIR:
+        return None
+    os.makedirs(DEEPGRAM_RECORD_DIR, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{session_id}.jsonl.gz"
+    return TraceRecorder(os.path.join(DEEPGRAM_RECORD_DIR, name), session=session_id, **meta)
+
+
+@atexit.register
+def stop_recording() -> None:
+    """Write queued trace messages, close finished traces and stop the writer thread."""
+    _writer.stop()
+
+
+def read_trace(path: str) -> tuple[dict, list[tuple[float, str]]]:
+    """
+    Load a trace file.
+
+    :param path: A file written by :class:`TraceRecorder`.
+    :return: The header and the ``(offset_seconds, message)`` pairs in order.
+    :raises ValueError: If the file is not a trace of a supported version.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} Deepgram trace")
+        messages = [(offset / 1000, message) for offset, message in map(json.loads, f)]
+    return header, messages
+
+
+def trace_paths(location: str) -> list[str]:
+    """Return the trace files at ``location``, a file or a directory of traces."""
+    if os.path.isdir(location):
+        return sorted(
+            os.path.join(location, name)
+            for name in os.listdir(location)
+            if name.endswith(".jsonl.gz")
+        )
+    return [location]
+
+
+def iter_messages(messages: list[tuple[float, str]], speed: float) -> Iterator[tuple[float, str]]:
+    """
+    Yield ``(delay, message)`` pairs for replaying at ``speed`` times real time.
+
+    :param speed: 1.0 replays with the recorded timing; 0 replays as fast as possible.
+    """
+    previous = 0.0
+    for offset, message in messages:
+        delay = (offset - previous) / speed if speed > 0 else 0.0
+        previous = offset
+        yield delay, message
@@ -0,0 +1,89 @@
+class AudioRingBuffer:
+    """
+    Preallocated per-session byte ring for audio.
+
+    Chunks are written into a single ``bytearray`` and read back as
+    ``memoryview`` slices of it without intermediate buffers. The most recent
+    ``capacity`` bytes stay readable through :meth:`tail`, which the
+    websocket transport uses to replay audio after a reconnect.
+
+    A frame returned by :meth:`read` aliases the buffer and is overwritten
+    once another ``capacity`` bytes have been written. Copy it before handing
+    it to anything that may hold on to it, such as a send queue.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        :param capacity: Ring size in bytes; also the length of kept history.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        # Absolute byte offsets since the session started
+        self.written = 0
+        self.read_pos = 0
+        self.overrun = 0
+
+    def pending(self) -> int:
+        """Return the number of written bytes not yet read."""
+        return self.written - self.read_pos
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Append data, overwriting the oldest bytes once the ring is full.
+
+        Unread bytes that get overwritten are skipped and counted in
+        ``overrun``.
+        """
+        data = memoryview(data)
+        size = len(data)
+        if size >= self.capacity:
+            # Only the newest capacity bytes can survive
+            data = data[size - self.capacity:]
+            self.written += size - self.capacity
+            size = self.capacity
+
+        start = self.written % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = data[:first]
+        if first < size:
+            self._view[:size - first] = data[first:]
+        self.written += size
+
+        lost = self.written - self.capacity - self.read_pos
+        if lost > 0:
+            self.overrun += lost
+            self.read_pos += lost
+
+    def read(self, max_bytes: int | None = None) -> memoryview | None:
+        """
+        Return the next unread contiguous region without copying.
+
+        A region never crosses the end of the ring, so a pending span that
+        wraps is returned by two consecutive calls.
+
+        :param max_bytes: Upper bound on the returned size.
+        :return: A view of up to ``max_bytes`` bytes, or None if nothing is pending.
+        """
+        available = self.pending()
+        if available <= 0:
+            return None
+        start = self.read_pos % self.capacity
+        size = min(available, self.capacity - start)
+        if max_bytes is not None:
+            size = min(size, max_bytes)
+        self.read_pos += size
+        return self._view[start:start + size]
+
+    def tail(self, size: int) -> bytes:
+        """Return a copy of the last ``size`` bytes written (at most ``capacity``)."""
+        size = min(size, self.capacity, self.written)
+        if size <= 0:
+            return b""
+        end = self.written % self.capacity
+        start = (self.written - size) % self.capacity
+        if start < end:
+            return bytes(self._view[start:end])
+        return bytes(self._view[start:]) + bytes(self._view[:end])
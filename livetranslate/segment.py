@@ -0,0 +1,142 @@
+import asyncio
+import os
+import re
+from collections.abc import Callable
+from typing import Any
+
+# Split finals into sentences before translation; "false" translates each final as is
+TRANSLATION_SEGMENTATION: bool = os.getenv("TRANSLATION_SEGMENTATION", "true").lower() == "true"
+
+# Seconds an unfinished sentence is held for its end before it is translated anyway
+SEGMENT_MAX_HOLD: float = float(os.getenv("SEGMENT_MAX_HOLD", "2"))
+
+# Held text longer than this is translated without waiting for the sentence end
+SEGMENT_MAX_CHARS: int = int(os.getenv("SEGMENT_MAX_CHARS", "400"))
+
+# Sentence-final punctuation, with any closing quotes or brackets, before a space or the end
+_TERMINATOR = re.compile(r"[.!?…]+[\"'”’)\]]*(?=\s|$)|[。！？]+[」』）]*")
+
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS: frozenset[str] = frozenset({
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "sr.", "jr.", "vs.", "etc.",
+    "e.g.", "i.e.", "approx.", "no.", "inc.", "ltd.", "co.",
+})
+_INITIALS = re.compile(r"(?:\w\.){2,}")
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    word = text[:end].rsplit(None, 1)[-1].lower()
+    return word in ABBREVIATIONS or _INITIALS.fullmatch(word) is not None
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Split text after sentence-final punctuation.
+
+    The last item is an unfinished sentence when the text does not end with
+    punctuation. Abbreviations and initials do not end a sentence.
+    """
+    sentences = []
+    start = 0
+    for match in _TERMINATOR.finditer(text):
+        if match.group()[0] == "." and _is_abbreviation(text, match.start() + 1):
+            continue
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    rest = text[start:].strip()
+    if rest:
+        sentences.append(rest)
+    return sentences
+
+
+def ends_sentence(text: str) -> bool:
+    """Return whether text ends with sentence-final punctuation."""
+    match = None
+    for match in _TERMINATOR.finditer(text):
+        pass
+    return (
+        match is not None
+        and match.end() == len(text.rstrip())
+        and not (match.group()[0] == "." and _is_abbreviation(text, match.start() + 1))
+    )
+
+
+class SentenceSegmenter:
+    """
+    Turn a session's finals into whole sentences.
+
+    Fragments are held and merged until a sentence ends, either with
+    punctuation or with Deepgram's ``speech_final`` endpoint. A final holding
+    several sentences is split. Text held for ``max_hold`` seconds is passed
+    to ``on_expire`` so a missing sentence end never stalls a caption.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[str, Any], None],
+        max_hold: float = SEGMENT_MAX_HOLD,
+        max_chars: int = SEGMENT_MAX_CHARS,
+    ) -> None:
+        """
+        :param on_expire: Called with the held text and the tag of its last
+            fragment once it has been held for ``max_hold`` seconds.
+        :param max_hold: Seconds to hold an unfinished sentence.
+        :param max_chars: Held text longer than this is released at once.
+        """
+        self.on_expire = on_expire
+        self.max_hold = max_hold
+        self.max_chars = max_chars
+        self._pending = ""
+        self._tag: Any = None
+        self._timer: asyncio.TimerHandle | None = None
+        self.finals = 0
+        self.sentences = 0
+        self.expired = 0
+
+    @property
+    def pending(self) -> str:
+        return self._pending
+
+    def add(self, text: str, end_of_speech: bool = False, tag: Any = None) -> list[str]:
+        """
+        Add a final transcript and return the sentences it completes.
+
+        :param text: The final transcript.
+        :param end_of_speech: Whether the speaker paused (``speech_final``).
+        :param tag: Kept with held text and passed to ``on_expire``.
+        """
+        self.finals += 1
+        self._cancel_timer()
+        sentences = split_sentences(f"{self._pending} {text}" if self._pending else text)
+        self._pending = ""
+        if sentences and not end_of_speech and not ends_sentence(sentences[-1]):
+            if len(sentences[-1]) <= self.max_chars:
+                self._pending = sentences.pop()
+                self._tag = tag
+                self._timer = asyncio.get_running_loop().call_later(self.max_hold, self._expire)
+        self.sentences += len(sentences)
+        return sentences
+
+    def _expire(self) -> None:
+        self._timer = None
+        text, tag = self._pending, self._tag
+        self._pending, self._tag = "", None
+        if text:
+            self.expired += 1
+            self.sentences += 1
+            self.on_expire(text, tag)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def close(self) -> None:
+        """Drop held text without releasing it."""
+        self._cancel_timer()
+        self._pending, self._tag = "", None
+
+    def stats(self) -> dict[str, int]:
+        return {"finals": self.finals, "sentences": self.sentences, "expired": self.expired}
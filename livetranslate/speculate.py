@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from livetranslate.cache import normalize_text
+from livetranslate.metrics import registry
+from livetranslate.segment import ends_sentence, split_sentences
+
+logger = logging.getLogger(__name__)
+
+# Translate stable interim text before the final arrives; costs extra DeepL requests
+TRANSLATION_SPECULATION: bool = os.getenv("TRANSLATION_SPECULATION", "false").lower() == "true"
+
+# Consecutive interims a prefix must survive unchanged to be translated
+SPECULATION_STABLE_INTERIMS: int = int(os.getenv("SPECULATION_STABLE_INTERIMS", "2"))
+
+# Speculative translations allowed per session at once
+SPECULATION_MAX_IN_FLIGHT: int = int(os.getenv("SPECULATION_MAX_IN_FLIGHT", "2"))
+
+# Process-wide counters, exported on /metrics
+totals: dict[str, int] = {
+    "started": 0, "reused": 0, "cancelled": 0, "wasted": 0, "extra_characters": 0,
+}
+
+
+def _common_prefix(histories: list[list[str]]) -> list[str]:
+    prefix = histories[0]
+    for words in histories[1:]:
+        length = 0
+        for a, b in zip(prefix, words):
+            if a != b:
+                break
+            length += 1
+        prefix = prefix[:length]
+    return prefix
+
+
+class Speculation:
+    """One speculative translation of a stable text."""
+
+    __slots__ = ("text", "task", "started", "finished")
+
+    def __init__(self, text: str, task: asyncio.Task) -> None:
+        self.text = text
+        self.task = task
+        self.started = time.monotonic()
+        self.finished: float | None = None
+
+
+class SpeculativeTranslator:
+    """
+    Translate the stable part of a session's interim results ahead of the final.
+
+    The word prefix shared by the last few interims has stopped changing.
+    Whole sentences in it, or the whole interim once it stops changing, are
+    translated right away. A speculation whose text drops out of the stable
+    prefix is cancelled. When a final (or a sentence of one) matches a
+    speculation, its translation is reused instead of requesting a new one.
+    """
+
+    def __init__(
+        self,
+        translate: Callable[[str], Awaitable[str]],
+        sentences: bool = True,
+        stable_interims: int = SPECULATION_STABLE_INTERIMS,
+        max_in_flight: int = SPECULATION_MAX_IN_FLIGHT,
+    ) -> None:
+        """
+        :param translate: Coroutine function translating one text.
+        :param sentences: Speculate per sentence, matching finals segmented
+            into sentences; otherwise only on whole interims.
+        :param stable_interims: Interims a prefix must appear in unchanged.
+        :param max_in_flight: Speculative translations allowed at once.
+        """
+        self.translate = translate
+        self.sentences = sentences
+        self.max_in_flight = max(1, max_in_flight)
+        self._history: deque[list[str]] = deque(maxlen=max(2, stable_interims))
+        self._speculations: dict[str, Speculation] = {}
+        self.started = 0
+        self.reused = 0
+        self.cancelled = 0
+        self.wasted = 0
+        self.extra_characters = 0
+        self.saved = 0.0
+
+    def observe(self, text: str) -> None:
+        """Track an interim result and speculate on what has become stable."""
+        words = text.split()
+        self._history.append(words)
+        if len(self._history) < self._history.maxlen:
+            return
+        stable = _common_prefix(list(self._history))
+        if not stable:
+            self._drop_stale(())
+            return
+
+        stable_text = " ".join(stable)
+        unchanged = len(stable) == len(words)
+        if self.sentences:
+            candidates = split_sentences(stable_text)
+            if candidates and not unchanged and not ends_sentence(candidates[-1]):
+                candidates.pop()
+        else:
+            candidates = [stable_text] if unchanged else []
+
+        keys = [normalize_text(candidate) for candidate in candidates]
+        self._drop_stale(keys)
+        for key in keys:
+            if key not in self._speculations and self._in_flight() < self.max_in_flight:
+                self._start(key)
+
+    def _in_flight(self) -> int:
+        return sum(not s.task.done() for s in self._speculations.values())
+
+    def _start(self, key: str) -> None:
+        task = asyncio.create_task(self.translate(key))
+        speculation = Speculation(key, task)
+        task.add_done_callback(lambda t: self._finished(speculation, t))
+        self._speculations[key] = speculation
+        self.started += 1
+        self.extra_characters += len(key)
+        totals["started"] += 1
+        totals["extra_characters"] += len(key)
+
+    @staticmethod
+    def _finished(speculation: Speculation, task: asyncio.Task) -> None:
+        speculation.finished = time.monotonic()
+        # Retrieve failures of speculations nobody awaits
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Speculative translation failed: {task.exception()}")
+
+    def _drop_stale(self, keys) -> None:
+        for key in [k for k, s in self._speculations.items() if k not in keys and not s.task.done()]:
+            self._drop(self._speculations.pop(key))
+
+    def _drop(self, speculation: Speculation) -> None:
+        if speculation.task.done():
+            self.wasted += 1
+            totals["wasted"] += 1
+        else:
+            speculation.task.cancel()
+            self.cancelled += 1
+            totals["cancelled"] += 1
+
+    def take(self, text: str) -> asyncio.Task | None:
+        """
+        Return the speculative translation of a final's text, if there is one.
+
+        :param text: A final transcript, or one sentence of it.
+        :return: A task resolving to the translation, done or in flight.
+        """
+        speculation = self._speculations.pop(normalize_text(text), None)
+        if speculation is None:
+            return None
+        now = time.monotonic()
+        saved = (speculation.finished or now) - speculation.started
+        self.reused += 1
+        self.saved += saved
+        self.extra_characters -= len(speculation.text)
+        totals["reused"] += 1
+        totals["extra_characters"] -= len(speculation.text)
+        registry.observe("speculation_saved", saved)
+        return speculation.task
+
+    def reset(self) -> None:
+        """Drop speculations a final did not use and start over."""
+        for speculation in self._speculations.values():
+            self._drop(speculation)
+        self._speculations.clear()
+        self._history.clear()
+
+    def close(self) -> None:
+        self.reset()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "started": self.started,
+            "reused": self.reused,
+            "cancelled": self.cancelled,
+            "wasted": self.wasted,
+            "extra_characters": self.extra_characters,
+            "saved_seconds": round(self.saved, 3),
+        }
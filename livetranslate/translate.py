@@ -1,118 +1,493 @@
+import asyncio
+import functools
+import logging
 import os
+import random
+import time
 
 import aiohttp
 
+from livetranslate.batching import BatchingTranslator
+from livetranslate.breaker import CircuitBreaker
+from livetranslate.cache import TranslationCache
+from livetranslate.languages import get_language_registry, load_language_registry, set_language_registry
+from livetranslate.metrics import registry
+from livetranslate.ratelimit import FairScheduler
+
+logger = logging.getLogger(__name__)
+
+# Connection pool settings for the shared DeepL client
+DEEPL_POOL_SIZE: int = int(os.getenv("DEEPL_POOL_SIZE", "20"))
+DEEPL_KEEPALIVE: float = float(os.getenv("DEEPL_KEEPALIVE", "60"))
+DEEPL_DNS_TTL: int = int(os.getenv("DEEPL_DNS_TTL", "300"))
+DEEPL_TIMEOUT: float = float(os.getenv("DEEPL_TIMEOUT", "10"))
+DEEPL_CONNECT_TIMEOUT: float = float(os.getenv("DEEPL_CONNECT_TIMEOUT", "3"))
+DEEPL_WARMUP_CONNECTIONS: int = int(os.getenv("DEEPL_WARMUP_CONNECTIONS", "2"))
+
+# Statuses worth retrying; other errors are returned to the caller at once
+RETRYABLE_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504, 529})
+
+
+class DeepLError(Exception):
+    """A non-2xx DeepL response."""
+
+    def __init__(self, status: int, message: str, retry_after: float | None = None) -> None:
+        super().__init__(f"DeepL error {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in RETRYABLE_STATUSES
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+def deepl_base_url() -> str:
+    """Return the DeepL API base URL for the configured plan."""
+    # An explicit URL wins, e.g. a local stand-in for benchmarks
+    override = os.getenv("DEEPL_API_URL")
+    if override:
+        return override
+    # Use the Pro API endpoint if USE_DEEPL_PRO is set to true
+    use_pro = os.getenv("USE_DEEPL_PRO", "false").lower() == "true"
+    return "https://api.deepl.com" if use_pro else "https://api-free.deepl.com"
+
+
+class DeepLClient:
+    """
+    Long-lived DeepL client backed by a pooled keep-alive aiohttp session.
+
+    One instance is shared by every listening session so translations reuse
+    already-open TLS connections instead of paying DNS, TCP and TLS handshakes
+    for each final transcript.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        pool_size: int = DEEPL_POOL_SIZE,
+        keepalive: float = DEEPL_KEEPALIVE,
+        dns_ttl: int = DEEPL_DNS_TTL,
+        timeout: float = DEEPL_TIMEOUT,
+        connect_timeout: float = DEEPL_CONNECT_TIMEOUT,
+    ) -> None:
+        self.api_key: str | None = api_key or os.getenv("DEEPL_API_KEY")
+        self.base_url: str = (base_url or deepl_base_url()).rstrip("/")
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+        self.timeout = aiohttp.ClientTimeout(
+            total=timeout, sock_connect=connect_timeout
+        )
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"DeepL-Auth-Key {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    def session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def warm_up(self, connections: int = DEEPL_WARMUP_CONNECTIONS) -> None:
+        """
+        Open a few pooled connections ahead of the first translation.
+
+        Uses the cheap ``/v2/usage`` endpoint so the DNS lookup and TLS
+        handshakes happen at boot rather than on the first caption.
+
+        :param connections: How many connections to open concurrently.
+        """
+        session = self.session()
+
+        async def ping() -> None:
+            async with session.get(f"{self.base_url}/v2/usage") as response:
+                await response.read()
+
+        results = await asyncio.gather(
+            *(ping() for _ in range(max(1, connections))), return_exceptions=True
+        )
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            logger.warning(f"DeepL warm-up failed: {failures[0]!r}")
+        else:
+            logger.info(f"Warmed up {len(results)} DeepL connection(s)")
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        context: str,
+    ) -> str:
+        """
+        Translate a single text over the pooled session.
+
+        :param text: The text to be translated.
+        :param source_lang: The source language code.
+        :param target_lang: The target language code.
+        :param context: Additional context for the translation.
+        :return: The translated text.
+        :raises DeepLError: If DeepL answers with a non-2xx status.
+        """
+        return (await self.translate_batch([text], source_lang, target_lang, context))[0]
+
+    async def translate_batch(
+        self,
+        texts: list[str],
+        source_lang: str,
+        target_lang: str,
+        context: str,
+    ) -> list[str]:
+        """
+        Translate several texts sharing a language pair in one request.
+
+        :param texts: The texts to be translated, in order.
+        :param source_lang: The source language code.
+        :param target_lang: The target language code.
+        :param context: Additional context for the translation.
+        :return: One translation per input text.
+        :raises DeepLError: If DeepL answers with a non-2xx status.
+        """
+        payload: dict[str, str | list[str]] = {
+            "text": texts,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "context": context,
+        }
+
+        async with self.session().post(
+            f"{self.base_url}/v2/translate", json=payload
+        ) as response:
+            if not response.ok:
+                raise DeepLError(
+                    response.status,
+                    await response.text(),
+                    _retry_after(response.headers.get("Retry-After")),
+                )
+            result = await response.json()
+
+        return [t["text"] for t in result["translations"]]
+
+    async def languages(self, kind: str) -> list[str]:
+        """
+        Fetch the language codes DeepL supports.
+
+        :param kind: ``"source"`` or ``"target"``.
+        :return: The codes, e.g. ``["DE", "EN-GB", ...]``.
+        """
+        async with self.session().get(
+            f"{self.base_url}/v2/languages", params={"type": kind}
+        ) as response:
+            response.raise_for_status()
+            result = await response.json()
+        return [language["language"] for language in result]
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Cross-session micro-batching; a zero wait disables it
+DEEPL_BATCH_WAIT_MS: float = float(os.getenv("DEEPL_BATCH_WAIT_MS", "0"))
+DEEPL_BATCH_SIZE: int = int(os.getenv("DEEPL_BATCH_SIZE", "25"))
+
+# Translation cache; a zero size disables it, an empty path keeps it in memory
+TRANSLATION_CACHE_SIZE: int = int(os.getenv("TRANSLATION_CACHE_SIZE", "2048"))
+TRANSLATION_CACHE_TTL: float = float(os.getenv("TRANSLATION_CACHE_TTL", "86400"))
+TRANSLATION_CACHE_PATH: str = os.getenv("TRANSLATION_CACHE_PATH", "")
+
+# Per-translation deadline, retries after a failed attempt, and the breaker
+# that fails fast while DeepL keeps failing
+DEEPL_DEADLINE: float = float(os.getenv("DEEPL_DEADLINE", "5"))
+DEEPL_RETRIES: int = int(os.getenv("DEEPL_RETRIES", "2"))
+DEEPL_RETRY_BASE_DELAY: float = float(os.getenv("DEEPL_RETRY_BASE_DELAY", "0.2"))
+DEEPL_BREAKER_FAILURES: int = int(os.getenv("DEEPL_BREAKER_FAILURES", "5"))
+DEEPL_BREAKER_RESET: float = float(os.getenv("DEEPL_BREAKER_RESET", "10"))
+
+# Process-wide DeepL budget shared fairly by sessions; zero rates disable it
+DEEPL_RATE_LIMIT_RPS: float = float(os.getenv("DEEPL_RATE_LIMIT_RPS", "0"))
+DEEPL_RATE_LIMIT_CPS: float = float(os.getenv("DEEPL_RATE_LIMIT_CPS", "0"))
+DEEPL_RATE_BURST_SECONDS: float = float(os.getenv("DEEPL_RATE_BURST_SECONDS", "1"))
+
+_client: DeepLClient | None = None
+_batcher: BatchingTranslator | None = None
+_cache: TranslationCache | None = None
+_scheduler: FairScheduler | None = None
+_breakers: dict[str, CircuitBreaker] = {}
+
+# Translations given up on, by reason
+failures: dict[str, int] = {"timeout": 0, "rejected": 0, "error": 0}
+
+
+def get_deepl_client() -> DeepLClient:
+    """Return the process-wide DeepL client, creating it lazily."""
+    global _client
+    if _client is None:
+        _client = DeepLClient()
+    return _client
+
+
+def get_batching_translator() -> BatchingTranslator | None:
+    """Return the shared batching translator, or None when batching is off."""
+    global _batcher
+    if DEEPL_BATCH_WAIT_MS <= 0:
+        return None
+    if _batcher is None:
+        _batcher = BatchingTranslator(
+            _send_batch,
+            max_wait=DEEPL_BATCH_WAIT_MS / 1000,
+            max_batch=DEEPL_BATCH_SIZE,
+        )
+    return _batcher
+
+
+def get_translation_cache() -> TranslationCache | None:
+    """Return the shared translation cache, or None when caching is off."""
+    global _cache
+    if TRANSLATION_CACHE_SIZE <= 0:
+        return None
+    if _cache is None:
+        _cache = TranslationCache(
+            max_entries=TRANSLATION_CACHE_SIZE,
+            ttl=TRANSLATION_CACHE_TTL,
+            disk_path=TRANSLATION_CACHE_PATH or None,
+        )
+    return _cache
+
+
+def get_rate_limiter() -> FairScheduler | None:
+    """Return the shared fair-share rate limiter, or None when it is off."""
+    global _scheduler
+    if DEEPL_RATE_LIMIT_RPS <= 0 and DEEPL_RATE_LIMIT_CPS <= 0:
+        return None
+    if _scheduler is None:
+        _scheduler = FairScheduler(
+            DEEPL_RATE_LIMIT_RPS, DEEPL_RATE_LIMIT_CPS, DEEPL_RATE_BURST_SECONDS
+        )
+    return _scheduler
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Return the circuit breaker for the configured DeepL endpoint."""
+    base_url = get_deepl_client().base_url
+    breaker = _breakers.get(base_url)
+    if breaker is None:
+        breaker = _breakers[base_url] = CircuitBreaker(
+            base_url, DEEPL_BREAKER_FAILURES, DEEPL_BREAKER_RESET
+        )
+    return breaker
+
+
+def resilience_stats() -> dict[str, dict]:
+    """Return breaker state per endpoint and give-up counts by reason."""
+    return {
+        "breakers": {url: breaker.stats() for url, breaker in _breakers.items()},
+        "failures": dict(failures),
+    }
+
+
+async def _send_batch(
+    texts: list[str],
+    source_lang: str,
+    target_lang: str,
+    context: str,
+    timeout: float | None = None,
+) -> list[str]:
+    """
+    Send one DeepL request and record its outcome on the circuit breaker.
+
+    Batched callers share the request, so it counts once towards the
+    breaker however many of them are waiting for it. A caller's own
+    ``timeout`` expiring says nothing about DeepL and is not recorded; only
+    the client's full per-request timeout counts as a failure.
+    """
+    breaker = get_circuit_breaker()
+    started = time.monotonic()
+    try:
+        async with asyncio.timeout(timeout) as budget:
+            results = await get_deepl_client().translate_batch(texts, source_lang, target_lang, context)
+    except DeepLError as e:
+        if e.retryable:
+            breaker.record_failure()
+        else:
+            # The endpoint is up; the request itself was refused
+            breaker.record_success()
+        raise
+    except asyncio.TimeoutError:
+        if not budget.expired():
+            breaker.record_failure()
+        raise
+    except aiohttp.ClientError:
+        breaker.record_failure()
+        raise
+    finally:
+        registry.observe("deepl_request", time.monotonic() - started)
+    breaker.record_success()
+    return results
+
+
+async def _request(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    context: str,
+    timeout: float,
+) -> str:
+    batcher = get_batching_translator()
+    if batcher is not None:
+        # The batch runs on regardless; only this caller stops waiting
+        return await asyncio.wait_for(batcher.translate(text, source_lang, target_lang, context), timeout)
+    return (await _send_batch([text], source_lang, target_lang, context, timeout))[0]
+
+
+async def _translate_uncached(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    context: str,
+    deadline: float,
+    session: str,
+) -> str:
+    """
+    Translate with retries until ``deadline`` (a loop time).
+
+    Every attempt first waits for the session's share of the rate limit.
+    Returns an empty string when the deadline passes, the breaker is open,
+    retries run out or DeepL rejects the request.
+    """
+    loop = asyncio.get_running_loop()
+    breaker = get_circuit_breaker()
+    scheduler = get_rate_limiter()
+    for attempt in range(max(0, DEEPL_RETRIES) + 1):
+        if not breaker.allow():
+            failures["rejected"] += 1
+            return ""
+        remaining = deadline - loop.time()
+        if remaining > 0 and scheduler is not None:
+            try:
+                await asyncio.wait_for(scheduler.acquire(session, len(text)), remaining)
+            except asyncio.TimeoutError:
+                pass
+            remaining = deadline - loop.time()
+        if remaining <= 0:
+            failures["timeout"] += 1
+            return ""
+
+        # Breaker outcomes are recorded per HTTP request in _send_batch
+        try:
+            return await _request(text, source_lang, target_lang, context, remaining)
+        except asyncio.TimeoutError:
+            failures["timeout"] += 1
+            logger.warning("DeepL translation missed its deadline")
+            return ""
+        except DeepLError as e:
+            if not e.retryable:
+                failures["error"] += 1
+                logger.error(str(e))
+                return ""
+            delay = e.retry_after
+            error = e
+        except aiohttp.ClientError as e:
+            delay = None
+            error = e
+
+        # Exponential backoff with full jitter unless DeepL said how long to wait
+        if delay is None:
+            delay = random.uniform(0, DEEPL_RETRY_BASE_DELAY * 2 ** attempt)
+        if attempt >= DEEPL_RETRIES or loop.time() + delay >= deadline:
+            break
+        logger.warning(f"Retrying DeepL translation in {delay:.2f}s: {error}")
+        await asyncio.sleep(delay)
+
+    failures["error"] += 1
+    logger.error(f"DeepL translation failed: {error}")
+    return ""
+
+
+async def start_deepl_client(app=None) -> None:
+    """aiohttp ``on_startup`` hook: warm up the shared client and load languages."""
+    client = get_deepl_client()
+    _, languages = await asyncio.gather(client.warm_up(), load_language_registry(client.languages))
+    set_language_registry(languages)
+    logger.info(f"Language registry: {languages.stats()}")
+
+
+async def close_deepl_client(app=None) -> None:
+    """aiohttp ``on_cleanup`` hook: close the shared client's connections."""
+    global _client, _batcher, _cache, _scheduler
+    if _scheduler is not None:
+        await _scheduler.close()
+        _scheduler = None
+    if _cache is not None:
+        logger.info(f"Translation cache stats: {_cache.stats()}")
+        await _cache.close()
+        _cache = None
+    if _batcher is not None:
+        await _batcher.close()
+        _batcher = None
+    if _client is not None:
+        await _client.close()
+        _client = None
+
 
 async def translate_text_deepl(
     text: str,
     source_lang: str,
     target_lang: str,
     context: str,
+    timeout: float = DEEPL_DEADLINE,
+    session: str = "",
 ) -> str:
     """
-    Asynchronously translate text using DeepL API and requests-async library.
+    Asynchronously translate text using the shared DeepL client.
 
     :param text: The text to be translated.
     :param source_language: The source language code.
     :param target_language: The target language code.
     :param context: Additional context for the translation.
-    :return: The translated text as a string.
+    :param timeout: Seconds until the translation is given up, retries included.
+    :param session: The session the translation is for, for fair rate limiting.
+    :return: The translated text, or an empty string if it failed in time.
     """
-    headers: dict[str, str] = {
-        "Authorization": f'DeepL-Auth-Key {os.getenv("DEEPL_API_KEY")}',
-        "Content-Type": "application/json",
-    }
-
-    payload: dict[str, str | list[str]] = {
-        "text": [text],
-        "source_lang": source_lang,
-        "target_lang": target_lang,
-        "context": context,
-    }
-
-    # Use the Pro API endpoint if USE_DEEPL_PRO is set to true
-    use_pro = os.getenv("USE_DEEPL_PRO", "false").lower() == "true"
-    url: str = (
-        "https://api.deepl.com/v2/translate"
-        if use_pro
-        else "https://api-free.deepl.com/v2/translate"
-    )
-
-    async with aiohttp.ClientSession() as session, session.post(
-        url, json=payload, headers=headers
-    ) as response:
-        if not response.ok:
-            print(await response.text())
-            return ""
-        result = await response.json()
-
-        translated_text: str = result["translations"][0]["text"]
-
-    return translated_text
+    deadline = asyncio.get_running_loop().time() + timeout
+    translate = functools.partial(_translate_uncached, deadline=deadline, session=session)
+    cache = get_translation_cache()
+    if cache is not None:
+        return await cache.translate(
+            text, source_lang, target_lang, context, translate
+        )
+    return await translate(text, source_lang, target_lang, context)
 
 
 def deepl_language(language: str) -> str | None:
-    # Common language code mappings
-    language_map = {
-        "CH": "ZH",  # Map CH (Chinese) to ZH (DeepL's code for Chinese)
-        "CN": "ZH",  # Map CN to ZH
-        "CZ": "CS",  # Map CZ (Czech) to CS
-        "GR": "EL",  # Map GR (Greek) to EL
-    }
-
-    deepl_supported: list[str] = [
-        "BG",  # Bulgarian
-        "CS",  # Czech
-        "DA",  # Danish
-        "DE",  # German
-        "EL",  # Greek
-        "EN",  # English
-        "EN-GB",  # British English
-        "EN-US",  # American English
-        "ES",  # Spanish
-        "ET",  # Estonian
-        "FI",  # Finnish
-        "FR",  # French
-        "HU",  # Hungarian
-        "ID",  # Indonesian
-        "IT",  # Italian
-        "JA",  # Japanese
-        "KO",  # Korean
-        "LT",  # Lithuanian
-        "LV",  # Latvian
-        "NB",  # Norwegian
-        "NL",  # Dutch
-        "PL",  # Polish
-        "PT",  # Portuguese
-        "PT-BR",  # Brazilian Portuguese
-        "PT-PT",  # European Portuguese
-        "RO",  # Romanian
-        "RU",  # Russian
-        "SK",  # Slovak
-        "SL",  # Slovenian
-        "SV",  # Swedish
-        "TR",  # Turkish
-        "UK",  # Ukrainian
-        "ZH",  # Chinese
-    ]
-
-    # Check for direct match after converting to uppercase
-    code = language.upper()
-    if code in deepl_supported:
-        return code
-
-    # Check if the code is in our mapping
-    if code in language_map:
-        return language_map[code]
-
-    # Try to get the language part before the hyphen (e.g., "en-US" -> "en")
-    base_code = code.split("-")[0]
-    if base_code in deepl_supported:
-        return base_code
-
-    # Check if the base code is in our mapping
-    if base_code in language_map:
-        return language_map[base_code]
-
-    # Return None if no match found
-    return None
+    """Return the DeepL target code for a client language code, or None."""
+    return get_language_registry().target(language)
@@ -0,0 +1,114 @@
+import os
+from collections import deque
+
+import numpy as np
+
+VAD_THRESHOLD_DB: float = float(os.getenv("VAD_THRESHOLD_DB", "-45"))
+VAD_HANGOVER_MS: int = int(os.getenv("VAD_HANGOVER_MS", "1000"))
+VAD_PREROLL_MS: int = int(os.getenv("VAD_PREROLL_MS", "300"))
+
+
+class VoiceActivityDetector:
+    """
+    Energy and zero-crossing voice activity detector for linear16 mono PCM.
+
+    Each chunk is split into short analysis frames and scored with NumPy in
+    one pass. Audio keeps flowing until silence has lasted ``hangover_ms``;
+    after that, chunks are held back (only the last ``preroll_ms`` are kept)
+    and released ahead of the next speech onset so it is not clipped.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        threshold_db: float = VAD_THRESHOLD_DB,
+        max_zcr: float = 0.25,
+        hangover_ms: int = VAD_HANGOVER_MS,
+        preroll_ms: int = VAD_PREROLL_MS,
+    ) -> None:
+        """
+        :param sample_rate: Sample rate of the incoming PCM.
+        :param frame_ms: Analysis frame length in milliseconds.
+        :param threshold_db: Frame energy (dBFS) above which a frame may be speech.
+        :param max_zcr: Zero-crossing rate above which quiet frames count as noise.
+        :param hangover_ms: Silence tolerated before audio is suppressed.
+        :param preroll_ms: Suppressed audio replayed before a speech onset.
+        """
+        self.bytes_per_ms = sample_rate * 2 // 1000
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.max_zcr = max_zcr
+        self.hangover_bytes = hangover_ms * self.bytes_per_ms
+        self.preroll_bytes = preroll_ms * self.bytes_per_ms
+        self._preroll: deque[bytes] = deque()
+        self._preroll_size = 0
+        self._silent_bytes = 0
+        self.suppressed = False
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.suppressed_bytes = 0
+
+    def is_speech(self, chunk: bytes) -> bool:
+        """Return True if any analysis frame in the chunk looks like speech."""
+        samples = np.frombuffer(chunk, dtype="<i2", count=len(chunk) // 2)
+        if samples.size == 0:
+            return False
+        usable = samples.size // self.frame_len * self.frame_len
+        if usable:
+            frames = samples[:usable].reshape(-1, self.frame_len)
+        else:
+            frames = samples.reshape(1, -1)
+
+        frames = frames.astype(np.float32) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+        # Loud frames always count; quieter ones only if they are not hiss
+        speech = (energy_db > self.threshold_db) & (
+            (zcr < self.max_zcr) | (energy_db > self.threshold_db + 15)
+        )
+
+        voiced = int(np.count_nonzero(speech))
+        self.speech_frames += voiced
+        self.silence_frames += speech.size - voiced
+        return voiced > 0
+
+    def process(self, chunk: bytes) -> bytes:
+        """
+        Gate one chunk of audio.
+
+        :param chunk: linear16 mono PCM.
+        :return: The audio to send upstream: the chunk itself, the pre-roll
+            plus the chunk at a speech onset, or ``b""`` during long silence.
+        """
+        if self.is_speech(chunk):
+            self._silent_bytes = 0
+            if self.suppressed:
+                self.suppressed = False
+                preroll = b"".join(self._preroll) + chunk
+                self._preroll.clear()
+                self._preroll_size = 0
+                return preroll
+            return chunk
+
+        self._silent_bytes += len(chunk)
+        if not self.suppressed and self._silent_bytes >= self.hangover_bytes:
+            self.suppressed = True
+
+        if not self.suppressed:
+            return chunk
+
+        self.suppressed_bytes += len(chunk)
+        self._preroll.append(chunk)
+        self._preroll_size += len(chunk)
+        while self._preroll and self._preroll_size - len(self._preroll[0]) >= self.preroll_bytes:
+            self._preroll_size -= len(self._preroll.popleft())
+        return b""
+
+    def stats(self) -> dict[str, float]:
+        frames = self.speech_frames + self.silence_frames
+        return {
+            "speech_ratio": self.speech_frames / frames if frames else 0.0,
+            "silence_ratio": self.silence_frames / frames if frames else 0.0,
+            "suppressed_seconds": self.suppressed_bytes / self.bytes_per_ms / 1000,
+        }
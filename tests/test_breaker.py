@@ -0,0 +1,64 @@
+from livetranslate import breaker as breaker_module
+from livetranslate.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module.time, "monotonic", clock)
+    return CircuitBreaker("deepl", **kwargs), clock
+
+
+def test_opens_after_consecutive_failures(monkeypatch):
+    breaker, _ = _breaker(monkeypatch, failure_threshold=3, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1 and breaker.stats()["opened"] == 1
+
+
+def test_half_open_trial_success_closes(monkeypatch):
+    breaker, clock = _breaker(monkeypatch, failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only the one trial goes through until it reports back
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_half_open_trial_failure_reopens(monkeypatch):
+    breaker, clock = _breaker(monkeypatch, failure_threshold=5, reset_timeout=10)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 5
+    assert not breaker.allow()
+
+
+def test_lost_trial_is_retried_after_reset_timeout(monkeypatch):
+    breaker, clock = _breaker(monkeypatch, failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    clock.now += 10
+    assert breaker.allow()
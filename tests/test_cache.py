@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from livetranslate.cache import TranslationCache, normalize_text
+
+
+class FakeDeepL:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self, text, source_lang, target_lang, context):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return text.upper()
+
+
+def test_normalize_text():
+    assert normalize_text("  hello \n world ") == "hello world"
+
+
+def test_hit_after_miss():
+    async def main():
+        cache = TranslationCache()
+        deepl = FakeDeepL(delay=0)
+        first = await cache.translate("hello", "en", "de", "", deepl)
+        second = await cache.translate(" hello ", "EN", "DE", "", deepl)
+        return cache, deepl, first, second
+
+    cache, deepl, first, second = asyncio.run(main())
+    assert first == second == "HELLO"
+    assert deepl.calls == 1
+    assert cache.misses == 1 and cache.hits == 1
+
+
+def test_lru_eviction():
+    async def main():
+        cache = TranslationCache(max_entries=2)
+        deepl = FakeDeepL(delay=0)
+        for text in ("a", "b", "c"):
+            await cache.translate(text, "en", "de", "", deepl)
+        return cache, await cache.get("a", "en", "de")
+
+    cache, evicted = asyncio.run(main())
+    assert evicted is None
+    assert cache.evictions == 1
+
+
+def test_concurrent_misses_are_coalesced():
+    async def main():
+        cache = TranslationCache()
+        deepl = FakeDeepL()
+        results = await asyncio.gather(*(cache.translate("hi", "en", "de", "", deepl) for _ in range(5)))
+        return cache, deepl, results
+
+    cache, deepl, results = asyncio.run(main())
+    assert results == ["HI"] * 5
+    assert deepl.calls == 1
+    assert cache.coalesced == 4
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    async def main():
+        cache = TranslationCache()
+        deepl = FakeDeepL()
+        leader = asyncio.create_task(cache.translate("hi", "en", "de", "", deepl))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(cache.translate("hi", "en", "de", "", deepl)) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return cache, deepl, results
+
+    cache, deepl, results = asyncio.run(main())
+    assert results == ["HI", "HI"]
+    assert deepl.calls == 1 and deepl.cancelled == 0
+    assert not cache._inflight
+    assert cache._get_memory(cache.key("hi", "en", "de")) == "HI"
+
+
+def test_upstream_cancelled_once_every_caller_gives_up():
+    async def main():
+        cache = TranslationCache()
+        deepl = FakeDeepL(delay=10)
+        callers = [asyncio.create_task(cache.translate("hi", "en", "de", "", deepl)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert deepl.cancelled == 0
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return cache, deepl
+
+    cache, deepl = asyncio.run(main())
+    assert deepl.cancelled == 1
+    assert not cache._inflight
+
+
+def test_failure_reaches_every_caller_and_is_not_cached():
+    async def failing(text, source_lang, target_lang, context):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("DeepL down")
+
+    async def main():
+        cache = TranslationCache()
+        results = await asyncio.gather(
+            *(cache.translate("hi", "en", "de", "", failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+        return cache, results
+
+    cache, results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not cache._inflight and not cache._entries
@@ -0,0 +1,31 @@
+import json
+
+from livetranslate.decoding import decode_message, message_type
+
+
+def _results(transcript, is_final, speakers=()):
+    words = [{"word": w, "speaker": s} for w, s in zip(transcript.split(), speakers)]
+    return json.dumps({
+        "type": "Results",
+        "is_final": is_final,
+        "speech_final": is_final,
+        "start": 1.5,
+        "channel": {"alternatives": [{"transcript": transcript, "words": words}]},
+    })
+
+
+def test_other_message_types_are_skipped_unparsed():
+    assert message_type('{"type": "Metadata", "request_id": "x"}') == "Metadata"
+    assert decode_message('{"type": "Metadata", not json') is None
+
+
+def test_final_event_has_majority_speaker():
+    result = decode_message(_results("hello there friend", True, speakers=(1, 0, 1)))
+    assert result.event() == {"text": "hello there friend", "is_final": True,
+                              "speech_final": True, "speaker": 1}
+
+
+def test_interim_event_skips_speaker():
+    event = decode_message(_results("hello there", False, speakers=(1, 1))).event()
+    assert "speaker" not in event
+    assert event["text"] == "hello there" and not event["is_final"]
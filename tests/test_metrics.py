@@ -0,0 +1,36 @@
+from livetranslate.metrics import (
+    EMITTED,
+    FINAL,
+    FIRST_INTERIM,
+    FIRST_SENT,
+    TRANSLATION_END,
+    TRANSLATION_START,
+    MetricsRegistry,
+    UtteranceTrace,
+)
+
+
+def test_mark_keeps_first_timestamp():
+    trace = UtteranceTrace(0.0)
+    trace.mark(FINAL, 1.0)
+    trace.mark(FINAL, 2.0)
+    assert trace.marks[FINAL] == 1.0
+
+
+def test_sentences_of_one_final_record_earlier_stages_once():
+    utterance = UtteranceTrace(0.0)
+    for name, at in ((FIRST_SENT, 0.1), (FIRST_INTERIM, 0.5), (FINAL, 1.0)):
+        utterance.mark(name, at)
+    registry = MetricsRegistry()
+    registry.record(utterance)
+
+    for offset in (0.2, 0.4):
+        trace = utterance.sentence()
+        trace.mark(TRANSLATION_START, 1.0)
+        trace.mark(TRANSLATION_END, 1.0 + offset)
+        trace.mark(EMITTED, 1.1 + offset)
+        registry.record(trace)
+
+    counts = {stage: h.count for stage, h in registry.latencies.items()}
+    assert counts["ingest"] == counts["recognition"] == counts["finalization"] == 1
+    assert counts["translation"] == counts["emit"] == counts["caption"] == counts["utterance"] == 2
@@ -0,0 +1,104 @@
+import asyncio
+
+from livetranslate.pipeline import TranslationPipeline
+
+
+def _collect(emitted):
+    async def emit(result):
+        emitted.append(result)
+    return emit
+
+
+def _translation(result, delay=0.0, error=None):
+    async def translate():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    return translate
+
+
+def test_emits_in_submission_order():
+    async def main():
+        pipeline = TranslationPipeline(max_concurrency=4)
+        emitted = []
+        for i, delay in enumerate([0.03, 0.01, 0.02, 0.0]):
+            pipeline.submit(_translation(i, delay), _collect(emitted))
+        while pipeline.in_flight():
+            await asyncio.sleep(0.005)
+        return pipeline, emitted
+
+    pipeline, emitted = asyncio.run(main())
+    assert emitted == [0, 1, 2, 3]
+    assert pipeline.held_back == 3
+
+
+def test_failed_translation_emits_none_and_does_not_stall():
+    async def main():
+        pipeline = TranslationPipeline()
+        emitted = []
+        pipeline.submit(_translation(0, 0.01, error=RuntimeError("boom")), _collect(emitted))
+        pipeline.submit(_translation(1), _collect(emitted))
+        while pipeline.in_flight():
+            await asyncio.sleep(0.005)
+        return pipeline, emitted
+
+    pipeline, emitted = asyncio.run(main())
+    assert emitted == [None, 1]
+    assert pipeline.failed == 1
+
+
+def test_cancelled_translation_does_not_stall_later_ones():
+    async def main():
+        pipeline = TranslationPipeline()
+        emitted = []
+        upstream = asyncio.create_task(asyncio.sleep(10, result="never"))
+
+        async def translate():
+            return await upstream
+
+        pipeline.submit(translate, _collect(emitted))
+        pipeline.submit(_translation(1), _collect(emitted))
+        pipeline.submit(_translation(2), _collect(emitted))
+        await asyncio.sleep(0.01)
+        upstream.cancel()
+        await asyncio.wait_for(_drained(pipeline), 1)
+        return pipeline, emitted
+
+    pipeline, emitted = asyncio.run(main())
+    assert emitted == [None, 1, 2]
+    assert pipeline.cancelled == 1
+
+
+def test_cancelled_pipeline_task_does_not_stall_later_ones():
+    async def main():
+        pipeline = TranslationPipeline()
+        emitted = []
+        pipeline.submit(_translation(0, 10), _collect(emitted))
+        pipeline.submit(_translation(1), _collect(emitted))
+        await asyncio.sleep(0.01)
+        for task in list(pipeline._tasks):
+            task.cancel()
+        await asyncio.wait_for(_drained(pipeline), 1)
+        return emitted
+
+    assert asyncio.run(main()) == [None, 1]
+
+
+def test_close_cancels_in_flight():
+    async def main():
+        pipeline = TranslationPipeline()
+        emitted = []
+        pipeline.submit(_translation(0, 10), _collect(emitted))
+        await asyncio.sleep(0)
+        await pipeline.close()
+        return pipeline, emitted
+
+    pipeline, emitted = asyncio.run(main())
+    assert emitted == []
+    assert not pipeline._tasks
+
+
+async def _drained(pipeline):
+    while pipeline.in_flight():
+        await asyncio.sleep(0.005)
@@ -0,0 +1,71 @@
+import asyncio
+
+from livetranslate.ratelimit import FairScheduler, TokenBucket
+
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(rate=10, capacity=10)
+    now = bucket.updated
+    assert bucket.wait_time(5, now) == 0
+    bucket.consume(10)
+    assert abs(bucket.wait_time(5, now) - 0.5) < 1e-9
+    assert TokenBucket(0, 0).wait_time(1000, now) == 0
+
+
+def test_sessions_share_throughput_fairly():
+    async def main():
+        # 50 requests/s with no burst: a heavy session queues 30 requests,
+        # a light one 5, all at once
+        scheduler = FairScheduler(requests_per_second=50, characters_per_second=0, burst_seconds=0)
+        order = []
+
+        async def request(session):
+            await scheduler.acquire(session, 10)
+            order.append(session)
+
+        tasks = [asyncio.create_task(request("heavy")) for _ in range(30)]
+        tasks += [asyncio.create_task(request("light")) for _ in range(5)]
+        await asyncio.gather(*tasks)
+        await scheduler.close()
+        return scheduler, order
+
+    scheduler, order = asyncio.run(main())
+    # The light session is not stuck behind the heavy session's backlog
+    assert order.index("light") <= 2
+    assert max(i for i, s in enumerate(order) if s == "light") < 12
+    assert scheduler.stats()["light"]["max_wait"] < scheduler.stats()["heavy"]["max_wait"]
+
+
+def test_weights_bias_the_share():
+    async def main():
+        scheduler = FairScheduler(requests_per_second=100, characters_per_second=0, burst_seconds=0)
+        scheduler.set_weight("gold", 3)
+        order = []
+
+        async def request(session):
+            await scheduler.acquire(session, 10)
+            order.append(session)
+
+        tasks = [asyncio.create_task(request(s)) for s in ["plain"] * 20 + ["gold"] * 20]
+        await asyncio.gather(*tasks)
+        await scheduler.close()
+        return order
+
+    first = asyncio.run(main())[:20]
+    assert first.count("gold") >= 13
+
+
+def test_request_given_up_while_queued_is_skipped():
+    async def main():
+        scheduler = FairScheduler(requests_per_second=20, characters_per_second=0, burst_seconds=0)
+        await scheduler.acquire("a", 1)
+        try:
+            await asyncio.wait_for(scheduler.acquire("a", 1), 0.001)
+        except asyncio.TimeoutError:
+            pass
+        await asyncio.wait_for(scheduler.acquire("b", 1), 1)
+        queued = scheduler.queued()
+        await scheduler.close()
+        return queued
+
+    assert asyncio.run(main()) == 0
@@ -0,0 +1,70 @@
+import threading
+
+from livetranslate import recording
+from livetranslate.recording import TraceRecorder, read_trace, stop_recording
+
+
+def test_trace_round_trip(tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+    recorder = TraceRecorder(path, language="en-US")
+    recorder.record('{"type": "Results"}')
+    recorder.record(b'{"type": "Metadata", "text": "caf\\u00e9"}')
+    recorder.close()
+    recorder.record("after close")
+    stop_recording()
+
+    header, messages = read_trace(path)
+    assert header["language"] == "en-US"
+    assert [message for _, message in messages] == [
+        '{"type": "Results"}',
+        '{"type": "Metadata", "text": "caf\\u00e9"}',
+    ]
+    assert recorder.messages == 2
+
+
+def test_writes_happen_off_the_calling_thread(tmp_path, monkeypatch):
+    writers = set()
+    original = TraceRecorder._write
+
+    def spy(self, item):
+        writers.add(threading.current_thread().name)
+        original(self, item)
+
+    monkeypatch.setattr(TraceRecorder, "_write", spy)
+    recorder = TraceRecorder(str(tmp_path / "t.jsonl.gz"))
+    recorder.record("{}")
+    recorder.close()
+    stop_recording()
+    assert writers == {"trace-writer"}
+
+
+def test_result_dicts_are_serialized_by_the_writer(tmp_path, monkeypatch):
+    threads = []
+    dumps = recording.json.dumps
+
+    def spy(obj, **kwargs):
+        threads.append(threading.current_thread().name)
+        return dumps(obj, **kwargs)
+
+    monkeypatch.setattr(recording.json, "dumps", spy)
+    path = str(tmp_path / "t.jsonl.gz")
+    recorder = TraceRecorder(path)
+    recorder.record({"type": "Results", "is_final": True})
+    recorder.close()
+    stop_recording()
+    monkeypatch.undo()
+
+    _, messages = read_trace(path)
+    assert messages[0][1] == '{"type": "Results", "is_final": true}'
+    assert set(threads) == {"trace-writer"}
+
+
+def test_full_queue_drops_messages(tmp_path, monkeypatch):
+    monkeypatch.setattr(recording._writer, "max_queued", 0)
+    recorder = TraceRecorder(str(tmp_path / "t.jsonl.gz"))
+    recorder.record("{}")
+    recorder.close()
+    stop_recording()
+    assert recorder.dropped == 1 and recorder.messages == 0
+    header, messages = read_trace(recorder.path)
+    assert messages == []
@@ -0,0 +1,68 @@
+import pytest
+
+from livetranslate.ringbuffer import AudioRingBuffer
+
+
+def _read_all(ring):
+    data = b""
+    while (frame := ring.read()) is not None:
+        data += bytes(frame)
+    return data
+
+
+def test_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        AudioRingBuffer(0)
+
+
+def test_read_returns_written_bytes_in_frames():
+    ring = AudioRingBuffer(16)
+    ring.write(b"abcdef")
+    assert bytes(ring.read(4)) == b"abcd"
+    assert bytes(ring.read(4)) == b"ef"
+    assert ring.read(4) is None
+
+
+def test_wraparound_is_read_in_two_regions():
+    ring = AudioRingBuffer(8)
+    ring.write(b"012345")
+    assert bytes(ring.read()) == b"012345"
+    ring.write(b"6789")
+    assert bytes(ring.read()) == b"67"
+    assert bytes(ring.read()) == b"89"
+    assert ring.pending() == 0
+
+
+def test_overrun_skips_overwritten_bytes():
+    ring = AudioRingBuffer(8)
+    ring.write(b"0123")
+    ring.write(b"456789ab")
+    assert ring.overrun == 4
+    assert _read_all(ring) == b"456789ab"
+
+
+def test_oversized_write_keeps_the_newest_bytes():
+    ring = AudioRingBuffer(4)
+    ring.write(b"0123456789")
+    assert ring.written == 10
+    assert ring.tail(4) == b"6789"
+    assert _read_all(ring) == b"6789"
+
+
+def test_tail_spans_the_wrap():
+    ring = AudioRingBuffer(8)
+    ring.write(b"abcdef")
+    ring.write(b"ghij")
+    assert ring.tail(6) == b"efghij"
+    assert ring.tail(100) == b"cdefghij"
+
+
+def test_read_aliases_the_ring_until_copied():
+    ring = AudioRingBuffer(4)
+    ring.write(b"abcd")
+    frame = ring.read()
+    copy = bytes(frame)
+    ring.write(b"wxyz")
+    # The view now shows the new audio; only the copy keeps the old frame
+    assert bytes(frame) == b"wxyz"
+    assert copy == b"abcd"
@@ -0,0 +1,87 @@
+import asyncio
+
+from livetranslate.segment import SentenceSegmenter, ends_sentence, split_sentences
+
+
+def test_split_sentences():
+    assert split_sentences("Hello there. How are you? I'm") == ["Hello there.", "How are you?", "I'm"]
+    assert split_sentences('He said "stop." Then left.') == ['He said "stop."', "Then left."]
+    assert split_sentences("Talk to Dr. Smith about the U.S. plan.") == ["Talk to Dr. Smith about the U.S. plan."]
+    assert split_sentences("Version 3.5 is out") == ["Version 3.5 is out"]
+    assert split_sentences("你好。再见！") == ["你好。", "再见！"]
+
+
+def test_ends_sentence():
+    assert ends_sentence("It works.")
+    assert ends_sentence("Really?!")
+    assert not ends_sentence("Ask Mr.")
+    assert not ends_sentence("and then")
+
+
+def _segmenter(**kwargs):
+    expired = []
+    segmenter = SentenceSegmenter(lambda text, tag: expired.append((text, tag)), **kwargs)
+    return segmenter, expired
+
+
+def test_fragments_are_held_until_the_sentence_ends():
+    async def main():
+        segmenter, expired = _segmenter(max_hold=10)
+        first = segmenter.add("So what we")
+        second = segmenter.add("need is time. And")
+        pending = segmenter.pending
+        segmenter.close()
+        return first, second, pending, expired
+
+    first, second, pending, expired = asyncio.run(main())
+    assert first == []
+    assert second == ["So what we need is time."]
+    assert pending == "And"
+    assert expired == []
+
+
+def test_end_of_speech_releases_an_unfinished_sentence():
+    async def main():
+        segmenter, _ = _segmenter()
+        held = segmenter.add("no punctuation here")
+        released = segmenter.add("at all", end_of_speech=True)
+        segmenter.close()
+        return held, released
+
+    assert asyncio.run(main()) == ([], ["no punctuation here at all"])
+
+
+def test_held_text_expires_with_its_tag():
+    async def main():
+        segmenter, expired = _segmenter(max_hold=0.02)
+        segmenter.add("trailing words", tag="trace-1")
+        await asyncio.sleep(0.05)
+        return segmenter, expired
+
+    segmenter, expired = asyncio.run(main())
+    assert expired == [("trailing words", "trace-1")]
+    assert segmenter.pending == "" and segmenter.expired == 1
+
+
+def test_new_final_restarts_the_hold():
+    async def main():
+        segmenter, expired = _segmenter(max_hold=0.05)
+        segmenter.add("first part")
+        await asyncio.sleep(0.03)
+        segmenter.add("second part")
+        await asyncio.sleep(0.03)
+        early = list(expired)
+        await asyncio.sleep(0.05)
+        return early, expired
+
+    early, expired = asyncio.run(main())
+    assert early == []
+    assert [text for text, _ in expired] == ["first part second part"]
+
+
+def test_long_text_is_not_held():
+    async def main():
+        segmenter, _ = _segmenter(max_chars=10)
+        return segmenter.add("this run-on fragment never ends")
+
+    assert asyncio.run(main()) == ["this run-on fragment never ends"]
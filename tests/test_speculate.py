@@ -0,0 +1,93 @@
+import asyncio
+
+from livetranslate.speculate import SpeculativeTranslator
+
+
+class SlowDeepL:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.texts = []
+        self.cancelled = 0
+
+    async def __call__(self, text):
+        self.texts.append(text)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return text.upper()
+
+
+def test_stable_sentence_is_translated_and_reused():
+    async def main():
+        deepl = SlowDeepL(delay=0)
+        speculator = SpeculativeTranslator(deepl, stable_interims=2)
+        speculator.observe("Hello there. How")
+        speculator.observe("Hello there. How are")
+        await asyncio.sleep(0.01)
+        task = speculator.take("Hello there.")
+        return deepl, speculator, await task
+
+    deepl, speculator, translation = asyncio.run(main())
+    assert deepl.texts == ["Hello there."]
+    assert translation == "HELLO THERE."
+    assert speculator.reused == 1
+
+
+def test_stale_speculations_are_cancelled():
+    async def main():
+        deepl = SlowDeepL()
+        speculator = SpeculativeTranslator(deepl, stable_interims=2, max_in_flight=1)
+        speculator.observe("Hello there. How")
+        speculator.observe("Hello there. How are")
+        await asyncio.sleep(0)
+        # The interim was revised, so the speculation is no longer stable
+        speculator.observe("Yellow there")
+        speculator.observe("Yellow hair")
+        await asyncio.sleep(0)
+        # The cancelled request no longer occupies the only slot
+        speculator.observe("Yellow hair. Yes")
+        speculator.observe("Yellow hair. Yes it")
+        await asyncio.sleep(0.1)
+        return deepl, speculator
+
+    deepl, speculator = asyncio.run(main())
+    assert deepl.cancelled == 1
+    assert deepl.texts == ["Hello there.", "Yellow hair."]
+    assert speculator.cancelled == 1
+    assert speculator.wasted == 0
+
+
+def test_reset_cancels_unused_speculations():
+    async def main():
+        deepl = SlowDeepL()
+        speculator = SpeculativeTranslator(deepl, stable_interims=2)
+        speculator.observe("Good morning. And")
+        speculator.observe("Good morning. And then")
+        await asyncio.sleep(0)
+        speculator.reset()
+        await asyncio.sleep(0.1)
+        return deepl, speculator
+
+    deepl, speculator = asyncio.run(main())
+    assert deepl.cancelled == 1
+    assert speculator.cancelled == 1
+    assert speculator.wasted == 0
+    assert speculator.take("Good morning.") is None
+
+
+def test_reset_counts_finished_unused_speculations_as_wasted():
+    async def main():
+        deepl = SlowDeepL(delay=0)
+        speculator = SpeculativeTranslator(deepl, stable_interims=2)
+        speculator.observe("Good morning. And")
+        speculator.observe("Good morning. And then")
+        await asyncio.sleep(0.01)
+        speculator.reset()
+        return deepl, speculator
+
+    deepl, speculator = asyncio.run(main())
+    assert deepl.cancelled == 0
+    assert speculator.cancelled == 0
+    assert speculator.wasted == 1
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from livetranslate import translate  # noqa: E402
+from livetranslate.breaker import CircuitBreaker  # noqa: E402
+
+
+@pytest.fixture
+def reset(monkeypatch):
+    """Give every test a fresh client, breaker and failure counts."""
+    client = translate.DeepLClient(api_key="test", base_url="http://deepl.test")
+    monkeypatch.setattr(translate, "_client", client)
+    monkeypatch.setattr(translate, "_batcher", None)
+    monkeypatch.setattr(translate, "_breakers", {})
+    monkeypatch.setattr(translate, "failures", {"timeout": 0, "rejected": 0, "error": 0})
+    monkeypatch.setattr(translate, "TRANSLATION_CACHE_SIZE", 0)
+    monkeypatch.setattr(translate, "DEEPL_RETRIES", 0)
+    monkeypatch.setattr(translate, "DEEPL_BREAKER_FAILURES", 100)
+    return client
+
+
+@pytest.fixture
+def deepl(reset, monkeypatch):
+    """Route DeepL requests to a fake that always fails."""
+    calls = []
+
+    async def translate_batch(texts, source_lang, target_lang, context):
+        calls.append(list(texts))
+        await asyncio.sleep(0.01)
+        raise translate.DeepLError(503, "unavailable")
+
+    monkeypatch.setattr(reset, "translate_batch", translate_batch)
+    return calls
+
+
+def _translate_all(texts):
+    async def main():
+        return await asyncio.gather(*(translate.translate_text_deepl(t, "EN", "DE", "") for t in texts))
+    return asyncio.run(main())
+
+
+def test_batched_failure_counts_once_towards_the_breaker(deepl, monkeypatch):
+    monkeypatch.setattr(translate, "DEEPL_BATCH_WAIT_MS", 5)
+    assert _translate_all(["one", "two", "three"]) == ["", "", ""]
+    assert deepl == [["one", "two", "three"]]
+    assert translate.get_circuit_breaker().failures == 1
+    assert translate.failures["error"] == 3
+
+
+def test_unbatched_failures_count_per_request(deepl, monkeypatch):
+    monkeypatch.setattr(translate, "DEEPL_BATCH_WAIT_MS", 0)
+    _translate_all(["one", "two"])
+    assert len(deepl) == 2
+    assert translate.get_circuit_breaker().failures == 2
+
+
+def test_open_breaker_rejects_without_a_request(deepl, monkeypatch):
+    breaker = CircuitBreaker("http://deepl.test", failure_threshold=1)
+    breaker.record_failure()
+    monkeypatch.setattr(translate, "_breakers", {"http://deepl.test": breaker})
+    assert _translate_all(["one"]) == [""]
+    assert deepl == []
+    assert translate.failures["rejected"] == 1
+
+
+def test_caller_deadline_does_not_count_towards_the_breaker(reset, monkeypatch):
+    async def translate_batch(texts, source_lang, target_lang, context):
+        await asyncio.sleep(1)
+        return [text.upper() for text in texts]
+
+    monkeypatch.setattr(reset, "translate_batch", translate_batch)
+    monkeypatch.setattr(translate, "DEEPL_BATCH_WAIT_MS", 0)
+
+    async def main():
+        return await translate.translate_text_deepl("one", "EN", "DE", "", timeout=0.02)
+
+    assert asyncio.run(main()) == ""
+    assert translate.failures["timeout"] == 1
+    assert translate.get_circuit_breaker().failures == 0
+
+
+def test_request_timeout_counts_towards_the_breaker(reset, monkeypatch):
+    async def translate_batch(texts, source_lang, target_lang, context):
+        await asyncio.sleep(0.01)
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(reset, "translate_batch", translate_batch)
+    monkeypatch.setattr(translate, "DEEPL_BATCH_WAIT_MS", 0)
+    assert _translate_all(["one"]) == [""]
+    assert translate.get_circuit_breaker().failures == 1